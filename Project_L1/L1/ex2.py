@@ -1,42 +1,41 @@
 import os
+import sys
 from collections import Counter
-import tkinter as tk
-from tkinter import scrolledtext
+import numpy as np
 
-fasta_file_path = "example.fasta"
-
-def parse_fasta(path):
-    sequences = []
-    header = None
-    seq_lines = []
-    with open(path, 'r', encoding='utf-8') as f:
-        for raw in f:
-            line = raw.strip()
-            if not line:
-                continue
-            if line.startswith('>'):
-                if header is not None:
-                    sequences.append((header, ''.join(seq_lines)))
-                header = line[1:].strip() or "unknown"
-                seq_lines = []
-            else:
-                seq_lines.append(line)
-    if header is not None:
-        sequences.append((header, ''.join(seq_lines)))
-    return sequences
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from bioutils.cache import cached
+from bioutils.fasta import iter_fasta
+from bioutils.packed import PackedSequence
 
+fasta_file_path = "example.fasta"
 
 def analyze_sequence(sequence):
     seq = sequence.replace(" ", "").upper()
     length = len(seq)
     if length == 0:
         return None
-    counts = Counter(seq)
+    counts = Counter(seq.composition()) if isinstance(seq, PackedSequence) else Counter(seq)
     alphabet = sorted(counts.keys())
     percentages = {ch: (counts[ch] / length) * 100 for ch in alphabet}
     return length, alphabet, counts, percentages
 
 
+def record_compositions(path):
+    """(headers, alphabet, counts) with one row of symbol counts per record; cached on disk."""
+    def compute():
+        headers, record_counts = [], []
+        for header, seq in iter_fasta(path):
+            res = analyze_sequence(seq)
+            headers.append(header or "unknown")
+            record_counts.append(res[2] if res else Counter())
+        alphabet = sorted(set().union(*record_counts))
+        counts = np.array([[c[ch] for ch in alphabet] for c in record_counts], dtype=np.int64)
+        return np.array(headers, dtype=str), np.array(alphabet, dtype=str), counts
+
+    return cached(path, "record_composition", {"upper": True}, compute)
+
+
 def generate_output():
     output_text.delete('1.0', tk.END)
 
@@ -44,13 +43,20 @@ def generate_output():
         output_text.insert(tk.END, f"Error: file not found: {fasta_file_path}\n")
         return
 
-    sequences = parse_fasta(fasta_file_path)
-    for header, seq in sequences:
-        res = analyze_sequence(seq)
-        if res is None:
+    # Per-record counts are merged into the combined counts, so the combined
+    # sequence never has to be built and counted again
+    headers, symbols, matrix = record_compositions(fasta_file_path)
+    combined_counts = Counter()
+    num_records = len(headers)
+    for header, row in zip(headers.tolist(), matrix.tolist()):
+        counts = Counter({ch: n for ch, n in zip(symbols.tolist(), row) if n})
+        length = sum(counts.values())
+        if length == 0:
             output_text.insert(tk.END, f"> {header} -- (empty sequence)\n\n")
             continue
-        length, alphabet, counts, percentages = res
+        alphabet = sorted(counts)
+        percentages = {ch: (counts[ch] / length) * 100 for ch in alphabet}
+        combined_counts += counts
         output_text.insert(tk.END, f"> {header}\n")
         output_text.insert(tk.END, f"Length: {length}\n")
         output_text.insert(tk.END, f"Alphabet: {alphabet}\n")
@@ -59,10 +65,11 @@ def generate_output():
             output_text.insert(tk.END, f"  {ch}: {counts[ch]} ({percentages[ch]:.2f}%)\n")
         output_text.insert(tk.END, "\n")
 
-    if len(sequences) > 1:
-        combined = "".join(seq for _, seq in sequences)
-        res = analyze_sequence(combined)
-        length, alphabet, counts, percentages = res
+    if num_records > 1 and combined_counts:
+        length = sum(combined_counts.values())
+        alphabet = sorted(combined_counts.keys())
+        counts = combined_counts
+        percentages = {ch: (counts[ch] / length) * 100 for ch in alphabet}
         output_text.insert(tk.END, "Combined analysis (all sequences):\n")
         output_text.insert(tk.END, f"Length: {length}\n")
         output_text.insert(tk.END, f"Alphabet: {alphabet}\n")
@@ -71,11 +78,16 @@ def generate_output():
             output_text.insert(tk.END, f"  {ch}: {counts[ch]} ({percentages[ch]:.2f}%)\n")
         output_text.insert(tk.END, "\n")
 
-root = tk.Tk()
-root.title("FASTA Sequence Analyzer")
+# GUI Setup
+if __name__ == "__main__":
+    import tkinter as tk
+    from tkinter import scrolledtext
+
+    root = tk.Tk()
+    root.title("FASTA Sequence Analyzer")
 
-generate_button = tk.Button(root, text="Generate Frequency Count", command=generate_output)
-generate_button.pack(pady=10)
-output_text = scrolledtext.ScrolledText(root, width=60, height=20)
-output_text.pack(padx=10, pady=10)
-root.mainloop()
\ No newline at end of file
+    generate_button = tk.Button(root, text="Generate Frequency Count", command=generate_output)
+    generate_button.pack(pady=10)
+    output_text = scrolledtext.ScrolledText(root, width=60, height=20)
+    output_text.pack(padx=10, pady=10)
+    root.mainloop()
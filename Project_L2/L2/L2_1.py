@@ -15,6 +15,11 @@ Definition: A dinucleotide is a sequence of two nucleotides.  4 **2 = 16 unique
 Trinucleotide Combinations
 Definition: A trinucleotide is a sequence of three nucleotides. 4 **3 = 64 unique combinations
 """
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from bioutils.kmers import count_kmers
 
 
 S="TACGTGCGCGCGAGCTATCTACTGACTTACGACTAGTGTAGCTGCATCATCGATCGAGG"
@@ -39,10 +44,11 @@ for n1 in gen_alphabet:
             trinucleoids[t] = 0
 
 
+# Overlapping counts for every combination, from a single k-mer counting pass
+dinucleoid_counts = count_kmers(S, 2).to_dict()
 for d in  dinucleoids.keys():
-    if d in S:
-        dinucleoids[d] = S.count(d)
-        total_dn += dinucleoids[d]
+    dinucleoids[d] = dinucleoid_counts.get(d, 0)
+    total_dn += dinucleoids[d]
 
 
 for d in dinucleoids.keys():
@@ -50,10 +56,10 @@ for d in dinucleoids.keys():
 #print(f"Number of instances of dinucleoids in sequece S: {dinucleoids}")
 print(f"Number of instances of dinucleoids percentage in sequece S: {dinucleoids_perc}")
 
+trinucleoid_counts = count_kmers(S, 3).to_dict()
 for t in  trinucleoids.keys():
-    if t in S:
-        trinucleoids[t] = S.count(t)
-        total_tn += trinucleoids[t]
+    trinucleoids[t] = trinucleoid_counts.get(t, 0)
+    total_tn += trinucleoids[t]
 
 for t in trinucleoids.keys():
     trinucleoids_perc[t] = round(trinucleoids[t] / total_tn * 100.0, 2)
@@ -3,19 +3,22 @@ Find in seq S only the dinucleotides and trinucleotides that exist
 without the use of bruteforce engine. In order to achieve the results
 one must verify this combination starting from the begining
 """
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from bioutils.kmers import count_kmers
+
 
 S="TACGTGCGCGCGAGCTATCTACTGACTTACGACTAGTGTAGCTGCATCATCGATCGA"
-dinucleoids = {}
-trinucleoids = {}
 
-for i in range(len(S)-1):
-    dinucleoids[S[i:i+2]] = dinucleoids.get(S[i:i+2], 0) + 1
+# Only the k-mers that occur are reported, counted in one vectorized pass
+dinucleoids = count_kmers(S, 2, alphabet=None).to_dict()
 # dinucleoids = {S[i:i+2]: S.count(S[i:i+2]) for i in range(len(S) - 1)} # because I python can
 print(dinucleoids)
 
 
-for i in range(len(S)- 2):
-    trinucleoids[S[i:i+3]]= trinucleoids.get(S[i:i+3], 0) + 1
+trinucleoids = count_kmers(S, 3, alphabet=None).to_dict()
 # trinucleoids = {S[i:i+3]: S.count(S[i:i+2]) for i in range(len(S) - 2)}
 
 print(trinucleoids)
\ No newline at end of file
@@ -9,104 +9,149 @@
 
 
 
-import tkinter as tk
-from tkinter import filedialog, scrolledtext
-import matplotlib.pyplot as plt
+import os
+import sys
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from bioutils.fasta import read_sequence
+from bioutils.kmers import KmerCounts, count_kmers
+from bioutils.cache import cached
+from bioutils.chunked import chunked_window_counts, chunked_window_frequencies
+from bioutils.decimate import plot_signal
+from bioutils.tasks import BackgroundTask, preview, watch
 
 WINDOW_SIZE = 30
 
 def read_fasta_file(filepath):
     """Reads a FASTA file and returns only the sequence (ignoring header)."""
-    with open(filepath, "r") as f:
-        lines = f.readlines()
-    sequence = "".join(line.strip() for line in lines[1:])
-    return sequence
-
-def sliding_window_frequencies(sequence):
-    """Calculate relative frequencies per sliding window."""
-    alphabet = sorted(set(sequence))
-    freqs = {letter: [] for letter in alphabet}
-    
-    for i in range(len(sequence) - WINDOW_SIZE + 1):
-        window = sequence[i:i+WINDOW_SIZE]
-        total = len(window)
-        count_dict = {}
-        for s in window:
-            count_dict[s] = count_dict.get(s, 0) + 1
-        for letter in alphabet:
-            freqs[letter].append(count_dict.get(letter, 0)/total)
-    
-    return freqs
+    return read_sequence(filepath)
+
+def sliding_window_frequencies(sequence, window_size=WINDOW_SIZE, step=1, source=None):
+    """Calculate relative frequencies per sliding window (one NumPy array per symbol).
+
+    Multi-megabase sequences are split in blocks computed on all cores. With
+    the FASTA file it was read from as source, the counts are cached on disk.
+    """
+    if source is None:
+        _, freqs, alphabet = chunked_window_frequencies(sequence, window_size, step)
+    else:
+        counts, alphabet = cached(
+            source, "window_counts", {"window": window_size, "step": step, "alphabet": None, "upper": False},
+            lambda: tuple(np.asarray(a) for a in chunked_window_counts(sequence, window_size, step)[1:]))
+        freqs = counts / window_size
+    return {str(letter): freqs[i] for i, letter in enumerate(alphabet)}
 
 def plot_frequencies(freqs):
     """Plot the relative frequencies for each symbol."""
+    import matplotlib.pyplot as plt  # only loaded when a chart is drawn
+
     plt.figure(figsize=(10, 6))
+    ax = plt.gca()
     x = range(len(next(iter(freqs.values()))))
+    # One point per window: drawn decimated, with full detail once zoomed in
     for letter, values in freqs.items():
-        plt.plot(x, values, label=letter)
+        plot_signal(ax, x, values, label=letter)
     plt.xlabel("Window Start Position")
     plt.ylabel("Relative Frequency")
     plt.title("Sliding Window Symbol Frequencies")
     plt.legend()
     plt.show()
 
-def count_di_tri(sequence):
-    """Count dinucleotides and trinucleotides with brute force."""
-    dinucleoids = {}
-    trinucleoids = {}
-    
-    for i in range(len(sequence)-1):
-        dinuc = sequence[i:i+2]
-        dinucleoids[dinuc] = dinucleoids.get(dinuc, 0) + 1
-    for i in range(len(sequence)-2):
-        trinuc = sequence[i:i+3]
-        trinucleoids[trinuc] = trinucleoids.get(trinuc, 0) + 1
-
-
-    total_dn = 0
-    total_tn = 0
+def cached_kmers(sequence, k, source=None):
+    """count_kmers() over the symbols of the sequence, cached on disk when source is given."""
+    def count():
+        counts = count_kmers(sequence, k, alphabet=None)
+        return counts.codes, counts.counts, np.array(counts.alphabet)
 
-    for d in dinucleoids.keys():
-        total_dn += dinucleoids[d]
+    codes, counts, alphabet = cached(source, "kmers", {"k": k, "alphabet": None, "upper": False}, count)
+    return KmerCounts(k, str(alphabet), codes, counts)
 
-    for t in trinucleoids.keys():
-        total_tn += trinucleoids[t]
-
-    dinuc_perc = {d: round(dinucleoids[d]/total_dn*100, 2) for d in dinucleoids}
-    trinuc_perc = {t: round(trinucleoids[t]/total_tn*100, 2) for t in trinucleoids}
+def count_di_tri(sequence, source=None):
+    """Count dinucleotides and trinucleotides (overlapping) and return their percentages."""
+    # alphabet=None: use the symbols of the sequence, so RNA and protein files work too
+    dinuc_perc = cached_kmers(sequence, 2, source).percentages()
+    trinuc_perc = cached_kmers(sequence, 3, source).percentages()
     return dinuc_perc, trinuc_perc
 
+def analyze_file(task, filepath):
+    """Reads and analyses a FASTA file; runs on a worker thread (no Tk calls here)."""
+    task.report(0.0, "Reading file...")
+    sequence = read_fasta_file(filepath)
+    task.report(0.3, "Counting dinucleotides and trinucleotides...")
+    dinuc, trinuc = count_di_tri(sequence, source=filepath)
+    task.report(0.6, "Computing sliding window frequencies...")
+    freqs = sliding_window_frequencies(sequence, source=filepath)
+    return sequence, dinuc, trinuc, freqs
+
+def set_busy(busy, message=""):
+    btn.config(state=tk.DISABLED if busy else tk.NORMAL)
+    cancel_btn.config(state=tk.NORMAL if busy else tk.DISABLED)
+    status.config(text=message)
+
+def show_progress(fraction, message):
+    status.config(text=f"{message} ({fraction:.0%})")
+
+def show_error(error):
+    set_busy(False, f"Error: {error}")
+
+def show_results(results):
+    sequence, dinuc, trinuc, freqs = results
+    set_busy(False, f"Done: {len(sequence):,} bases.")
+
+    # Display text output
+    text_box.delete(1.0, tk.END)
+    text_box.insert(tk.END, f"FASTA Sequence:\n{preview(sequence)}\n\n")
+    text_box.insert(tk.END, "Dinucleotide counts:\n")
+    for k, v in sorted(dinuc.items()):
+        text_box.insert(tk.END, f"{k}: {v}\n")
+    text_box.insert(tk.END, "\nTrinucleotide counts:\n")
+    for k, v in sorted(trinuc.items()):
+        text_box.insert(tk.END, f"{k}: {v}\n")
+
+    # Plot chart
+    plot_frequencies(freqs)
+
 def load_fasta():
+    global current_task
     filepath = filedialog.askopenfilename(
         title="Select a FASTA file",
         filetypes=(("FASTA files", "*.fasta *.fa"), ("All files", "*.*"))
     )
     if filepath:
-        sequence = read_fasta_file(filepath)
-        dinuc, trinuc = count_di_tri(sequence)
-        freqs = sliding_window_frequencies(sequence)
-        
-        # Display text output
-        text_box.delete(1.0, tk.END)
-        text_box.insert(tk.END, f"FASTA Sequence:\n{sequence}\n\n")
-        text_box.insert(tk.END, "Dinucleotide counts:\n")
-        for k, v in sorted(dinuc.items()):
-            text_box.insert(tk.END, f"{k}: {v}\n")
-        text_box.insert(tk.END, "\nTrinucleotide counts:\n")
-        for k, v in sorted(trinuc.items()):
-            text_box.insert(tk.END, f"{k}: {v}\n")
-        
-        # Plot chart
-        plot_frequencies(freqs)
+        # The analysis runs in the background; the window keeps responding
+        set_busy(True, "Starting...")
+        current_task = BackgroundTask(analyze_file, filepath).start()
+        watch(root, current_task, show_results, on_progress=show_progress, on_error=show_error,
+              on_cancel=lambda: set_busy(False, "Cancelled."))
+
+def cancel_analysis():
+    if current_task is not None:
+        current_task.cancel()
+
+current_task = None
 
 # GUI Setup
-root = tk.Tk()
-root.title("FASTA Analyzer")
+if __name__ == "__main__":
+    import tkinter as tk
+    from tkinter import filedialog, scrolledtext
+
+    root = tk.Tk()
+    root.title("FASTA Analyzer")
+
+    frame = tk.Frame(root)
+    frame.pack(pady=10)
+
+    btn = tk.Button(frame, text="Load FASTA File", command=load_fasta)
+    btn.grid(row=0, column=0, padx=5)
+
+    cancel_btn = tk.Button(frame, text="Cancel", command=cancel_analysis, state=tk.DISABLED)
+    cancel_btn.grid(row=0, column=1, padx=5)
 
-btn = tk.Button(root, text="Load FASTA File", command=load_fasta)
-btn.pack(pady=10)
+    status = tk.Label(root, text="", anchor="w")
+    status.pack(fill=tk.X, padx=10)
 
-text_box = scrolledtext.ScrolledText(root, wrap=tk.WORD, width=80, height=25)
-text_box.pack(padx=10, pady=10)
+    text_box = scrolledtext.ScrolledText(root, wrap=tk.WORD, width=80, height=25)
+    text_box.pack(padx=10, pady=10)
 
-root.mainloop()
+    root.mainloop()
@@ -20,7 +20,11 @@ Output = temperature in celsius
 
 """
 
-import math
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from bioutils.tm import tm_alternative, tm_simple
 
 #S1 = "TACGTGCGCGCGAGCTATCTACTGACTTACGACTAGTGTAGCTGCATCATCGATCGA"
 
@@ -29,14 +33,15 @@ S = "TACGTGCGCGCG"
 Na_plus = 0.001 #this is just a random value
 
 def melting_temperature_simple(G: int, C: int, A: int, T: int):
-    Tm = 4 * (G + C) + 2 * (A + T)
+    Tm = tm_simple(G, C, A, T)
 
     return Tm, f"{Tm} °C"
 
-def melting_temperature_alternative(CG_perc, length):
-    Tm = (81.5 + 16.6 * (math.log(Na_plus)) + 0.41*(CG_perc) - 600/length) * -1
+def melting_temperature_alternative(CG_perc, length, na=Na_plus):
+    # Same log10 formula as Lab3_2 (this used to be ln(Na+) with the sign flipped)
+    Tm = float(tm_alternative(CG_perc, length, na))
 
-    return Tm, f"{Tm} °C"
+    return Tm, f"{Tm:.2f} °C"
 
 
 def main():
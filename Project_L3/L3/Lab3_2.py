@@ -7,72 +7,59 @@
 
 """
 
-import math
-import tkinter as tk
-from tkinter import filedialog, scrolledtext
-import matplotlib.pyplot as plt
+import os
+import sys
 
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from bioutils.fasta import read_sequence
+from bioutils import tm
+from bioutils.cache import cached
+from bioutils.chunked import chunked_tm_profile, chunked_window_counts
+from bioutils.decimate import plot_signal
+from bioutils.tasks import BackgroundTask, preview, watch
 
-Na_plus = 0.001  # Fixed sodium concentration
+
+Na_plus = tm.DEFAULT_NA  # Default sodium concentration (mol/L)
 
 
 def melting_temperature_simple(G: int, C: int, A: int, T: int):
     """Simple formula for melting temperature."""
-    return 4 * (G + C) + 2 * (A + T)
+    return tm.tm_simple(G, C, A, T)
 
 
-def melting_temperature_alternative(CG_perc, length):
+def melting_temperature_alternative(CG_perc, length, na=Na_plus):
     """Alternative formula for melting temperature."""
-    return 81.5 + 16.6 * math.log10(Na_plus) + 0.41 * (CG_perc) - 600 / length
+    return tm.tm_alternative(CG_perc, length, na)
 
 
 def read_fasta_file(filepath):
     """Reads a FASTA file and returns only the DNA sequence (ignoring header)."""
-    with open(filepath, "r") as f:
-        lines = f.readlines()
-    # Skip header lines starting with '>'
-    sequence = "".join(line.strip() for line in lines if not line.startswith(">"))
-    return sequence.upper()
-
-
-def sliding_window(sequence, window_size=9):
-    """Yields each window substring of length window_size."""
-    for i in range(len(sequence) - window_size + 1):
-        yield sequence[i:i + window_size]
-
-
-def compute_tm_for_sequence(sequence):
-    """Computes melting temperature arrays using sliding window."""
-    window_size = 9
-    tm_simple_values = []
-    tm_alt_values = []
-    positions = []
-
-    for i, window in enumerate(sliding_window(sequence, window_size)):
-        G = window.count('G')
-        C = window.count('C')
-        A = window.count('A')
-        T = window.count('T')
-
-        # Simple formula
-        tm1 = melting_temperature_simple(G, C, A, T)
-        tm_simple_values.append(tm1)
+    return read_sequence(filepath).upper()
 
-        # Alternative formula
-        CG_perc = (C + G) / window_size * 100
-        tm2 = melting_temperature_alternative(CG_perc, window_size)
-        tm_alt_values.append(tm2)
 
-        positions.append(i + 1)
+def compute_tm_for_sequence(sequence, window_size=9, step=1, na=Na_plus, source=None):
+    """Computes melting temperature arrays (both formulas) using sliding window.
 
-    return positions, tm_simple_values, tm_alt_values
+    With the FASTA file it was read from as source, the per-window base
+    counts are cached on disk: a new [Na+] only re-applies the formulas.
+    """
+    if source is None:
+        return chunked_tm_profile(sequence, window_size, step, na)
+    starts, counts = cached(source, "window_counts",
+                            {"window": window_size, "step": step, "alphabet": "ACGT", "upper": True},
+                            lambda: chunked_window_counts(sequence, window_size, step, "ACGT")[:2])
+    return (starts + 1, *tm.tm_from_counts(counts, window_size, na))
 
 
 def plot_tm_chart(positions, tm_simple, tm_alt):
     """Displays a chart with both Tm signals."""
+    import matplotlib.pyplot as plt  # only loaded when a chart is drawn
+
     plt.figure(figsize=(10, 5))
-    plt.plot(positions, tm_simple, label="Tm Simple (4(G+C)+2(A+T))", color='blue')
-    plt.plot(positions, tm_alt, label="Tm Alternative 81.5+16.6(log10([Na+]))+0.41*(%GC)-600/length", color='red')
+    ax = plt.gca()
+    # One point per window: drawn decimated, with full detail once zoomed in
+    plot_signal(ax, positions, tm_simple, label="Tm Simple (4(G+C)+2(A+T))", color='blue')
+    plot_signal(ax, positions, tm_alt, label="Tm Alternative 81.5+16.6(log10([Na+]))+0.41*(%GC)-600/length", color='red')
     plt.title("DNA Melting Temperature along Sequence (Sliding Window = 9)")
     plt.xlabel("Position in Sequence")
     plt.ylabel("Melting Temperature (°C)")
@@ -81,44 +68,108 @@ def plot_tm_chart(positions, tm_simple, tm_alt):
     plt.show()
 
 
+def analyze_file(task, filepath, na):
+    """Reads a FASTA file and computes its Tm profile; runs on a worker thread (no Tk calls here)."""
+    task.report(0.0, "Reading file...")
+    sequence = read_fasta_file(filepath)
+    if len(sequence) < 9:
+        raise ValueError("Sequence too short for 9-position sliding window.")
+    task.report(0.4, "Computing melting temperatures...")
+    positions, tm_simple, tm_alt = compute_tm_for_sequence(sequence, na=na, source=filepath)
+    return sequence, na, positions, tm_simple, tm_alt
+
+
+def set_busy(busy, message=""):
+    btn.config(state=tk.DISABLED if busy else tk.NORMAL)
+    cancel_btn.config(state=tk.NORMAL if busy else tk.DISABLED)
+    status.config(text=message)
+
+
+def show_progress(fraction, message):
+    status.config(text=f"{message} ({fraction:.0%})")
+
+
+def show_error(error):
+    set_busy(False)
+    text_box.delete(1.0, tk.END)
+    text_box.insert(tk.END, f"Error: {error}")
+
+
+def show_results(results):
+    sequence, na, positions, tm_simple, tm_alt = results
+    set_busy(False, f"Done: {len(sequence):,} bases.")
+    text_box.delete(1.0, tk.END)
+    text_box.insert(tk.END, f"FASTA Sequence:\n{preview(sequence)}\n\n")
+
+    # Display results in text box
+    text_box.insert(tk.END, f"Computed {len(tm_simple)} windows ([Na+] = {na} M).\n")
+    text_box.insert(tk.END, "Showing first few Tm values:\n")
+    for i in range(min(10, len(tm_simple))):
+        text_box.insert(
+            tk.END,
+            f"Pos {positions[i]}: Tm_simple={tm_simple[i]:.2f} °C, Tm_alt={tm_alt[i]:.2f} °C\n"
+        )
+
+    # Show chart
+    plot_tm_chart(positions, tm_simple, tm_alt)
+
+
 def analyze_fasta():
+    global current_task
     filepath = filedialog.askopenfilename(
         title="Select a FASTA file",
         filetypes=(("FASTA files", "*.fasta *.fa"), ("All files", "*.*"))
     )
 
     if filepath:
-        sequence = read_fasta_file(filepath)
-        text_box.delete(1.0, tk.END)
-        text_box.insert(tk.END, f"FASTA Sequence:\n{sequence}\n\n")
+        # Get Na+ concentration (widgets are only read from the GUI thread)
+        try:
+            na = float(na_entry.get())
+        except ValueError:
+            na = Na_plus
+        if na <= 0:
+            na = Na_plus
 
-        if len(sequence) < 9:
-            text_box.insert(tk.END, "Error: Sequence too short for 9-position sliding window.")
-            return
+        # The analysis runs in the background; the window keeps responding
+        set_busy(True, "Starting...")
+        current_task = BackgroundTask(analyze_file, filepath, na).start()
+        watch(root, current_task, show_results, on_progress=show_progress, on_error=show_error,
+              on_cancel=lambda: set_busy(False, "Cancelled."))
 
-        positions, tm_simple, tm_alt = compute_tm_for_sequence(sequence)
 
-        # Display results in text box
-        text_box.insert(tk.END, f"Computed {len(tm_simple)} windows.\n")
-        text_box.insert(tk.END, "Showing first few Tm values:\n")
-        for i in range(min(10, len(tm_simple))):
-            text_box.insert(
-                tk.END,
-                f"Pos {positions[i]}: Tm_simple={tm_simple[i]:.2f} °C, Tm_alt={tm_alt[i]:.2f} °C\n"
-            )
+def cancel_analysis():
+    if current_task is not None:
+        current_task.cancel()
 
-        # Show chart
-        plot_tm_chart(positions, tm_simple, tm_alt)
 
+current_task = None
 
 # GUI Setup
-root = tk.Tk()
-root.title("DNA Melting Temperature Analyzer")
+if __name__ == "__main__":
+    import tkinter as tk
+    from tkinter import filedialog, scrolledtext
+
+    root = tk.Tk()
+    root.title("DNA Melting Temperature Analyzer")
+
+    frame = tk.Frame(root)
+    frame.pack(pady=10)
+
+    btn = tk.Button(frame, text="Load FASTA File", command=analyze_fasta)
+    btn.grid(row=0, column=0, padx=5)
+
+    tk.Label(frame, text="[Na+] (M):").grid(row=0, column=1)
+    na_entry = tk.Entry(frame, width=10)
+    na_entry.grid(row=0, column=2, padx=5)
+    na_entry.insert(0, str(Na_plus))  # Default sodium concentration
+
+    cancel_btn = tk.Button(frame, text="Cancel", command=cancel_analysis, state=tk.DISABLED)
+    cancel_btn.grid(row=0, column=3, padx=5)
 
-btn = tk.Button(root, text="Load FASTA File", command=analyze_fasta)
-btn.pack(pady=10)
+    status = tk.Label(root, text="", anchor="w")
+    status.pack(fill=tk.X, padx=10)
 
-text_box = scrolledtext.ScrolledText(root, wrap=tk.WORD, width=70, height=20)
-text_box.pack(padx=10, pady=10)
+    text_box = scrolledtext.ScrolledText(root, wrap=tk.WORD, width=70, height=20)
+    text_box.pack(padx=10, pady=10)
 
-root.mainloop()
+    root.mainloop()
@@ -5,59 +5,63 @@
 # Thus, the chunks of the signal that are above the threshold are shown as a horizontal bar over the signal. 
 # Whenever the signal is below the threshold, the chart should show empty space.
 """
-import math
-import tkinter as tk
-from tkinter import filedialog, scrolledtext
-import matplotlib.pyplot as plt
+import os
+import sys
 import numpy as np
 
-Na_plus = 0.001  # Fixed sodium concentration
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from bioutils.fasta import read_sequence
+from bioutils import tm
+from bioutils.cache import cached
+from bioutils.chunked import chunked_tm_profile, chunked_window_counts
+from bioutils.intervals import runs_to_regions, threshold_runs, write_bed
+from bioutils.decimate import plot_signal
+from bioutils.tasks import BackgroundTask, preview, watch
+
+Na_plus = tm.DEFAULT_NA  # Default sodium concentration (mol/L)
+WINDOW_SIZE = 9
+
+# Regions above the threshold from the last analysis, used by "Export BED"
+last_regions = None
+# Analysis running in the background, if any
+current_task = None
 
 
 def melting_temperature_simple(G: int, C: int, A: int, T: int):
     """Simple formula for melting temperature."""
-    return 4 * (G + C) + 2 * (A + T)
+    return tm.tm_simple(G, C, A, T)
 
 
 def read_fasta_file(filepath):
     """Reads a FASTA file and returns only the DNA sequence (ignoring header)."""
-    with open(filepath, "r") as f:
-        lines = f.readlines()
-    sequence = "".join(line.strip() for line in lines if not line.startswith(">"))
-    return sequence.upper()
-
-
-def sliding_window(sequence, window_size=9):
-    """Yields each window substring of length window_size."""
-    for i in range(len(sequence) - window_size + 1):
-        yield sequence[i:i + window_size]
-
+    return read_sequence(filepath).upper()
 
-def compute_tm_for_sequence(sequence):
-    """Computes melting temperature array using sliding window."""
-    window_size = 9
-    tm_values = []
-    positions = []
 
-    for i, window in enumerate(sliding_window(sequence, window_size)):
-        G = window.count('G')
-        C = window.count('C')
-        A = window.count('A')
-        T = window.count('T')
+def compute_tm_for_sequence(sequence, window_size=WINDOW_SIZE, step=1, source=None):
+    """Computes melting temperature array (simple formula) using sliding window.
 
-        tm = melting_temperature_simple(G, C, A, T)
-        tm_values.append(tm)
-        positions.append(i + 1)
-
-    return positions, tm_values
+    With the FASTA file it was read from as source, the per-window base
+    counts are cached on disk: a new threshold only re-filters the signal.
+    """
+    if source is None:
+        positions, tm_values, _ = chunked_tm_profile(sequence, window_size, step)
+        return positions, tm_values
+    starts, counts = cached(source, "window_counts",
+                            {"window": window_size, "step": step, "alphabet": "ACGT", "upper": True},
+                            lambda: chunked_window_counts(sequence, window_size, step, "ACGT")[:2])
+    return starts + 1, tm.tm_from_counts(counts, window_size)[0]
 
 
 def plot_tm_chart(positions, tm_values, threshold=None):
     """Displays the signal and threshold filter visualization."""
+    import matplotlib.pyplot as plt  # only loaded when a chart is drawn
+    from matplotlib.collections import LineCollection
+
     fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(10, 10), sharex=True, sharey=True)
 
     # === Top Chart: Full signal ===
-    ax1.plot(positions, tm_values, label="Tm Simple (4(G+C)+2(A+T))", color='blue')
+    # One point per window: drawn decimated, with full detail once zoomed in
+    plot_signal(ax1, positions, tm_values, label="Tm Simple (4(G+C)+2(A+T))", color='blue')
     ax1.set_title("DNA Melting Temperature along Sequence (Sliding Window = 9)")
     ax1.set_xlabel("Position in Sequence")
     ax1.set_ylabel("Melting Temperature (°C)")
@@ -68,20 +72,14 @@ def plot_tm_chart(positions, tm_values, threshold=None):
 
     # === Bottom Chart: Highlight regions above threshold ===
     if threshold is not None:
-        above = np.array(tm_values) > threshold
-        start_idx = None
-
-        for i in range(len(above)):
-            if above[i] and start_idx is None:
-                start_idx = positions[i]
-            elif not above[i] and start_idx is not None:
-                ax2.hlines(y=threshold, xmin=start_idx, xmax=positions[i - 1],
-                           color='blue', linewidth=6)
-                start_idx = None
-
-        if start_idx is not None:
-            ax2.hlines(y=threshold, xmin=start_idx, xmax=positions[-1],
-                       color='blue', linewidth=6)
+        # All runs above the threshold are drawn as one LineCollection
+        positions = np.asarray(positions)
+        starts, ends = threshold_runs(tm_values, threshold)
+        segments = np.empty((len(starts), 2, 2))
+        segments[:, 0, 0] = positions[starts]
+        segments[:, 1, 0] = positions[ends - 1]
+        segments[:, :, 1] = threshold
+        ax2.add_collection(LineCollection(segments, colors='blue', linewidths=6))
 
         ax2.axhline(y=threshold, color='green', linestyle='--', label=f"Threshold = {threshold} °C")
 
@@ -101,57 +99,135 @@ def plot_tm_chart(positions, tm_values, threshold=None):
     plt.show()
 
 
+def analyze_file(task, filepath, threshold):
+    """Reads a FASTA file, computes its Tm profile and the regions above threshold.
+
+    Runs on a worker thread (no Tk calls here).
+    """
+    task.report(0.0, "Reading file...")
+    sequence = read_fasta_file(filepath)
+    if len(sequence) < 9:
+        raise ValueError("Sequence too short for 9-position sliding window.")
+    task.report(0.4, "Computing melting temperatures...")
+    positions, tm_values = compute_tm_for_sequence(sequence, source=filepath)
+    regions = None
+    if threshold is not None:
+        task.report(0.8, "Finding regions above the threshold...")
+        starts, ends = threshold_runs(tm_values, threshold)
+        region_starts, region_ends = runs_to_regions(starts, ends, positions - 1, WINDOW_SIZE)
+        name = os.path.splitext(os.path.basename(filepath))[0]
+        regions = (name, region_starts, region_ends)
+    return sequence, positions, tm_values, threshold, regions
+
+
+def set_busy(busy, message=""):
+    btn.config(state=tk.DISABLED if busy else tk.NORMAL)
+    cancel_btn.config(state=tk.NORMAL if busy else tk.DISABLED)
+    status.config(text=message)
+
+
+def show_progress(fraction, message):
+    status.config(text=f"{message} ({fraction:.0%})")
+
+
+def show_error(error):
+    set_busy(False)
+    text_box.delete(1.0, tk.END)
+    text_box.insert(tk.END, f"Error: {error}")
+
+
+def show_results(results):
+    global last_regions
+    sequence, positions, tm_values, threshold, regions = results
+    set_busy(False, f"Done: {len(sequence):,} bases.")
+    text_box.delete(1.0, tk.END)
+    text_box.insert(tk.END, f"FASTA Sequence:\n{preview(sequence)}\n\n")
+
+    # Display stats
+    min_tm, max_tm = tm_values.min(), tm_values.max()
+    text_box.insert(tk.END, f"Computed {len(tm_values)} windows.\n\n")
+    text_box.insert(tk.END, f"Tm Simple: Min = {min_tm:.2f} °C, Max = {max_tm:.2f} °C\n\n")
+
+    if regions is not None:
+        last_regions = regions
+        text_box.insert(tk.END, f"Threshold set to: {threshold} °C\n\n")
+        text_box.insert(tk.END, f"Regions above threshold: {len(regions[1])}\n\n")
+
+    # Show chart
+    plot_tm_chart(positions, tm_values, threshold)
+
+
 def analyze_fasta():
+    global current_task
     filepath = filedialog.askopenfilename(
         title="Select a FASTA file",
         filetypes=(("FASTA files", "*.fasta *.fa"), ("All files", "*.*"))
     )
 
     if filepath:
-        sequence = read_fasta_file(filepath)
-        text_box.delete(1.0, tk.END)
-        text_box.insert(tk.END, f"FASTA Sequence:\n{sequence}\n\n")
-
-        if len(sequence) < 9:
-            text_box.insert(tk.END, "Error: Sequence too short for 9-position sliding window.")
-            return
-
-        positions, tm_values = compute_tm_for_sequence(sequence)
-
-        # Display stats
-        min_tm, max_tm = min(tm_values), max(tm_values)
-        text_box.insert(tk.END, f"Computed {len(tm_values)} windows.\n\n")
-        text_box.insert(tk.END, f"Tm Simple: Min = {min_tm:.2f} °C, Max = {max_tm:.2f} °C\n\n")
-
-        # Get threshold value
+        # Get threshold value (widgets are only read from the GUI thread)
         try:
             threshold = float(threshold_entry.get())
         except ValueError:
             threshold = None
 
-        if threshold is not None:
-            text_box.insert(tk.END, f"Threshold set to: {threshold} °C\n\n")
+        # The analysis runs in the background; the window keeps responding
+        set_busy(True, "Starting...")
+        current_task = BackgroundTask(analyze_file, filepath, threshold).start()
+        watch(root, current_task, show_results, on_progress=show_progress, on_error=show_error,
+              on_cancel=lambda: set_busy(False, "Cancelled."))
 
-        # Show chart
-        plot_tm_chart(positions, tm_values, threshold)
+
+def cancel_analysis():
+    if current_task is not None:
+        current_task.cancel()
+
+
+def export_bed():
+    """Saves the regions above the threshold from the last analysis as a BED file."""
+    if last_regions is None:
+        text_box.insert(tk.END, "Nothing to export: load a FASTA file with a threshold first.\n")
+        return
+    filepath = filedialog.asksaveasfilename(
+        title="Save regions as BED",
+        defaultextension=".bed",
+        filetypes=(("BED files", "*.bed"), ("All files", "*.*"))
+    )
+    if filepath:
+        name, starts, ends = last_regions
+        write_bed(filepath, name, starts, ends)
+        text_box.insert(tk.END, f"Saved {len(starts)} regions to {filepath}\n")
 
 
 # === GUI Setup ===
-root = tk.Tk()
-root.title("DNA Melting Temperature Analyzer")
+if __name__ == "__main__":
+    import tkinter as tk
+    from tkinter import filedialog, scrolledtext
+
+    root = tk.Tk()
+    root.title("DNA Melting Temperature Analyzer")
+
+    frame = tk.Frame(root)
+    frame.pack(pady=10)
+
+    btn = tk.Button(frame, text="Load FASTA File", command=analyze_fasta)
+    btn.grid(row=0, column=0, padx=5)
+
+    tk.Label(frame, text="Threshold (°C):").grid(row=0, column=1)
+    threshold_entry = tk.Entry(frame, width=10)
+    threshold_entry.grid(row=0, column=2, padx=5)
+    threshold_entry.insert(0, "30")  # Default threshold
 
-frame = tk.Frame(root)
-frame.pack(pady=10)
+    export_btn = tk.Button(frame, text="Export BED", command=export_bed)
+    export_btn.grid(row=0, column=3, padx=5)
 
-btn = tk.Button(frame, text="Load FASTA File", command=analyze_fasta)
-btn.grid(row=0, column=0, padx=5)
+    cancel_btn = tk.Button(frame, text="Cancel", command=cancel_analysis, state=tk.DISABLED)
+    cancel_btn.grid(row=0, column=4, padx=5)
 
-tk.Label(frame, text="Threshold (°C):").grid(row=0, column=1)
-threshold_entry = tk.Entry(frame, width=10)
-threshold_entry.grid(row=0, column=2, padx=5)
-threshold_entry.insert(0, "30")  # Default threshold
+    status = tk.Label(root, text="", anchor="w")
+    status.pack(fill=tk.X, padx=10)
 
-text_box = scrolledtext.ScrolledText(root, wrap=tk.WORD, width=70, height=20)
-text_box.pack(padx=10, pady=10)
+    text_box = scrolledtext.ScrolledText(root, wrap=tk.WORD, width=70, height=20)
+    text_box.pack(padx=10, pady=10)
 
-root.mainloop()
+    root.mainloop()
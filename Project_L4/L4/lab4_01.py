@@ -2,6 +2,13 @@
 Implement an application that converts the coding region of a gene into an amino acid sequence. 
 Use the genetic code from from moodle.
 """
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from bioutils.fasta import read_sequence
+from bioutils.orfs import find_orfs
+from bioutils.translate import translate
 
 GENETIC_CODE_not_very_usefull = { 
     "Phe": ["UUU", "UUC"],
@@ -92,31 +99,34 @@ genetic_code = {
     "UAA": "Stop", "UAG": "Stop", "UGA": "Stop"
 }
 
+# One-letter code (used by the translation engine) -> three-letter name
+one_letter_names = {
+    "F": "Phe", "L": "Leu", "I": "Ile", "M": "Met", "V": "Val", "S": "Ser",
+    "P": "Pro", "T": "Thr", "A": "Ala", "Y": "Tyr", "H": "His", "Q": "Gln",
+    "N": "Asn", "K": "Lys", "D": "Asp", "E": "Glu", "C": "Cys", "W": "Trp",
+    "R": "Arg", "G": "Gly", "*": "Stop", "X": "Xaa"
+}
 
 
 S = "AGAAUGGAAUUUUGA"
 
 def start_frame(S):
-    for i in range(len(S) - 2):
-        codon = S[i:i+3]
-        if codon == "AUG": 
-            return S[i:]
+    i = S.find("AUG")
+    if i != -1:
+        return S[i:]
     return ""
 
 
 def translate_rna_to_protein(mrna_seq):
-    protein = []
-    
-    for i in range(0, len(mrna_seq), 3):
-        codon = mrna_seq[i:i+3]
-        if len(codon) < 3:
-            break
-        amino_acid = genetic_code.get(codon)
-        if amino_acid == "Stop":
-            break
-        protein.append(amino_acid)
-    
-    return "-".join(protein)
+    # Vectorized table lookup, stops at the first Stop codon
+    protein = translate(mrna_seq, to_stop=True)
+    return "-".join(one_letter_names[aa] for aa in protein)
+
+
+def list_coding_regions(filepath, min_length=100):
+    """Returns every ORF (both strands, all frames) of a FASTA genome, longest first."""
+    genome = read_sequence(filepath)
+    return sorted(find_orfs(genome, min_length=min_length), key=lambda orf: -len(orf.protein))
 
 
 def main():
@@ -124,6 +134,13 @@ def main():
     print("mRNA sequence:", S)
     print("Amino acid sequence:", amino_acids)
 
+    if os.path.exists("covid.fasta"):
+        orfs = list_coding_regions("covid.fasta")
+        print(f"\nORFs of at least 100 aa in covid.fasta: {len(orfs)}")
+        for orf in orfs[:10]:
+            print(f"  {orf.start + 1}-{orf.end} frame {orf.frame:+d}: {len(orf.protein)} aa "
+                  f"({orf.protein[:10]}...)")
+
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
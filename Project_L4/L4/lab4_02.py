@@ -8,10 +8,17 @@ c) Compare the two results and show the most frequent codons between the two
 d) Show in the output of the console top 3 amino acids for each genome.
 e) What foods have less of the aminoacids found at previous points
 """
+import os
+import sys
 from collections import Counter
-import matplotlib.pyplot as plt
 import numpy as np
 
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from bioutils.align import MATCH, align_score, edit_distance
+from bioutils.cache import cached
+from bioutils.codons import codon_counts, codon_labels, enc, rscu, usage_frequencies
+from bioutils.packed import PackedSequence
+
 genetic_code = {
     "UUU": "Phe", "UUC": "Phe", "UUA": "Leu", "UUG": "Leu",
     "CUU": "Leu", "CUC": "Leu", "CUA": "Leu", "CUG": "Leu",
@@ -33,83 +40,83 @@ genetic_code = {
 }
 
 def read_fasta(filename):
-    """Read FASTA file and return the sequence as a single string (DNA → RNA)."""
-    with open(filename, "r") as f:
-        lines = f.readlines()
-    seq = "".join(line.strip() for line in lines if not line.startswith(">"))
-    # Convert DNA to RNA
-    return seq.replace("T", "U")
-
-def codon_frequencies(sequence):
-    """Count codon frequencies in an RNA sequence."""
-    codons = [sequence[i:i+3] for i in range(0, len(sequence)-2, 3) if len(sequence[i:i+3]) == 3]
-    return Counter(codons)
-
-def compare_codon_usage(file1, file2):
-    """Compare codon frequencies between two FASTA files, plot top codons, and show amino acids."""
-    seq1 = read_fasta(file1)
-    seq2 = read_fasta(file2)
-
-    freq1 = codon_frequencies(seq1)
-    freq2 = codon_frequencies(seq2)
-
-    total1 = sum(freq1.values())
-    total2 = sum(freq2.values())
-
-    print(f"\n{'Codon':<6} | {'COVID-19 (%)':>12} | {'Influenza (%)':>12}")
-    print("-" * 38)
-
-    all_codons = sorted(set(freq1.keys()) | set(freq2.keys()))
-    for codon in all_codons:
-        f1 = (freq1[codon] / total1 * 100) if codon in freq1 else 0
-        f2 = (freq2[codon] / total2 * 100) if codon in freq2 else 0
-        print(f"{codon:<6} | {f1:>10.3f}% | {f2:>10.3f}%")
-
-    # --- Top 10 codons for each virus ---
-    top10_covid = [codon for codon, _ in freq1.most_common(10)]
-    top10_flu = [codon for codon, _ in freq2.most_common(10)]
-
-    # Union of top codons
-    top_codons_union = sorted(set(top10_covid + top10_flu))
-
-    # Percentages for the union
-    covid_perc = [(freq1[codon] / total1 * 100) if codon in freq1 else 0 for codon in top_codons_union]
-    flu_perc = [(freq2[codon] / total2 * 100) if codon in freq2 else 0 for codon in top_codons_union]
-
-    # --- Highlight most frequent codons between the two ---
-    combined_freq = [(c, covid_perc[i] + flu_perc[i]) for i, c in enumerate(top_codons_union)]
-    combined_freq.sort(key=lambda x: x[1], reverse=True)
-    most_frequent_codons = [c for c, _ in combined_freq[:5]]
-    print("\nMost frequent codons between COVID-19 and Influenza:", most_frequent_codons)
-
-    # --- Top 3 amino acids for each genome ---
-    def top_amino_acids(freq_counter, genome_name):
+    """Read FASTA file and return the sequence as a packed sequence (DNA → RNA view)."""
+    return PackedSequence.from_fasta(filename).to_rna()
+
+def file_codon_counts(filename):
+    """The 64 codon counts over the ORFs of a FASTA file, cached on disk."""
+    return cached(filename, "codon_counts", {"min_length": 100, "table": 1, "packed": True},
+                  lambda: codon_counts(read_fasta(filename)))
+
+def compare_codon_usage(*files, names=None):
+    """Compare codon frequencies between any number of FASTA files, plot top codons, and show amino acids."""
+    names = list(names) if names else [os.path.splitext(os.path.basename(f))[0] for f in files]
+
+    # One row of 64 codon counts per genome
+    matrix = np.vstack([file_codon_counts(f) for f in files])
+    perc = usage_frequencies(matrix)
+    rscu_matrix = rscu(matrix)
+    codons = codon_labels(rna=True)
+
+    header = " | ".join(f"{name + ' (%)':>14}" for name in names)
+    header_line = f"{'Codon':<6} | {header} | {'RSCU':>{8 * len(names)}}"
+    print("\n" + header_line)
+    print("-" * len(header_line))
+    for c in np.flatnonzero(matrix.sum(axis=0)):
+        values = " | ".join(f"{p:>13.3f}%" for p in perc[:, c])
+        rscu_values = "".join(f"{r:>8.2f}" for r in rscu_matrix[:, c])
+        print(f"{codons[c]:<6} | {values} | {rscu_values}")
+
+    # --- Top 10 codons for each virus, and their union ---
+    top10 = [np.argsort(-row, kind="stable")[:10] for row in matrix]
+    top_codons_union = sorted(set(np.concatenate(top10).tolist()), key=lambda c: codons[c])
+    union_perc = perc[:, top_codons_union]
+
+    # --- Highlight most frequent codons between the genomes ---
+    combined = union_perc.sum(axis=0)
+    most_frequent_codons = [codons[top_codons_union[i]] for i in np.argsort(-combined, kind="stable")[:5]]
+    print(f"\nMost frequent codons between {' and '.join(names)}:", most_frequent_codons)
+
+    # --- Top 3 amino acids and effective number of codons for each genome ---
+    for name, row in zip(names, matrix):
         aa_counter = Counter()
-        for codon, count in freq_counter.items():
-            aa = genetic_code.get(codon, "Unknown")
-            aa_counter[aa] += count
-        print(f"Top 3 amino acids in {genome_name}: {aa_counter.most_common(3)}")
-
-    top_amino_acids(freq1, "COVID-19")
-    top_amino_acids(freq2, "Influenza")
+        for c, count in enumerate(row):
+            aa_counter[genetic_code.get(codons[c], "Unknown")] += int(count)
+        print(f"Top 3 amino acids in {name}: {aa_counter.most_common(3)}")
+        print(f"Effective number of codons (ENC) in {name}: {enc(row):.2f}")
 
     # --- Plotting grouped bar chart ---
+    import matplotlib.pyplot as plt  # only loaded when a chart is drawn
+
     x = np.arange(len(top_codons_union))
-    width = 0.35
+    width = 0.8 / len(names)
 
     plt.figure(figsize=(12, 6))
-    plt.bar(x - width/2, covid_perc, width, label='COVID-19', color='salmon')
-    plt.bar(x + width/2, flu_perc, width, label='Influenza', color='skyblue')
+    for i, name in enumerate(names):
+        plt.bar(x + (i - (len(names) - 1) / 2) * width, union_perc[i], width, label=name)
 
     plt.xlabel("Codon")
     plt.ylabel("Frequency (%)")
-    plt.title("Top Codon Usage Comparison: COVID-19 vs Influenza")
-    plt.xticks(x, top_codons_union)
+    plt.title(f"Top Codon Usage Comparison: {' vs '.join(names)}")
+    plt.xticks(x, [codons[c] for c in top_codons_union])
     plt.legend()
     plt.show()
 
+def compare_sequences(file_a, file_b, names=None):
+    """Print how well the shorter genome aligns inside the longer one (local score and edit distance)."""
+    names = list(names) if names else [os.path.splitext(os.path.basename(f))[0] for f in (file_a, file_b)]
+    (short_name, short), (long_name, long) = sorted(
+        zip(names, (str(read_fasta(file_a)), str(read_fasta(file_b)))), key=lambda item: len(item[1]))
+    score = align_score(short, long, mode="local")
+    distance = edit_distance(short, long, mode="infix")
+    print(f"\nLocal alignment score of {short_name} in {long_name}: {score} "
+          f"(a perfect match would score {MATCH * len(short)})")
+    print(f"Edit distance of {short_name} to its best match in {long_name}: {distance} "
+          f"({distance / len(short) * 100:.1f}% of {len(short)} bases)")
+
 
 if __name__ == "__main__":
-    compare_codon_usage("covid.fasta", "influenza.fasta")
+    compare_codon_usage("covid.fasta", "influenza.fasta", names=["COVID-19", "Influenza"])
+    compare_sequences("covid.fasta", "influenza.fasta", names=["COVID-19", "Influenza"])
     foods = "If you want foods low in the most frequent amino acids (like Leu, Val, Ile, Ser, Gly), focus on: \nFruits – apples, oranges, berries, melons\nVegetables – lettuce, cucumbers, tomatoes, carrots\nRefined grains – white rice, white bread\nStarches – potatoes, tapioca, corn\nFats and oils – olive oil, butter, coconut oil\nThese foods are carb- or fat-dominant, not protein-dominant, so they have low amino acid content overall"
     print(foods)
\ No newline at end of file
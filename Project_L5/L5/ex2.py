@@ -1,15 +1,21 @@
-import random
-import time
-import matplotlib.pyplot as plt
+import sys
+from functools import partial
 import os  # <-- added to extract filenames easily
 
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from bioutils.batch import assemble, expand_inputs, run_batch
+from bioutils.benchmark import summarize, time_call
+from bioutils.cache import cached
+from bioutils.debruijn import DEFAULT_K
+from bioutils.packed import PackedSequence
+from bioutils.sampling import FragmentSet, make_rng
+
+
 # === Function to read a FASTA file ===
 def read_fasta(filepath):
-    with open(filepath, "r") as f:
-        lines = f.readlines()
-    # Remove header (lines starting with ">")
-    seq = "".join(line.strip() for line in lines if not line.startswith(">"))
-    return seq
+    # Header lines (starting with ">") are skipped by the shared reader and the
+    # genome is kept 2-bit packed (4x smaller than a str)
+    return PackedSequence.from_fasta(filepath)
 
 
 # === Function to compute GC content ===
@@ -20,93 +26,90 @@ def gc_content(sequence):
 
 
 # === Function to create random samples ===
-def sample_fragments(dna, num_samples=2000, min_len=100, max_len=150):
-    seq_length = len(dna)
-    seqs = []
-    for _ in range(num_samples):
-        length = random.randint(min_len, max_len)
-        start = random.randint(0, seq_length - length)
-        sequence = dna[start:start + length]
-        seqs.append(sequence)
-    return seqs
-
-
-# === Function to find best overlap (>= 10 bases) ===
-def find_best_overlap(current_seq, fragments, used_indices):
-    best_overlap = 0
-    best_fragment = None
-    best_index = None
-
-    for i, frag in enumerate(fragments):
-        if i in used_indices:
-            continue
-        # Check decreasing overlap lengths
-        for j in range(100, 10, -1):
-            if current_seq.endswith(frag[:j]):
-                if j > best_overlap:
-                    best_overlap = j
-                    best_fragment = frag
-                    best_index = i
-    return best_fragment, best_index, best_overlap
+# All starts and lengths are drawn at once; `dna` is only read at those
+# positions, in one vectorized gather from the packed genome.
+# rng: a seed or numpy Generator makes the samples reproducible.
+def sample_fragments(dna, num_samples=2000, min_len=100, max_len=150, rng=None):
+    return FragmentSet.sample(dna, num_samples, min_len, max_len, rng).strings()
 
 
 # === Function to assemble fragments ===
-def assemble_fragments(seqs):
-    reconstructed = seqs[0]
-    used = {0}
-
-    while True:
-        next_frag, next_idx, overlap = find_best_overlap(reconstructed, seqs, used)
-        if next_frag is None or overlap < 10:
-            break
-        reconstructed += next_frag[overlap:]
-        used.add(next_idx)
-    return reconstructed
-
-
-# === MAIN SECTION ===
-
-fasta_files = [
-    'viruses\\bovine_stomatitis.fasta', 'viruses\\camelpox.fasta', "viruses\\canarypox.fasta",
-    "viruses\\ectomelia.fasta", "viruses\\fowlpox.fasta", "viruses\\goatpox.fasta",
-    "viruses\\lumpy_skin_disease.fasta", "viruses\\sheeppox.fasta", "viruses\\taterpox.fasta",
-    "viruses\\yaba_monkey_tumor.fasta"
-]
-
-assembly_times = []
-gc_percentages = []
-virus_names = []
-
-for fasta_path in fasta_files:
+# mode="greedy": repeatedly append the unused fragment with the longest
+# overlap (>= 11 bases) with the end of the contig. Candidates come from a
+# seed index over the fragment prefixes, so each step no longer scans them all.
+# mode="debruijn": build a de Bruijn graph of the fragments' k-mers and return
+# its longest unitig, which can also grow to the left and stops at repeats.
+# mode="overlap": compute all fragment-to-fragment overlaps once
+# and return the longest path of the overlap graph.
+def assemble_fragments(seqs, mode="greedy", k=DEFAULT_K):
+    contigs = assemble(seqs, mode, k)
+    return contigs[0] if contigs else ""
+
+
+# === Function to analyze one genome (runs in a worker process) ===
+# The samples only depend on (seed, genome name); the assembly is timed
+# `repeats` times after a warmup run and the median is reported, with its 95%
+# confidence interval (order statistics, so at least 6 repeats for 95%).
+def analyze_genome(fasta_path, mode="greedy", seed=None, repeats=6):
+    name = os.path.splitext(os.path.basename(fasta_path))[0]
     dna = read_fasta(fasta_path)
-    gc = gc_content(dna)
-    gc_percentages.append(gc)
-
-    seqs = sample_fragments(dna)
+    gc = float(cached(fasta_path, "gc_content", None, lambda: gc_content(dna)))
+    seqs = sample_fragments(dna, rng=make_rng(seed, name))
 
-    start_time = time.time()
-    assembled = assemble_fragments(seqs)
-    end_time = time.time()
+    assembled = []
+    timing = summarize(time_call(lambda: assembled.append(assemble_fragments(seqs, mode=mode)),
+                                 repeats=repeats, warmups=1))
 
-    elapsed_ms = (end_time - start_time) * 1000
-    assembly_times.append(elapsed_ms)
+    return {
+        "name": name,
+        "gc": round(gc, 4),
+        "time_ms": round(timing["median_ms"], 3),
+        "ci_low_ms": round(timing["ci_low_ms"], 3),
+        "ci_high_ms": round(timing["ci_high_ms"], 3),
+        "assembled_length": len(assembled[-1]),
+    }
 
-    virus_name = os.path.basename(fasta_path).replace(".fasta", "")
-    virus_names.append(virus_name)
 
-    print(f"{virus_name}: GC% = {gc:.2f}, Time = {elapsed_ms:.2f} ms")
-
-# === Plot chart ===
-plt.figure(figsize=(10, 7))
-plt.scatter(gc_percentages, assembly_times, color="blue", s=80)
-
-# Add labels next to each point
-for i, name in enumerate(virus_names):
-    plt.text(gc_percentages[i] + 0.1, assembly_times[i] + 5, name, fontsize=9)
+# === MAIN SECTION ===
 
-plt.xlabel("Overall C + G Percentage (%)")
-plt.ylabel("Assembly Time (ms)")
-plt.title("DNA Assembly Time vs GC Content (10 Viral Genomes)")
-plt.grid(True)
-plt.tight_layout()
-plt.show()
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+ASSEMBLY_MODE = "greedy"  # or "debruijn", "overlap"
+WORKERS = None  # number of processes, None = one per core
+SEED = 42  # None for different samples on every run
+REPEATS = 6
+RESULTS_FILE = os.path.join(SCRIPT_DIR, "assembly_results.csv")
+
+if __name__ == "__main__":
+    # FASTA files, directories or glob patterns; by default the viruses folder next to this script
+    fasta_files = expand_inputs(sys.argv[1:] or [os.path.join(SCRIPT_DIR, "viruses")])
+
+    assembly_times = []
+    gc_percentages = []
+    virus_names = []
+
+    # Genomes are processed in parallel; each result is appended to RESULTS_FILE as it finishes
+    analysis = partial(analyze_genome, mode=ASSEMBLY_MODE, seed=SEED, repeats=REPEATS)
+    for result in run_batch(analysis, fasta_files, output=RESULTS_FILE, workers=WORKERS):
+        gc_percentages.append(result["gc"])
+        assembly_times.append(result["time_ms"])
+        virus_names.append(result["name"])
+        print(f"{result['name']}: GC% = {result['gc']:.2f}, Time = {result['time_ms']:.2f} ms "
+              f"(95% CI {result['ci_low_ms']:.2f}-{result['ci_high_ms']:.2f})")
+
+    # === Plot chart ===
+    import matplotlib.pyplot as plt  # only loaded when a chart is drawn
+
+    plt.figure(figsize=(10, 7))
+    plt.scatter(gc_percentages, assembly_times, color="blue", s=80)
+
+    # Add labels next to each point (offset in points, whatever the time scale)
+    for i, name in enumerate(virus_names):
+        plt.annotate(name, (gc_percentages[i], assembly_times[i]), xytext=(4, 4),
+                     textcoords="offset points", fontsize=9)
+
+    plt.xlabel("Overall C + G Percentage (%)")
+    plt.ylabel(f"Assembly Time (ms, median of {REPEATS})")
+    plt.title(f"DNA Assembly Time vs GC Content ({len(virus_names)} Viral Genomes)")
+    plt.grid(True)
+    plt.tight_layout()
+    plt.show()
@@ -0,0 +1,86 @@
+"""
+Compares the greedy, de Bruijn graph and overlap graph assemblers on
+the genomes in Project_L5/L5/viruses, sampling fragments as the L5 labs do
+(2000 fragments of 100-150 bases).
+
+Times are the median of REPEATS runs after a warmup, with the 95%
+confidence interval of the median, and the peak memory comes from a separate
+tracemalloc run (bioutils.benchmark.benchmark). Accuracy is measured on
+exact matches: a contig that occurs in the genome covers its bases, a contig
+that does not is counted as misassembled.
+
+Run from anywhere:  python benchmarks/bench_assembly.py [k [repeats]]
+"""
+import glob
+import os
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+from bioutils.assembly import greedy_assemble, overlap_graph_assemble
+from bioutils.benchmark import benchmark
+from bioutils.debruijn import DEFAULT_K, debruijn_assemble
+from bioutils.packed import PackedSequence
+from bioutils.sampling import FragmentSet, make_rng
+
+VIRUSES_DIR = os.path.join(ROOT, "Project_L5", "L5", "viruses")
+NUM_SAMPLES = 2000
+MIN_LEN, MAX_LEN = 100, 150
+SEED = 42
+REPEATS = 6  # the fewest with a 95% confidence interval of the median
+
+
+def exact_accuracy(genome, contigs):
+    """Returns (% of genome covered by exactly matching contigs, misassembled contigs)."""
+    covered = bytearray(len(genome))
+    misassembled = 0
+    for contig in contigs:
+        pos = genome.find(contig)
+        if pos < 0:
+            misassembled += 1
+        else:
+            covered[pos:pos + len(contig)] = b"\x01" * len(contig)
+    return sum(covered) / len(genome) * 100, misassembled
+
+
+def measure(assembler, fragments, repeats=REPEATS):
+    """Returns (contigs, benchmark() summary: median_ms, ci_low_ms, ci_high_ms, peak_kib, ...)."""
+    contigs = []
+
+    def run():
+        contigs[:] = assembler(fragments)
+
+    return contigs, benchmark(run, repeats)
+
+
+def main():
+    k = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_K
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else REPEATS
+    assemblers = {
+        "greedy": lambda fragments: [greedy_assemble(fragments)],
+        f"de Bruijn k={k}": lambda fragments: debruijn_assemble(fragments, k=k),
+        "overlap graph": overlap_graph_assemble,
+    }
+    print(f"{NUM_SAMPLES} fragments of {MIN_LEN}-{MAX_LEN} bases per genome, seed {SEED}, "
+          f"median of {repeats} runs\n")
+    header = (f"{'Genome':<22} | {'Assembler':<15} | {'Median ms':>9} | {'95% CI (ms)':>15} | "
+              f"{'Peak (KiB)':>10} | {'Contigs':>7} | {'Longest':>7} | {'Covered %':>9} | {'Misasm.':>7}")
+    print(header)
+    print("-" * len(header))
+    for path in sorted(glob.glob(os.path.join(VIRUSES_DIR, "*.fasta"))):
+        packed = PackedSequence.from_fasta(path)
+        genome = str(packed)
+        name = os.path.splitext(os.path.basename(path))[0]
+        fragments = FragmentSet.sample(packed, NUM_SAMPLES, MIN_LEN, MAX_LEN,
+                                       make_rng(SEED, name)).strings()
+        for label, assembler in assemblers.items():
+            contigs, stats = measure(assembler, fragments, repeats)
+            covered, misassembled = exact_accuracy(genome, contigs)
+            longest = max((len(c) for c in contigs), default=0)
+            ci = f"{stats['ci_low_ms']:.1f}-{stats['ci_high_ms']:.1f}"
+            print(f"{name:<22} | {label:<15} | {stats['median_ms']:>9.1f} | {ci:>15} | "
+                  f"{stats['peak_kib']:>10.0f} | {len(contigs):>7} | {longest:>7} | {covered:>9.2f} | {misassembled:>7}")
+
+
+if __name__ == "__main__":
+    main()
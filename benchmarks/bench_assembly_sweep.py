@@ -0,0 +1,106 @@
+"""
+Reproducible benchmark of the assembly engines over a parameter sweep.
+
+Every case (genome, genome size, number of fragments, fragment lengths,
+seed, engine) gets the same seeded fragments for every engine, warmup runs,
+repeated perf_counter_ns timings with a 95% confidence interval, and a
+separate tracemalloc run for the peak memory. One JSON Lines (or CSV) row is
+written per case, with the machine description in every row.
+
+    python benchmarks/bench_assembly_sweep.py --output results.jsonl
+    python benchmarks/bench_assembly_sweep.py --baseline results.jsonl   # exit 1 on regressions
+
+Genome sizes are prefixes of each genome ("full" for the whole genome).
+The overlap engine runs on one core so that engines are compared fairly.
+"""
+import argparse
+import os
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+from bioutils.batch import ASSEMBLY_MODES, ResultWriter, assemble, expand_inputs
+from bioutils.benchmark import benchmark, find_regressions, grid, load_results, machine_info
+from bioutils.packed import PackedSequence
+from bioutils.sampling import FragmentSet, make_rng
+
+VIRUSES_DIR = os.path.join(ROOT, "Project_L5", "L5", "viruses")
+CASE_KEYS = ("genome", "genome_size", "num_samples", "fragment_length", "seed", "engine")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("inputs", nargs="*", default=[VIRUSES_DIR],
+                        help="FASTA files, directories or glob patterns (default: L5 viruses)")
+    parser.add_argument("--engines", nargs="+", choices=ASSEMBLY_MODES, default=list(ASSEMBLY_MODES))
+    parser.add_argument("--seeds", nargs="+", type=int, default=[0])
+    parser.add_argument("--repeats", type=int, default=6)
+    parser.add_argument("--warmups", type=int, default=1)
+    parser.add_argument("--num-samples", nargs="+", type=int, default=[500, 2000])
+    parser.add_argument("--fragment-lengths", nargs="+", default=["100-150"],
+                        help="min-max fragment length ranges")
+    parser.add_argument("--genome-sizes", nargs="+", default=["full"],
+                        help="genome prefix lengths, or 'full'")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc run")
+    parser.add_argument("--output", help="results file (.jsonl/.json or .csv)")
+    parser.add_argument("--baseline", help="JSON Lines results to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.10,
+                        help="relative slowdown of the median that counts as a regression")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    info = machine_info()
+    print(", ".join(f"{k}={v}" for k, v in info.items()))
+    cases = grid(genome_size=args.genome_sizes, num_samples=args.num_samples,
+                 fragment_length=args.fragment_lengths, seed=args.seeds)
+
+    results = []
+    writer = ResultWriter(args.output) if args.output else None
+    try:
+        for path in expand_inputs(args.inputs):
+            name = os.path.splitext(os.path.basename(path))[0]
+            full = PackedSequence.from_fasta(path)
+            for case in cases:
+                size = case["genome_size"]
+                genome = full if size == "full" else full[:int(size)]
+                min_len, max_len = (int(x) for x in case["fragment_length"].split("-"))
+                if len(genome) < max_len:
+                    continue
+                fragments = FragmentSet.sample(genome, case["num_samples"], min_len, max_len,
+                                               make_rng(case["seed"], name)).strings()
+                for engine in args.engines:
+                    contigs = []
+
+                    def run():
+                        contigs[:] = assemble(fragments, engine)
+
+                    stats = benchmark(run, args.repeats, args.warmups, memory=not args.no_memory)
+                    row = {"genome": name, **case, "genome_size": size, "length": len(genome),
+                           "engine": engine, **stats, "contigs": len(contigs),
+                           "longest": max((len(c) for c in contigs), default=0), **info}
+                    results.append(row)
+                    if writer:
+                        writer.write(row)
+                    print(f"{name:<20} {size:>8} n={case['num_samples']:<5} "
+                          f"len={case['fragment_length']:<8} seed={case['seed']:<3} {engine:<9} "
+                          f"median {stats['median_ms']:9.2f} ms  "
+                          f"95% CI [{stats['ci_low_ms']:.2f}, {stats['ci_high_ms']:.2f}]"
+                          + (f"  peak {stats['peak_kib']:.0f} KiB" if "peak_kib" in stats else ""))
+    finally:
+        if writer:
+            writer.close()
+
+    if args.baseline:
+        regressions = find_regressions(load_results(args.baseline), results, CASE_KEYS,
+                                       args.tolerance)
+        for case, old_ms, new_ms in regressions:
+            print(f"REGRESSION {case}: {old_ms:.2f} ms -> {new_ms:.2f} ms")
+        print(f"{len(regressions)} regression(s) against {args.baseline}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Compares the old copy-pasted FASTA readers with the shared streaming reader
+(bioutils.fasta) on the genomes in Project_L5/L5/viruses.
+
+Run from anywhere:  python benchmarks/bench_fasta.py
+"""
+import glob
+import os
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+from bioutils.fasta import read_sequence
+
+VIRUSES_DIR = os.path.join(ROOT, "Project_L5", "L5", "viruses")
+REPEATS = 5
+
+
+def legacy_read_fasta(filepath):
+    """The reader that was copy-pasted in L3, L4 and L5 (readlines + join)."""
+    with open(filepath, "r") as f:
+        lines = f.readlines()
+    return "".join(line.strip() for line in lines if not line.startswith(">"))
+
+
+READERS = {
+    "legacy readlines": legacy_read_fasta,
+    "streaming str": read_sequence,
+    "streaming bytes": lambda path: read_sequence(path, as_bytes=True),
+}
+
+
+def measure(reader, files):
+    """Returns (best time in ms over REPEATS runs, peak traced memory in KiB)."""
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        for path in files:
+            reader(path)
+        best = min(best, time.perf_counter() - start)
+
+    peak = 0
+    for path in files:
+        tracemalloc.start()
+        reader(path)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return best * 1000, peak / 1024
+
+
+def main():
+    files = sorted(glob.glob(os.path.join(VIRUSES_DIR, "*.fasta")))
+    total_kb = sum(os.path.getsize(p) for p in files) / 1024
+    print(f"{len(files)} files, {total_kb:.0f} KiB total, best of {REPEATS} runs\n")
+    print(f"{'Reader':<18} | {'Time (ms)':>10} | {'Peak mem / file (KiB)':>22}")
+    print("-" * 56)
+    for name, reader in READERS.items():
+        elapsed_ms, peak_kb = measure(reader, files)
+        print(f"{name:<18} | {elapsed_ms:>10.2f} | {peak_kb:>22.0f}")
+
+
+if __name__ == "__main__":
+    main()
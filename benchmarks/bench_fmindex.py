@@ -0,0 +1,75 @@
+"""
+Compares linear scans (str.count / `in`) with the FM-index (bioutils.fmindex)
+for batches of motif queries against the genomes in Project_L5/L5/viruses.
+
+Queries are random 20-mers taken from each genome (so they all occur) plus
+the same number of random 20-mers (which almost never do). The index build
+time is reported separately: it is paid once, the index is then reloaded
+from disk (memory-mapped) by ensure_fm_index().
+
+Run from anywhere:  python benchmarks/bench_fmindex.py
+"""
+import glob
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+from bioutils.fasta import read_sequence
+from bioutils.fmindex import FMIndex
+
+VIRUSES_DIR = os.path.join(ROOT, "Project_L5", "L5", "viruses")
+NUM_QUERIES = 1000
+MOTIF_LENGTH = 20
+SEED = 0
+
+
+def make_queries(genome, rng):
+    starts = rng.integers(0, len(genome) - MOTIF_LENGTH, size=NUM_QUERIES)
+    present = [genome[s:s + MOTIF_LENGTH] for s in starts.tolist()]
+    letters = np.frombuffer(b"ACGT", dtype=np.uint8)[rng.integers(0, 4, size=(NUM_QUERIES, MOTIF_LENGTH))]
+    absent = [row.tobytes().decode("ascii") for row in letters]
+    return present + absent
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main():
+    files = sorted(glob.glob(os.path.join(VIRUSES_DIR, "*.fasta")))
+    rng = np.random.default_rng(SEED)
+    print(f"{2 * NUM_QUERIES} queries of {MOTIF_LENGTH} bases per genome\n")
+    print(f"{'Genome':<22} | {'Length':>8} | {'Build (ms)':>10} | {'Load (ms)':>9} | "
+          f"{'str.count (ms)':>14} | {'`in` (ms)':>9} | {'FM count (ms)':>13}")
+    print("-" * 104)
+    workdir = tempfile.mkdtemp()
+    try:
+        for path in files:
+            name = os.path.splitext(os.path.basename(path))[0]
+            genome = read_sequence(path).upper()
+            queries = make_queries(genome, rng)
+
+            index, build_ms = timed(lambda: FMIndex.build(genome))
+            index_dir = os.path.join(workdir, name + ".fmi")
+            index.save(index_dir)
+            index, load_ms = timed(lambda: FMIndex.load(index_dir))
+
+            _, scan_ms = timed(lambda: [genome.count(q) for q in queries])
+            _, in_ms = timed(lambda: [q in genome for q in queries])
+            _, fm_ms = timed(lambda: index.count_many(queries))
+            print(f"{name[:22]:<22} | {len(genome):>8} | {build_ms:>10.1f} | {load_ms:>9.2f} | "
+                  f"{scan_ms:>14.1f} | {in_ms:>9.1f} | {fm_ms:>13.1f}")
+    finally:
+        shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+"""
+Shared helpers used by the lab projects (Project_L1 ... Project_L5).
+
+Every lab script adds the repository root to sys.path and imports the module
+it needs, e.g. ``from bioutils.fasta import read_sequence``. Submodules are
+not imported here so that importing the package stays cheap.
+"""
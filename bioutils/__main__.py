@@ -0,0 +1,7 @@
+"""python -m bioutils: see bioutils.cli."""
+import sys
+
+from bioutils.cli import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,156 @@
+"""
+Pairwise alignment kernels.
+
+edit_distance() is Myers' bit-vector algorithm (Myers 1999, in Hyyro's
+formulation): a whole column of the edit-distance DP matrix is held in two
+bit vectors (+1 / -1 vertical deltas), and one text character updates all of
+it with a constant number of and/or/xor/add/shift operations. Python ints
+are arbitrary precision, so patterns of any length work, at a cost of
+O(len(text) * len(pattern) / 64) machine-word operations. Modes:
+"global" aligns both strings end to end, "infix" finds the best match of the
+pattern anywhere inside the text, and "prefix" aligns the pattern with a
+prefix of the text (e.g. the end of one read with the start of the next).
+
+align_scores() computes alignment scores (match / mismatch / linear gap)
+for one query against many targets: the DP matrix is filled one
+anti-diagonal at a time, since all cells of an anti-diagonal only depend on
+the two previous ones, and the targets are stacked as rows so that every
+step is a NumPy operation over (targets x diagonal cells). Modes: "global"
+(Needleman-Wunsch), "local" (Smith-Waterman) and "semiglobal" (the whole
+query against any part of the target).
+"""
+import numpy as np
+
+EDIT_MODES = ("global", "infix", "prefix")
+SCORE_MODES = ("global", "local", "semiglobal")
+MATCH, MISMATCH, GAP = 2, -1, -2
+_NEG = -(1 << 40)  # minus infinity that survives adding penalties
+
+
+def _peq(pattern):
+    """Bit mask of the positions of every character in pattern."""
+    masks = {}
+    for i, ch in enumerate(pattern):
+        masks[ch] = masks.get(ch, 0) | (1 << i)
+    return masks
+
+
+def edit_distance(pattern, text, mode="global"):
+    """Levenshtein distance between pattern and text (or the best infix / prefix of text, see EDIT_MODES)."""
+    if mode not in EDIT_MODES:
+        raise ValueError(f"mode must be one of {EDIT_MODES}")
+    if mode == "global" and len(pattern) > len(text):
+        pattern, text = text, pattern  # the shorter string makes the smaller bit vectors
+    if not pattern:
+        return len(text) if mode == "global" else 0
+    return _myers(_peq(pattern), len(pattern), text, mode)
+
+
+def _myers(peq, m, text, mode):
+    """Bit-vector edit distance of a pattern (given by its peq masks and length m) against text."""
+    mask = (1 << m) - 1
+    high = 1 << (m - 1)
+    carry = 0 if mode == "infix" else 1  # top row D[0][j] = j, or 0 when the text start is free
+    pv, mv, score = mask, 0, m
+    best = score
+    for ch in text:
+        eq = peq.get(ch, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = (mv | ~(xh | pv)) & mask
+        mh = pv & xh
+        if ph & high:
+            score += 1
+        elif mh & high:
+            score -= 1
+        ph = ((ph << 1) | carry) & mask
+        mh = (mh << 1) & mask
+        pv = (mh | ~(xv | ph)) & mask
+        mv = ph & xv
+        if score < best:
+            best = score
+    return score if mode == "global" else best
+
+
+def edit_distances(query, targets, mode="global"):
+    """Edit distance of query (the pattern) against every target; returns an int array."""
+    if mode not in EDIT_MODES:
+        raise ValueError(f"mode must be one of {EDIT_MODES}")
+    if not query:
+        return np.array([len(t) if mode == "global" else 0 for t in targets], dtype=np.int64)
+    peq = _peq(query)
+    return np.array([_myers(peq, len(query), t, mode) for t in targets], dtype=np.int64)
+
+
+def _as_codes(sequence):
+    if isinstance(sequence, str):
+        sequence = sequence.encode("ascii")
+    return np.frombuffer(bytes(sequence), dtype=np.uint8)
+
+
+def align_scores(query, targets, mode="global", match=MATCH, mismatch=MISMATCH, gap=GAP):
+    """Best alignment score of query against every target (int array), linear gap penalty.
+
+    Targets are padded to a common length with a symbol that matches
+    nothing; scores are read at each target's own end, so padding never
+    changes them.
+    """
+    if mode not in SCORE_MODES:
+        raise ValueError(f"mode must be one of {SCORE_MODES}")
+    q = _as_codes(query)
+    n = len(q)
+    lengths = np.array([len(t) for t in targets], dtype=np.int64)
+    count, m = len(targets), int(lengths.max(initial=0))
+    if n == 0:
+        return lengths * gap if mode == "global" else np.zeros(count, dtype=np.int64)
+    # Rows are targets reversed, so that the cells of an anti-diagonal are a forward slice
+    rev = np.zeros((count, m), dtype=np.uint8)
+    for row, target in enumerate(targets):
+        codes = _as_codes(target)
+        rev[row, m - len(codes):] = codes[::-1]
+
+    local = mode == "local"
+    free_target = mode != "global"  # target start (and end) gaps are free
+
+    def border(d):
+        """H[0][d] and H[d][0] of anti-diagonal d, stored at cell i = 0 and i = d."""
+        diag = np.full((count, n + 1), _NEG, dtype=np.int64)
+        if d <= m:
+            diag[:, 0] = 0 if free_target else d * gap
+        if d <= n:
+            diag[:, d] = 0 if local else d * gap
+        return diag
+
+    prev2, prev1 = border(0), border(1)
+    best = np.zeros(count, dtype=np.int64) if local else np.full(count, _NEG, dtype=np.int64)
+    if mode == "global":
+        best[lengths == 0] = n * gap
+    elif mode == "semiglobal":
+        best[:] = n * gap  # query aligned to an empty stretch of the target
+
+    for d in range(2, n + m + 1):
+        cur = border(d)
+        lo, hi = max(1, d - m), min(n, d - 1)
+        if lo <= hi:
+            same = q[lo - 1:hi] == rev[:, m - d + lo:m - d + hi + 1]
+            cur[:, lo:hi + 1] = np.maximum(
+                prev2[:, lo - 1:hi] + np.where(same, match, mismatch),
+                np.maximum(prev1[:, lo - 1:hi], prev1[:, lo:hi + 1]) + gap)
+            if local:
+                np.maximum(cur[:, lo:hi + 1], 0, out=cur[:, lo:hi + 1])
+                # Cells past a target's end only lose score, so they never raise the maximum
+                np.maximum(best, cur[:, lo:hi + 1].max(axis=1), out=best)
+        if d > n:
+            j = d - n  # column of the last query row on this diagonal
+            last = cur[:, n]
+            if mode == "global":
+                best = np.where(lengths == j, last, best)
+            elif mode == "semiglobal":
+                best = np.where(j <= lengths, np.maximum(best, last), best)
+        prev2, prev1 = prev1, cur
+    return best
+
+
+def align_score(query, target, mode="global", match=MATCH, mismatch=MISMATCH, gap=GAP):
+    """Best alignment score of two sequences (see align_scores)."""
+    return int(align_scores(query, [target], mode, match, mismatch, gap)[0])
@@ -0,0 +1,233 @@
+"""
+Greedy overlap assembly of sequencing fragments with a seed index.
+
+This is the same algorithm as the L5 labs: start from the first fragment and
+repeatedly append the unused fragment whose prefix has the longest exact
+overlap (between min_overlap and max_overlap bases) with the end of the
+assembly, the lowest fragment index winning ties (fragments shorter than
+max_overlap were scored differently by the labs' loop, see greedy_assemble).
+Instead of testing every fragment at every overlap length, fragments are
+indexed by their first min_overlap bases (the seed): for each overlap length
+j only the fragments whose seed equals the tail's j-th suffix seed are
+checked, so an extension costs max_overlap - min_overlap + 1 dict lookups
+whatever the number of fragments.
+
+With max_errors > 0 (reads with sequencing errors) the seed must still
+match exactly, but the rest of an overlap is accepted when its edit distance
+to the start of the fragment is at most max_errors (bioutils.align).
+
+overlap_graph() instead computes every fragment-to-fragment suffix/prefix
+overlap once, with the same seed index, in chunks spread over a process
+pool; overlap_graph_assemble() then only traverses that graph.
+"""
+import os
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from bioutils.align import edit_distance
+from bioutils.chunked import pool_context
+
+MIN_OVERLAP = 11
+MAX_OVERLAP = 100
+CHUNK_SIZE = 256  # fragments per overlap_graph() task
+
+
+class SeedIndex:
+    """Maps the first `seed` bases of each fragment to the sorted indices of the unused fragments."""
+
+    def __init__(self, fragments, seed=MIN_OVERLAP):
+        self.fragments = fragments
+        self.seed = seed
+        self.used = bytearray(len(fragments))
+        self._buckets = defaultdict(list)
+        for i, frag in enumerate(fragments):
+            if len(frag) >= seed:
+                self._buckets[frag[:seed]].append(i)
+
+    def mark_used(self, index):
+        self.used[index] = 1
+
+    def candidates(self, seed_string):
+        """Unused fragment indices whose seed is seed_string, in increasing order."""
+        bucket = self._buckets.get(seed_string)
+        if not bucket:
+            return []
+        if any(self.used[i] for i in bucket):
+            bucket[:] = [i for i in bucket if not self.used[i]]
+        return bucket
+
+
+def best_overlap(tail, index, min_overlap=MIN_OVERLAP, max_overlap=MAX_OVERLAP, max_errors=0):
+    """Returns (fragment index, overlap) of the best extension of `tail`, or (None, 0)."""
+    fragments = index.fragments
+    seed = index.seed
+    for j in range(min(max_overlap, len(tail)), min_overlap - 1, -1):
+        suffix = tail[len(tail) - j:]
+        for i in index.candidates(suffix[:seed]):
+            frag = fragments[i]
+            if frag.startswith(suffix):
+                return i, j
+            if max_errors and len(frag) >= j and edit_distance(suffix, frag[:j]) <= max_errors:
+                return i, j
+    return None, 0
+
+
+def greedy_assemble(fragments, min_overlap=MIN_OVERLAP, max_overlap=MAX_OVERLAP, max_errors=0):
+    """Assembles fragments greedily to the right of fragments[0]; returns the contig.
+
+    A fragment that fits entirely inside the last max_overlap bases is
+    consumed without extending the contig, as in the labs' original loop.
+    The contigs are those of that loop only when every fragment is at least
+    max_overlap bases long (the L5 samples are 100-150): the loop scored a
+    shorter fragment found at the end of the contig as an overlap of
+    max_overlap, here it scores len(fragment), so ties can resolve differently.
+    With max_errors > 0, overlaps may differ by up to that many edits (the
+    contig keeps its own bases over the overlap).
+    """
+    if not fragments:
+        return ""
+    index = SeedIndex(fragments, seed=min_overlap)
+    index.mark_used(0)
+    pieces = [fragments[0]]
+    tail = fragments[0][-max_overlap:]
+
+    while True:
+        next_idx, overlap = best_overlap(tail, index, min_overlap, max_overlap, max_errors)
+        if next_idx is None:
+            break
+        extension = fragments[next_idx][overlap:]
+        pieces.append(extension)
+        tail = (tail + extension)[-max_overlap:]
+        index.mark_used(next_idx)
+    return "".join(pieces)
+
+
+# === All-vs-all overlaps ===
+
+def _chunk_overlaps(start, stop, index, min_overlap, max_overlap):
+    """Overlaps and containments of fragments[start:stop] against all fragments.
+
+    Every seed position i of fragment a is looked up: a fragment b with that
+    seed either lies inside a (contained) or, if a[i:] is a prefix of b, b
+    overlaps the end of a by len(a) - i bases.
+    """
+    fragments = index.fragments
+    seed = index.seed
+    src, dst, lengths, contained = [], [], [], []
+    for a in range(start, stop):
+        frag = fragments[a]
+        n = len(frag)
+        for i in range(n - seed + 1):
+            for b in index.candidates(frag[i:i + seed]):
+                if b == a:
+                    continue
+                other = fragments[b]
+                overlap = n - i
+                if len(other) <= overlap:
+                    # b lies inside a; of two identical fragments the later one is dropped
+                    if frag.startswith(other, i) and (len(other) < n or i > 0 or b > a):
+                        contained.append(b)
+                elif min_overlap <= overlap <= max_overlap and other.startswith(frag[i:]):
+                    src.append(a)
+                    dst.append(b)
+                    lengths.append(overlap)
+    return src, dst, lengths, contained
+
+
+_WORKER_STATE = None
+
+
+def _init_worker(fragments, min_overlap, max_overlap):
+    global _WORKER_STATE
+    _WORKER_STATE = (SeedIndex(fragments, seed=min_overlap), min_overlap, max_overlap)
+
+
+def _worker_chunk(bounds):
+    index, min_overlap, max_overlap = _WORKER_STATE
+    return _chunk_overlaps(bounds[0], bounds[1], index, min_overlap, max_overlap)
+
+
+def overlap_graph(fragments, min_overlap=MIN_OVERLAP, max_overlap=None, workers=None,
+                  chunk_size=CHUNK_SIZE):
+    """Finds every exact suffix/prefix overlap of at least min_overlap bases.
+
+    Returns (src, dst, length, contained): the edges as int64 arrays (the end
+    of fragments[src] equals the start of fragments[dst] over `length`
+    bases) and a boolean array marking fragments lying inside another one.
+    max_overlap=None allows overlaps of any length. The fragments are split
+    in chunks of chunk_size processed by `workers` processes (os.cpu_count()
+    by default); with one worker or a single chunk everything runs in-process.
+    """
+    fragments = [str(f) for f in fragments]
+    max_overlap = max_overlap or max((len(f) for f in fragments), default=0)
+    bounds = [(start, min(start + chunk_size, len(fragments)))
+              for start in range(0, len(fragments), chunk_size)]
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1 or len(bounds) <= 1:
+        index = SeedIndex(fragments, seed=min_overlap)
+        results = [_chunk_overlaps(start, stop, index, min_overlap, max_overlap)
+                   for start, stop in bounds]
+    else:
+        # Not forked: this may run on a background thread of a GUI (see bioutils.chunked)
+        with ProcessPoolExecutor(max_workers=workers, mp_context=pool_context(), initializer=_init_worker,
+                                 initargs=(fragments, min_overlap, max_overlap)) as pool:
+            results = list(pool.map(_worker_chunk, bounds))
+
+    src, dst, lengths = (np.array([x for r in results for x in r[col]], dtype=np.int64)
+                         for col in range(3))
+    contained = np.zeros(len(fragments), dtype=bool)
+    contained[[b for r in results for b in r[3]]] = True
+    return src, dst, lengths, contained
+
+
+def overlap_graph_assemble(fragments, min_overlap=MIN_OVERLAP, max_overlap=None, workers=None):
+    """Assembles fragments into contigs (longest first) by traversing their overlap graph.
+
+    Contained fragments are left out; the remaining edges are taken longest
+    overlap first, each fragment keeping at most one successor and one
+    predecessor and no edge closing a cycle. Every resulting path is a contig.
+    """
+    fragments = [str(f) for f in fragments]
+    src, dst, lengths, contained = overlap_graph(fragments, min_overlap, max_overlap, workers)
+    keep = ~contained[src] & ~contained[dst]
+    src, dst, lengths = src[keep], dst[keep], lengths[keep]
+    order = np.lexsort((dst, src, -lengths))
+
+    n = len(fragments)
+    successor = [-1] * n
+    overlap_to_next = [0] * n
+    has_predecessor = bytearray(n)
+    parent = list(range(n))
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for a, b, length in zip(src[order].tolist(), dst[order].tolist(), lengths[order].tolist()):
+        if successor[a] != -1 or has_predecessor[b]:
+            continue
+        root_a, root_b = find(a), find(b)
+        if root_a == root_b:
+            continue
+        parent[root_b] = root_a
+        successor[a] = b
+        overlap_to_next[a] = length
+        has_predecessor[b] = 1
+
+    contigs = []
+    for start in range(n):
+        if contained[start] or has_predecessor[start]:
+            continue
+        pieces = [fragments[start]]
+        node = start
+        while successor[node] != -1:
+            pieces.append(fragments[successor[node]][overlap_to_next[node]:])
+            node = successor[node]
+        contigs.append("".join(pieces))
+    contigs.sort(key=len, reverse=True)
+    return contigs
@@ -0,0 +1,205 @@
+"""
+Batch runner: one analysis per FASTA file, fanned out over a process pool.
+
+run_batch() takes any picklable function of a file path that returns a flat
+dict, runs it on every file with a ProcessPoolExecutor and yields the dicts
+as genomes finish. When an output path is given, each result is appended to
+it (CSV, TSV, JSON Lines for .jsonl, or a JSON array for .json, closed at
+the end) and flushed right away, so a long panel can be followed, and its
+partial results kept, while it runs.
+Parquet (.parquet, needs pyarrow) is columnar, so it is written on close.
+
+assembly_stats() is the analysis used for the L5 GC% vs assembly time study.
+"""
+import csv
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from bioutils.assembly import greedy_assemble, overlap_graph_assemble
+from bioutils.chunked import pool_context
+from bioutils.debruijn import DEFAULT_K, debruijn_assemble
+from bioutils.evaluate import evaluate_assembly
+from bioutils.packed import PackedSequence
+from bioutils.sampling import FragmentSet, make_rng
+
+FASTA_EXTENSIONS = (".fasta", ".fa", ".fna", ".fas")
+ASSEMBLY_MODES = ("greedy", "debruijn", "overlap")
+
+
+def expand_inputs(inputs):
+    """Sorted FASTA paths from a mix of files, directories and glob patterns."""
+    if isinstance(inputs, str):
+        inputs = [inputs]
+    paths = set()
+    for item in inputs:
+        if os.path.isdir(item):
+            paths.update(os.path.join(item, name) for name in os.listdir(item)
+                         if name.lower().endswith(FASTA_EXTENSIONS))
+        elif os.path.isfile(item):
+            paths.add(item)
+        else:
+            matches = glob.glob(item, recursive=True)
+            if not matches:
+                raise ValueError(f"no FASTA file matches '{item}'")
+            paths.update(m for m in matches if os.path.isfile(m))
+    return sorted(paths)
+
+
+class ResultWriter:
+    """Appends flat result dicts to a .csv, .tsv, .jsonl or .json (one array) file, flushing each row.
+
+    A .parquet path keeps the rows and writes them on close (needs pyarrow);
+    path None or "-" writes TSV to standard output.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        name = (path or "-").lower()
+        self.format = ("parquet" if name.endswith(".parquet") else
+                       "csv" if name.endswith(".csv") else
+                       "jsonl" if name.endswith(".jsonl") else
+                       "json" if name.endswith(".json") else "tsv")
+        if self.format == "parquet":
+            try:
+                import pyarrow.parquet
+            except ImportError:
+                raise ValueError("writing Parquet files needs the pyarrow package") from None
+            self._pyarrow = pyarrow
+            self._file = None
+            self._rows = []
+        elif name == "-":
+            self._file = sys.stdout
+        else:
+            self._file = open(path, "w", newline="" if self.format in ("csv", "tsv") else None)
+        self._csv = None
+        self._rows_written = 0
+
+    def write(self, result):
+        if self.format == "parquet":
+            self._rows.append(result)
+            return
+        if self.format == "jsonl":
+            self._file.write(json.dumps(result) + "\n")
+        elif self.format == "json":
+            self._file.write(("[\n" if self._rows_written == 0 else ",\n") + json.dumps(result))
+        else:
+            if self._csv is None:
+                options = {"dialect": "excel-tab", "lineterminator": "\n"} if self.format == "tsv" else {}
+                self._csv = csv.DictWriter(self._file, fieldnames=list(result), **options)
+                self._csv.writeheader()
+            self._csv.writerow(result)
+        self._rows_written += 1
+        self._file.flush()
+
+    def close(self):
+        if self.format == "parquet":
+            self._pyarrow.parquet.write_table(self._pyarrow.Table.from_pylist(self._rows), self.path)
+            return
+        if self.format == "json":
+            self._file.write("\n]\n" if self._rows_written else "[]\n")
+        if self._file is not sys.stdout:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def run_batch(func, paths, output=None, workers=None):
+    """Yields func(path) for every path, in completion order.
+
+    workers=None uses os.cpu_count(); workers=1 runs in this process. func
+    must be defined at module level (or be a functools.partial of such a
+    function) so that it can be sent to the workers; the workers are not
+    forked, they import it, so a script must keep its own work under
+    `if __name__ == "__main__":`.
+    """
+    paths = list(paths)
+    writer = ResultWriter(output) if output else None
+    pool = None
+    try:
+        if workers == 1 or len(paths) <= 1:
+            results = (func(path) for path in paths)
+        else:
+            # Not forked, like the other pools (see bioutils.chunked)
+            pool = ProcessPoolExecutor(max_workers=workers, mp_context=pool_context())
+            futures = [pool.submit(func, path) for path in paths]
+            results = (future.result() for future in as_completed(futures))
+        for result in results:
+            if writer:
+                writer.write(result)
+            yield result
+    finally:
+        if pool:
+            # Also reached when the caller stops early: drop the genomes not started yet
+            pool.shutdown(cancel_futures=True)
+        if writer:
+            writer.close()
+
+
+# === L5 assembly study ===
+
+def assemble(fragments, mode="greedy", k=DEFAULT_K):
+    """Contigs of one of the assembly engines, longest first (greedy gives exactly one)."""
+    if mode == "greedy":
+        return [greedy_assemble(fragments)]
+    if mode == "debruijn":
+        return debruijn_assemble(fragments, k=k)
+    if mode == "overlap":
+        # Already inside a batch worker: do not start a nested pool
+        return overlap_graph_assemble(fragments, workers=1)
+    raise ValueError(f"mode must be one of {ASSEMBLY_MODES}")
+
+
+def n50(lengths):
+    """Length of the contig that brings the sorted running total to half the assembly."""
+    half = sum(lengths) / 2
+    total = 0
+    for length in sorted(lengths, reverse=True):
+        total += length
+        if total >= half:
+            return length
+    return 0
+
+
+def assembly_stats(path, mode="greedy", num_samples=2000, min_len=100, max_len=150, seed=None,
+                   k=DEFAULT_K, evaluate=True):
+    """GC%, timings and contig statistics of sampling and assembling one genome.
+
+    With a seed, the fragments of a genome only depend on (seed, file name).
+    evaluate=True adds the alignment-based metrics of bioutils.evaluate.
+    """
+    name = os.path.splitext(os.path.basename(path))[0]
+    start = time.perf_counter()
+    packed = PackedSequence.from_fasta(path)
+    read_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    fragments = FragmentSet.sample(packed, num_samples, min_len, max_len,
+                                   make_rng(seed, name)).strings()
+    sample_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    contigs = assemble(fragments, mode, k)
+    assembly_ms = (time.perf_counter() - start) * 1000
+
+    lengths = [len(c) for c in contigs]
+    result = {
+        "name": name, "path": path, "length": len(packed), "gc": round(packed.gc_content(), 4),
+        "mode": mode, "fragments": len(fragments), "read_ms": round(read_ms, 3),
+        "sample_ms": round(sample_ms, 3), "assembly_ms": round(assembly_ms, 3),
+        "contigs": len(contigs), "longest": max(lengths, default=0), "n50": n50(lengths),
+        "assembled_bases": sum(lengths),
+    }
+    if evaluate:
+        report = evaluate_assembly(packed, contigs)
+        result.update(identity=round(report["identity"], 4),
+                      genome_fraction=round(report["genome_fraction"], 4),
+                      nga50=report["nga50"], misassemblies=report["misassemblies"])
+    return result
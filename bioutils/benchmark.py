@@ -0,0 +1,129 @@
+"""
+Small benchmarking harness: warmups, repeats, perf_counter_ns timings,
+tracemalloc peaks and 95% confidence intervals of the median.
+
+Timing and memory are measured in separate runs, since tracemalloc slows
+Python code down a lot. Results are flat dicts (see bioutils.batch.ResultWriter
+to stream them to CSV / JSON Lines), and find_regressions() compares a run
+against a saved baseline: a case regresses when the confidence interval of
+its median lies entirely above the baseline's and the median is slower by
+more than a tolerance, so noise alone does not trigger it.
+
+Timings are skewed (a run can only be slowed down), so the median is the
+reported figure and its interval comes from order statistics, which needs
+no assumption on the distribution: [x(r), x(n+1-r)] of the sorted samples
+holds the true median with probability 1 - 2 P(Binomial(n, 1/2) < r).
+With fewer than 6 samples no r reaches 95%, and the interval is [min, max]
+(93.75% for 5 samples).
+"""
+import itertools
+import json
+import math
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+CONFIDENCE = 0.95
+
+
+def time_call(func, repeats=5, warmups=1):
+    """Runs func warmups + repeats times; returns the durations of the repeats in ns."""
+    if repeats < 1:
+        raise ValueError("repeats must be at least 1")
+    for _ in range(warmups):
+        func()
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter_ns()
+        func()
+        samples.append(time.perf_counter_ns() - start)
+    return samples
+
+
+def peak_memory(func):
+    """Peak memory traced by tracemalloc during one call of func, in bytes."""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def median_ci(values, confidence=CONFIDENCE):
+    """(low, high) order-statistic confidence interval of the median of values."""
+    ordered = sorted(values)
+    n = len(ordered)
+    # Largest rank r whose interval [x(r), x(n+1-r)] still has the confidence
+    rank, below = 1, 0.5 ** n  # below = P(Binomial(n, 1/2) < rank)
+    while rank < (n + 1) // 2:
+        below_next = below + math.comb(n, rank) / 2 ** n
+        if 1 - 2 * below_next < confidence:
+            break
+        rank, below = rank + 1, below_next
+    return ordered[rank - 1], ordered[n - rank]
+
+
+def summarize(samples_ns):
+    """Median with its 95% CI (ci_low_ms, ci_high_ms), mean, stdev and min of ns samples, in ms."""
+    ms = [s / 1e6 for s in samples_ns]
+    low, high = median_ci(ms)
+    return {
+        "repeats": len(ms), "median_ms": statistics.median(ms), "ci_low_ms": low, "ci_high_ms": high,
+        "mean_ms": statistics.fmean(ms), "stdev_ms": statistics.stdev(ms) if len(ms) > 1 else 0.0,
+        "min_ms": min(ms),
+    }
+
+
+def benchmark(func, repeats=5, warmups=1, memory=True):
+    """Timing summary of func (see summarize) plus its tracemalloc peak in KiB."""
+    result = summarize(time_call(func, repeats, warmups))
+    if memory:
+        result["peak_kib"] = peak_memory(func) / 1024
+    return result
+
+
+def grid(**axes):
+    """Every combination of the given parameter lists, as dicts."""
+    names = list(axes)
+    return [dict(zip(names, values)) for values in itertools.product(*axes.values())]
+
+
+def machine_info():
+    """What a result depends on besides the code: interpreter, platform, cores, NumPy."""
+    return {
+        "python": sys.version.split()[0], "implementation": platform.python_implementation(),
+        "platform": platform.platform(), "machine": platform.machine(),
+        "cpu_count": os.cpu_count(), "numpy": np.__version__,
+    }
+
+
+def load_results(path):
+    """Reads a JSON Lines results file."""
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def find_regressions(baseline, results, keys, tolerance=0.10):
+    """Cases of results that got slower than in baseline.
+
+    Rows are matched on the values of `keys`; both conditions are on the
+    median (its confidence interval, then the tolerance). Returns a list of
+    (case dict, baseline median ms, current median ms).
+    """
+    reference = {tuple(row[k] for k in keys): row for row in baseline}
+    slower = []
+    for row in results:
+        case = tuple(row[k] for k in keys)
+        old = reference.get(case)
+        if old is None:
+            continue
+        if (row["ci_low_ms"] > old["ci_high_ms"]
+                and row["median_ms"] > old["median_ms"] * (1 + tolerance)):
+            slower.append((dict(zip(keys, case)), old["median_ms"], row["median_ms"]))
+    return slower
@@ -0,0 +1,168 @@
+"""
+Persistent on-disk cache for analysis results.
+
+The labs re-read and re-analyse the same reference genomes on every run.
+ResultCache stores the NumPy results of an analysis stage under a key made
+of (SHA-256 of the input file content, analysis name, parameters), so a
+repeated analysis of an unchanged file is a single .npz read, and a modified
+file or a new parameter value simply misses. Stages are cached separately
+(e.g. the per-window base counts, with the Tm formulas applied on top), so
+a parameter that only affects a later stage does not recompute the earlier
+ones.
+
+Every entry is one compressed .npz file in the cache directory, written to
+a temporary name and renamed, so concurrent workers of run_batch() never
+see a partial entry. A hit refreshes the file's modification time, and
+after every write the least recently used entries are deleted until the
+directory fits in max_bytes.
+
+Results are a NumPy array or a tuple of arrays (scalars and string lists
+are stored as arrays, no pickling). The default cache directory is
+~/.cache/bioutils, or the BIOUTILS_CACHE environment variable; setting it
+to "off" disables caching.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import zipfile
+
+import numpy as np
+
+from bioutils.sketch import source_id
+
+DEFAULT_DIR = os.path.join("~", ".cache", "bioutils")
+DEFAULT_MAX_BYTES = 1 << 30
+DISABLED = ("off", "none", "0", "")
+FORMAT = 1  # part of every key; bump when a stored layout changes
+
+_DIGESTS = {}  # (path, size, mtime) -> content hash, within one process
+_DEFAULT = None
+
+
+def file_digest(path):
+    """source_id() of a file, remembered while its size and mtime do not change."""
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+    if key not in _DIGESTS:
+        _DIGESTS[key] = source_id(path)
+    return _DIGESTS[key]
+
+
+class ResultCache:
+    """A directory of .npz results keyed by (file content, analysis, parameters), LRU-evicted."""
+
+    def __init__(self, directory=DEFAULT_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = os.path.expanduser(directory)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self.directory, exist_ok=True)
+
+    def key(self, source, analysis, params=None):
+        """Entry name for an analysis of source (a file path, or a list of paths)."""
+        paths = [source] if isinstance(source, (str, os.PathLike)) else list(source)
+        description = json.dumps([FORMAT, [file_digest(p) for p in paths], analysis, params or {}],
+                                 sort_keys=True, default=str)
+        return hashlib.sha256(description.encode()).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".npz")
+
+    def get(self, source, analysis, params=None):
+        """The cached result, or None."""
+        path = self._path(self.key(source, analysis, params))
+        try:
+            with np.load(path) as data:
+                result = (data["value"] if "value" in data.files
+                          else tuple(data[f"arr_{i}"] for i in range(len(data.files))))
+            os.utime(path)  # most recently used
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+            # Damaged entry (e.g. a full disk during the write): drop it and recompute
+            self._remove(path)
+            self.misses += 1
+            return None
+        self.hits += 1
+        return result
+
+    def put(self, source, analysis, params, result):
+        """Stores result (an array or a tuple of arrays) and returns it."""
+        path = self._path(self.key(source, analysis, params))
+        fd, temp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                if isinstance(result, tuple):
+                    np.savez_compressed(f, *result)
+                else:
+                    np.savez_compressed(f, value=result)
+            os.replace(temp, path)
+        except BaseException:
+            self._remove(temp)
+            raise
+        self.evict()
+        return result
+
+    def get_or_compute(self, source, analysis, params, compute):
+        """The cached result, or compute() stored in the cache."""
+        result = self.get(source, analysis, params)
+        if result is None:
+            result = self.put(source, analysis, params, compute())
+        return result
+
+    def _entries(self):
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".npz"):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:  # evicted by another process
+                    continue
+                entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+        return entries
+
+    def size(self):
+        """Total size of the entries in bytes."""
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self, max_bytes=None):
+        """Deletes the least recently used entries until the cache fits in max_bytes."""
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= max_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    def clear(self):
+        self.evict(0)
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def default_cache():
+    """The ResultCache of BIOUTILS_CACHE (default ~/.cache/bioutils), or None if it is off."""
+    global _DEFAULT
+    directory = os.environ.get("BIOUTILS_CACHE", DEFAULT_DIR)
+    if directory.strip().lower() in DISABLED:
+        return None
+    if _DEFAULT is None or _DEFAULT.directory != os.path.expanduser(directory):
+        _DEFAULT = ResultCache(directory)
+    return _DEFAULT
+
+
+def cached(source, analysis, params, compute):
+    """compute() through the default cache; just compute() when caching is off or source is None."""
+    cache = default_cache() if source is not None else None
+    if cache is None:
+        return compute()
+    return cache.get_or_compute(source, analysis, params, compute)
@@ -0,0 +1,173 @@
+"""
+Multi-process sliding-window profiles for large genomes.
+
+The windows are split into blocks of block_windows consecutive windows;
+a block needs the bases of its own windows plus a halo of window_size - 1
+bases (step permitting) that it shares with the next block. The sequence is
+copied once into a multiprocessing.shared_memory segment, and every worker
+process maps it and runs the ordinary serial engine (bioutils.windows,
+bioutils.tm) on its slice, so no sequence data is pickled. Block results are
+concatenated in window order, which gives exactly the arrays of the serial
+call: every window is computed from the same bases by the same code.
+
+A record of an indexed FASTA file (bioutils.faidx) needs no copy at all:
+record_window_map() has every worker open the file's .fai index and read
+its own blocks from the memory-mapped file, so a genome is profiled without
+ever being loaded whole.
+
+With one worker or a single block everything runs in-process. Worker
+processes are started by a fork server (spawned on systems without one),
+never forked from the caller: the Tk labs call this from a background
+thread, and forking a multi-threaded process can deadlock the child.
+"""
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from bioutils import tm
+from bioutils.faidx import IndexedFasta
+from bioutils.windows import as_byte_array, window_counts, window_starts
+
+BLOCK_WINDOWS = 1 << 22  # windows per task
+
+_WORKER_STATE = None
+
+
+def pool_context():
+    """multiprocessing context for worker pools: forkserver where available, else spawn."""
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+def block_bounds(length, window_size, step=1, block_windows=BLOCK_WINDOWS):
+    """(first window, end window, first base, end base) of every block of windows."""
+    count = len(window_starts(length, window_size, step))
+    bounds = []
+    for first in range(0, count, block_windows):
+        end = min(first + block_windows, count)
+        bounds.append((first, end, first * step, (end - 1) * step + window_size))
+    return bounds
+
+
+def _init_worker(name, length):
+    global _WORKER_STATE
+    shm = SharedMemory(name=name)  # the parent unlinks it; pool workers share its resource tracker
+    _WORKER_STATE = (shm, np.ndarray(length, dtype=np.uint8, buffer=shm.buf))
+
+
+def _worker_block(task):
+    func, start, stop, args = task
+    return func(_WORKER_STATE[1][start:stop], *args)
+
+
+def window_map(func, sequence, window_size, step=1, args=(), workers=None,
+               block_windows=BLOCK_WINDOWS):
+    """Runs func(block, *args) on every block of windows and returns the per-block results in order.
+
+    func must be a module-level function (it is sent to the worker
+    processes) returning the values of the block's windows.
+    """
+    data = as_byte_array(sequence)
+    bounds = block_bounds(len(data), window_size, step, block_windows)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(bounds) <= 1:
+        return [func(data[start:stop], *args) for _, _, start, stop in bounds]
+
+    shm = SharedMemory(create=True, size=max(len(data), 1))
+    try:
+        np.ndarray(len(data), dtype=np.uint8, buffer=shm.buf)[:] = data
+        tasks = [(func, start, stop, args) for _, _, start, stop in bounds]
+        with ProcessPoolExecutor(max_workers=min(workers, len(bounds)), mp_context=pool_context(),
+                                 initializer=_init_worker, initargs=(shm.name, len(data))) as pool:
+            return list(pool.map(_worker_block, tasks))
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def _read_record_block(record, start, stop):
+    return as_byte_array(record.fasta.fetch(record.name, start, stop, as_bytes=True).upper())
+
+
+def _init_record_worker(filepath, name):
+    global _WORKER_STATE
+    _WORKER_STATE = IndexedFasta(filepath)[name]
+
+
+def _worker_record_block(task):
+    func, start, stop, args = task
+    return func(_read_record_block(_WORKER_STATE, start, stop), *args)
+
+
+def record_window_map(func, record, window_size, step=1, args=(), workers=None,
+                      block_windows=BLOCK_WINDOWS):
+    """window_map() over a faidx RecordView, each block read (upper-cased) from the file by its worker."""
+    bounds = block_bounds(len(record), window_size, step, block_windows)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(bounds) <= 1:
+        return [func(_read_record_block(record, start, stop), *args) for _, _, start, stop in bounds]
+
+    tasks = [(func, start, stop, args) for _, _, start, stop in bounds]
+    with ProcessPoolExecutor(max_workers=min(workers, len(bounds)), mp_context=pool_context(),
+                             initializer=_init_record_worker,
+                             initargs=(record.fasta.filepath, record.name)) as pool:
+        return list(pool.map(_worker_record_block, tasks))
+
+
+def _counts_block(block, window_size, step, alphabet):
+    return window_counts(block, window_size, step, alphabet)[1]
+
+
+def chunked_window_counts(sequence, window_size, step=1, alphabet=None, workers=None,
+                          block_windows=BLOCK_WINDOWS):
+    """window_counts() computed block by block over a process pool; same result."""
+    data = as_byte_array(sequence)
+    if alphabet is None:
+        alphabet = [chr(b) for b in np.unique(data)]
+    alphabet = list(alphabet)
+    blocks = window_map(_counts_block, data, window_size, step, (window_size, step, alphabet),
+                        workers, block_windows)
+    dtype = np.int32 if len(data) < 2 ** 31 else np.int64
+    counts = (np.concatenate(blocks, axis=1).astype(dtype, copy=False) if blocks
+              else np.empty((len(alphabet), 0), dtype=dtype))
+    return window_starts(len(data), window_size, step), counts, alphabet
+
+
+def record_window_counts(record, window_size, step=1, alphabet="ACGT", workers=None,
+                         block_windows=BLOCK_WINDOWS):
+    """chunked_window_counts() of the upper-cased bases of a faidx RecordView, read block by block."""
+    alphabet = list(alphabet)
+    blocks = record_window_map(_counts_block, record, window_size, step, (window_size, step, alphabet),
+                               workers, block_windows)
+    dtype = np.int32 if len(record) < 2 ** 31 else np.int64
+    counts = (np.concatenate(blocks, axis=1).astype(dtype, copy=False) if blocks
+              else np.empty((len(alphabet), 0), dtype=dtype))
+    return window_starts(len(record), window_size, step), counts, alphabet
+
+
+def chunked_window_frequencies(sequence, window_size, step=1, alphabet=None, workers=None,
+                               block_windows=BLOCK_WINDOWS):
+    """window_frequencies() computed block by block over a process pool; same result."""
+    starts, counts, alphabet = chunked_window_counts(sequence, window_size, step, alphabet,
+                                                     workers, block_windows)
+    return starts, counts / window_size, alphabet
+
+
+def _tm_block(block, window_size, step, na):
+    return tm.tm_profile(block, window_size, step, na)[1:]
+
+
+def chunked_tm_profile(sequence, window_size=9, step=1, na=tm.DEFAULT_NA, workers=None,
+                       block_windows=BLOCK_WINDOWS):
+    """tm.tm_profile() computed block by block over a process pool; same result."""
+    data = as_byte_array(sequence)
+    blocks = window_map(_tm_block, data, window_size, step, (window_size, step, na),
+                        workers, block_windows)
+    if not blocks:
+        return tm.tm_profile(data, window_size, step, na)
+    simple = np.concatenate([b[0] for b in blocks])
+    alternative = np.concatenate([b[1] for b in blocks])
+    return window_starts(len(data), window_size, step) + 1, simple, alternative
@@ -0,0 +1,327 @@
+"""
+Command-line entry point for the lab analyses, without any GUI.
+
+    python -m bioutils composition 'Project_L5/L5/viruses/*.fasta' --window 1000 -o gc.tsv
+    python -m bioutils kmers genome.fasta -k 3 --top 10
+    python -m bioutils tm genome.fasta --window 9 --plot charts/
+    python -m bioutils translate genome.fasta --frame all
+    python -m bioutils codons Project_L4/L4/*.fasta -o codons.parquet
+    python -m bioutils assemble Project_L5/L5/viruses --mode debruijn -o assembly.jsonl
+
+Inputs are files, directories or glob patterns (bioutils.batch.expand_inputs);
+files are analysed in parallel with run_batch(). Every subcommand emits flat
+rows with a "file" column, written as TSV on standard output or to -o/--output
+(.tsv, .csv, .jsonl, .json or .parquet). Charts are only drawn with --plot,
+as PNG files: matplotlib is imported at that point, with a non-GUI backend,
+and each subcommand imports the analysis modules it needs, so neither Tk
+nor matplotlib is loaded by a plain run.
+
+Per-file results (window counts, k-mer, codon and symbol counts) go through
+the on-disk cache of bioutils.cache, so re-running on unchanged files, or
+with a new [Na+] for tm, does not recompute them. The --window profiles of a
+single-record genome are read block by block through its .fai index
+(bioutils.faidx) instead of loading the whole file.
+"""
+import argparse
+import os
+import sys
+from functools import partial
+
+import numpy as np
+
+from bioutils.batch import ASSEMBLY_MODES, ResultWriter, expand_inputs, run_batch
+from bioutils.cache import cached
+from bioutils.tm import DEFAULT_NA
+
+DEFAULT_WINDOW_STEP = 1
+
+
+def _name(path):
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+def _pyplot():
+    """matplotlib.pyplot with the Agg backend, imported on first use."""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    return plt
+
+
+def _save_chart(options, path, command, draw):
+    """Calls draw(plt) on a new figure and saves it as <plot dir>/<file>.<command>.png."""
+    if not options.get("plot"):
+        return
+    plt = _pyplot()
+    os.makedirs(options["plot"], exist_ok=True)
+    fig = plt.figure(figsize=(10, 5))
+    draw(plt)
+    plt.title(f"{_name(path)}: {command}")
+    fig.savefig(os.path.join(options["plot"], f"{_name(path)}.{command}.png"), dpi=100)
+    plt.close(fig)
+
+
+def _read_upper(path):
+    from bioutils.fasta import read_sequence
+    from bioutils.windows import as_byte_array
+
+    return as_byte_array(read_sequence(path, as_bytes=True).upper())
+
+
+def _indexed(path):
+    """IndexedFasta of a single-record file, or None if the file has several records or no valid .fai."""
+    from bioutils.faidx import IndexedFasta
+
+    try:
+        fasta = IndexedFasta(path)
+    except ValueError:  # lines of different lengths, e.g. text appended to a genome
+        return None
+    if len(fasta) != 1:
+        fasta.close()
+        return None
+    return fasta
+
+
+def _window_counts(path, options):
+    """(starts, A/C/G/T counts) of the --window/--step windows of a file, through the cache.
+
+    A single-record file that can be indexed is read block by block from its
+    .fai-indexed memory map; other files are read whole.
+    """
+    from bioutils.chunked import chunked_window_counts, record_window_counts
+
+    window, step, workers = options["window"], options["step"], options.get("window_workers")
+
+    def count():
+        fasta = _indexed(path)
+        if fasta is None:
+            return chunked_window_counts(_read_upper(path), window, step, "ACGT", workers=workers)[:2]
+        with fasta:
+            return record_window_counts(fasta[fasta.names[0]], window, step, "ACGT", workers=workers)[:2]
+
+    return cached(path, "window_counts", {"window": window, "step": step, "alphabet": "ACGT", "upper": True},
+                  count)
+
+
+# === Subcommands ===
+# Each one takes (path, options dict) and returns a list of flat rows.
+
+def composition_rows(path, options):
+    from bioutils.decimate import plot_signal
+
+    window = options.get("window")
+    if window:
+        starts, counts = _window_counts(path, options)
+        freqs, alphabet = counts / window, list("ACGT")
+
+        def draw(plt):
+            for symbol, row in zip(alphabet, freqs):
+                plot_signal(plt.gca(), starts + 1, row, label=symbol)
+            plt.xlabel("Window start")
+            plt.ylabel("Relative frequency")
+            plt.legend()
+
+        _save_chart(options, path, "composition", draw)
+        gc = freqs[alphabet.index("G")] + freqs[alphabet.index("C")]
+        return [{"file": path, "start": start + 1, **dict(zip(alphabet, column)), "gc": g}
+                for start, column, g in zip(starts.tolist(), freqs.T.tolist(), gc.tolist())]
+
+    symbols, counts = cached(path, "symbol_counts", {"upper": True},
+                             lambda: np.unique(_read_upper(path), return_counts=True))
+    composition = {chr(s): int(c) for s, c in zip(symbols.tolist(), counts.tolist())}
+    length = int(counts.sum())
+    gc = (composition.get("G", 0) + composition.get("C", 0)) / length * 100 if length else 0.0
+
+    def draw(plt):
+        plt.bar(list(composition), [c / length * 100 for c in composition.values()])
+        plt.xlabel("Symbol")
+        plt.ylabel("%")
+
+    _save_chart(options, path, "composition", draw)
+    return [{"file": path, "symbol": symbol, "count": count, "percent": round(count / length * 100, 4)}
+            for symbol, count in composition.items()] + [
+        {"file": path, "symbol": "GC", "count": composition.get("G", 0) + composition.get("C", 0),
+         "percent": round(gc, 4)}]
+
+
+def kmers_rows(path, options):
+    from bioutils.fasta import read_sequence
+    from bioutils.kmers import KmerCounts, count_kmers
+
+    alphabet = None if options["alphabet"] == "auto" else options["alphabet"]
+
+    def count():
+        counts = count_kmers(read_sequence(path).upper(), options["k"], alphabet, options["canonical"])
+        return counts.codes, counts.counts, np.array(counts.alphabet)
+
+    codes, kmer_counts, used = cached(path, "kmers", {"k": options["k"], "alphabet": alphabet,
+                                                      "canonical": options["canonical"], "upper": True}, count)
+    counts = KmerCounts(options["k"], str(used), codes, kmer_counts, options["canonical"])
+    total = counts.total
+    top = counts.most_common(options.get("top"))
+
+    def draw(plt):
+        plt.bar([kmer for kmer, _ in top], [n for _, n in top])
+        plt.xticks(rotation=90)
+        plt.xlabel("k-mer")
+        plt.ylabel("Count")
+
+    _save_chart(options, path, "kmers", draw)
+    return [{"file": path, "kmer": kmer, "count": n, "percent": round(n / total * 100, 4)}
+            for kmer, n in top]
+
+
+def tm_rows(path, options):
+    from bioutils import tm
+    from bioutils.decimate import plot_signal
+    from bioutils.fasta import read_sequence
+
+    window = options.get("window")
+    if not window:
+        sequence = read_sequence(path).upper()
+        simple, alternative = tm.tm_of_sequence(sequence, options["na"])
+        return [{"file": path, "length": len(sequence), "tm_simple": simple,
+                 "tm_alternative": round(alternative, 4)}]
+    # The window counts are cached; [Na+] only enters the formulas
+    starts, counts = _window_counts(path, options)
+    positions = starts + 1
+    simple, alternative = tm.tm_from_counts(counts, window, options["na"])
+
+    def draw(plt):
+        plot_signal(plt.gca(), positions, simple, label="Tm simple")
+        plot_signal(plt.gca(), positions, alternative, label="Tm alternative")
+        plt.xlabel("Position")
+        plt.ylabel("Tm (°C)")
+        plt.legend()
+
+    _save_chart(options, path, "tm", draw)
+    return [{"file": path, "position": p, "tm_simple": s, "tm_alternative": a}
+            for p, s, a in zip(positions.tolist(), simple.tolist(), alternative.tolist())]
+
+
+def translate_rows(path, options):
+    from bioutils.fasta import iter_fasta
+    from bioutils.translate import translate, translate_six_frames
+
+    rows = []
+    for header, sequence in iter_fasta(path):
+        if options["frame"] == "all":
+            frames = translate_six_frames(sequence, options["table"], options["to_stop"])
+        else:
+            frame = int(options["frame"])
+            frames = {frame + 1: translate(sequence, frame, options["table"], options["to_stop"])}
+        rows.extend({"file": path, "record": header or _name(path), "frame": f"{frame:+d}",
+                     "protein": protein} for frame, protein in frames.items())
+    return rows
+
+
+def codons_rows(path, options):
+    from bioutils.codons import codon_counts, codon_labels, rscu, usage_frequencies
+    from bioutils.fasta import read_sequence
+
+    counts = cached(path, "codon_counts", {"min_length": options["min_length"], "table": options["table"]},
+                    lambda: codon_counts(read_sequence(path), min_length=options["min_length"],
+                                         table=options["table"]))
+    percent = usage_frequencies(counts[None, :])[0]
+    relative = rscu(counts[None, :], options["table"])[0]
+    labels = codon_labels(rna=options["rna"])
+    top = np.argsort(-counts, kind="stable")[:10]
+
+    def draw(plt):
+        plt.bar([labels[c] for c in top], percent[top])
+        plt.xlabel("Codon")
+        plt.ylabel("%")
+
+    _save_chart(options, path, "codons", draw)
+    return [{"file": path, "codon": labels[c], "count": int(counts[c]),
+             "percent": round(float(percent[c]), 4), "rscu": round(float(relative[c]), 4)}
+            for c in range(len(labels))]
+
+
+def assemble_rows(path, options):
+    from bioutils.batch import assembly_stats
+
+    result = assembly_stats(path, options["mode"], options["num_samples"], options["min_len"],
+                            options["max_len"], options["seed"], evaluate=not options["no_evaluate"])
+    return [{"file": path, **result}]
+
+
+COMMANDS = {
+    "composition": (composition_rows, "symbol composition, or per-window frequencies with --window"),
+    "kmers": (kmers_rows, "overlapping k-mer counts"),
+    "tm": (tm_rows, "melting temperature, or a sliding-window Tm profile with --window"),
+    "translate": (translate_rows, "protein translation of one or all six frames"),
+    "codons": (codons_rows, "codon usage (counts, percentages, RSCU) over the ORFs"),
+    "assemble": (assemble_rows, "fragment sampling and assembly statistics (the L5 study)"),
+}
+
+
+def _run(command, options, path):
+    """Rows of one subcommand on one file (module level, so that worker processes can run it)."""
+    return COMMANDS[command][0](path, options)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m bioutils", description=__doc__.strip().splitlines()[0])
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    for command, (_, help_text) in COMMANDS.items():
+        sub = subparsers.add_parser(command, help=help_text, description=help_text)
+        sub.add_argument("inputs", nargs="+", help="FASTA files, directories or glob patterns")
+        sub.add_argument("-o", "--output", help="output file (.tsv, .csv, .jsonl, .json, .parquet); "
+                                                "TSV on standard output by default")
+        sub.add_argument("-j", "--workers", type=int, help="parallel files (default: all cores)")
+        if command not in ("translate", "assemble"):
+            sub.add_argument("--plot", metavar="DIR", help="also save a PNG chart per file in DIR")
+        if command in ("composition", "tm"):
+            sub.add_argument("--window", type=int, help="sliding window size")
+            sub.add_argument("--step", type=int, default=DEFAULT_WINDOW_STEP)
+        if command in ("translate", "codons"):
+            sub.add_argument("--table", type=int, default=1, help="NCBI genetic code")
+
+    sub = subparsers.choices["kmers"]
+    sub.add_argument("-k", type=int, default=2)
+    sub.add_argument("--alphabet", default="ACGT", help="symbols to count, or 'auto'")
+    sub.add_argument("--canonical", action="store_true", help="count a k-mer with its reverse complement")
+    sub.add_argument("--top", type=int, help="only the N most frequent k-mers")
+
+    subparsers.choices["tm"].add_argument("--na", type=float, default=DEFAULT_NA,
+                                          help="[Na+] in mol/L")
+
+    sub = subparsers.choices["translate"]
+    sub.add_argument("--frame", default="0", choices=["0", "1", "2", "all"])
+    sub.add_argument("--to-stop", action="store_true", help="stop at the first stop codon")
+
+    sub = subparsers.choices["codons"]
+    sub.add_argument("--min-length", type=int, default=100, help="minimum ORF length (amino acids)")
+    sub.add_argument("--rna", action="store_true", help="label codons with U instead of T")
+
+    sub = subparsers.choices["assemble"]
+    sub.add_argument("--mode", choices=ASSEMBLY_MODES, default="greedy")
+    sub.add_argument("--num-samples", type=int, default=2000)
+    sub.add_argument("--min-len", type=int, default=100)
+    sub.add_argument("--max-len", type=int, default=150)
+    sub.add_argument("--seed", type=int, default=42)
+    sub.add_argument("--no-evaluate", action="store_true", help="skip the reference alignment metrics")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    options = {key: value for key, value in vars(args).items()
+               if key not in ("command", "inputs", "output", "workers")}
+    try:
+        paths = expand_inputs(args.inputs)
+        # Files are the unit of parallelism; a single file may use the cores for its windows
+        options["window_workers"] = None if len(paths) == 1 else 1
+        with ResultWriter(args.output) as writer:
+            for rows in run_batch(partial(_run, args.command, options), paths, workers=args.workers):
+                for row in rows:
+                    writer.write(row)
+    except ValueError as error:
+        print(f"error: {error}", file=sys.stderr)
+        return 2
+    except BrokenPipeError:
+        # Output piped into e.g. head, which stopped reading
+        sys.stdout = open(os.devnull, "w")
+        return 1
+    return 0
@@ -0,0 +1,151 @@
+"""
+Codon usage: counts over coding regions, RSCU, CAI and ENC, for one genome
+or a whole panel at once.
+
+Codons are counted as integer indices 0..63 (see bioutils.translate) with
+np.bincount, only inside coding regions: the ORFs found by
+bioutils.orfs.find_orfs, or CDS coordinates supplied by the caller as
+(start, end, strand) tuples (0-based, half-open, forward-strand coordinates).
+A panel of N genomes is an (N, 64) count matrix.
+"""
+import os
+
+import numpy as np
+
+from bioutils.fasta import read_sequence
+from bioutils.orfs import find_orfs
+from bioutils.packed import encode_bases
+from bioutils.translate import AMBIGUOUS_CODON, codon_indices, codon_name, codon_table, \
+    reverse_complement_codes
+
+NUM_CODONS = 64
+
+
+def codon_counts(sequence, regions=None, min_length=100, table=1):
+    """Returns an int64 array of 64 codon counts over the coding regions of a sequence.
+
+    regions=None uses every ORF of at least min_length amino acids.
+    """
+    if regions is None:
+        regions = [(orf.start, orf.end, orf.strand)
+                   for orf in find_orfs(sequence, min_length=min_length, table=table)]
+    codes = encode_bases(sequence)
+    counts = np.zeros(AMBIGUOUS_CODON + 1, dtype=np.int64)
+    for start, end, strand in regions:
+        region = codes[start:end]
+        if strand == -1:
+            region = reverse_complement_codes(region)
+        counts += np.bincount(codon_indices(region), minlength=AMBIGUOUS_CODON + 1)
+    return counts[:NUM_CODONS]
+
+
+def synonymous_families(table=1):
+    """Returns (amino acid letters, family id of every codon); stop codons get id -1."""
+    letters = codon_table(table)[:NUM_CODONS]
+    amino_acids = sorted(set(chr(x) for x in letters) - {"*"})
+    index = {aa: i for i, aa in enumerate(amino_acids)}
+    family = np.array([index.get(chr(x), -1) for x in letters])
+    return amino_acids, family
+
+
+def rscu(counts, table=1):
+    """Relative synonymous codon usage: count / mean count of the codon's synonymous family.
+
+    counts can be one genome (64,) or a panel (N, 64); stop codons and
+    families that were never used get NaN.
+    """
+    counts = np.asarray(counts, dtype=float)
+    amino_acids, family = synonymous_families(table)
+    sense = family >= 0
+    totals = np.zeros(counts.shape[:-1] + (len(amino_acids),))
+    np.add.at(totals, (..., family[sense]), counts[..., sense])
+    sizes = np.bincount(family[sense], minlength=len(amino_acids))
+    result = np.full(counts.shape, np.nan)
+    expected = totals[..., family[sense]] / sizes[family[sense]]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        result[..., sense] = np.where(expected > 0, counts[..., sense] / expected, np.nan)
+    return result
+
+
+def relative_adaptiveness(reference_counts, table=1):
+    """CAI weights w = count / max count within the synonymous family.
+
+    Codons never seen in the reference get half a count, so they do not make
+    the CAI of a gene zero. Stop codons and single-codon families get NaN.
+    """
+    counts = np.asarray(reference_counts, dtype=float)
+    counts = np.where(counts == 0, 0.5, counts)
+    amino_acids, family = synonymous_families(table)
+    sizes = np.bincount(family[family >= 0], minlength=len(amino_acids))
+    weights = np.full(NUM_CODONS, np.nan)
+    for aa_id in range(len(amino_acids)):
+        members = family == aa_id
+        if sizes[aa_id] > 1:
+            weights[members] = counts[members] / counts[members].max()
+    return weights
+
+
+def cai(counts, weights):
+    """Codon adaptation index: geometric mean of the weights over the counted codons."""
+    counts = np.asarray(counts, dtype=float)
+    usable = ~np.isnan(weights)
+    total = counts[..., usable].sum(axis=-1)
+    log_sum = (counts[..., usable] * np.log(weights[usable])).sum(axis=-1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.exp(log_sum / total)
+
+
+def enc(counts, table=1):
+    """Effective number of codons (Wright 1990) of one genome's 64 counts.
+
+    Ranges from 20 (one codon per amino acid) to 61 (uniform usage) for the
+    standard code. Families are grouped by degeneracy; a class with no usable
+    family (e.g. Ile, the only 3-fold family) gets the average of the others.
+    """
+    counts = np.asarray(counts, dtype=float)
+    _, family = synonymous_families(table)
+    sizes = np.bincount(family[family >= 0])
+    by_size = {}
+    for aa_id, size in enumerate(sizes):
+        members = counts[family == aa_id]
+        n = members.sum()
+        f = np.nan
+        if size > 1 and n > 1:
+            p = members / n
+            f = (n * (p ** 2).sum() - 1) / (n - 1)
+        by_size.setdefault(int(size), []).append(f)
+
+    known = {size: np.nanmean(fs) for size, fs in by_size.items()
+             if size > 1 and not np.all(np.isnan(fs))}
+    if not known:
+        return float("nan")
+    fallback = np.mean(list(known.values()))
+    result = 0.0
+    for size, fs in by_size.items():
+        if size == 1:
+            result += len(fs)
+            continue
+        f = known.get(size, fallback)
+        result += len(fs) / f if f > 0 else len(fs) * size
+    return float(min(result, sizes.sum()))
+
+
+def codon_labels(rna=False):
+    return [codon_name(i, rna) for i in range(NUM_CODONS)]
+
+
+def panel_counts(filepaths, min_length=100, table=1):
+    """Counts codons over the ORFs of every FASTA file; returns (names, (N, 64) matrix)."""
+    names = [os.path.splitext(os.path.basename(path))[0] for path in filepaths]
+    matrix = np.zeros((len(filepaths), NUM_CODONS), dtype=np.int64)
+    for row, path in enumerate(filepaths):
+        matrix[row] = codon_counts(read_sequence(path), min_length=min_length, table=table)
+    return names, matrix
+
+
+def usage_frequencies(matrix):
+    """Row-normalised codon percentages of a (N, 64) count matrix."""
+    matrix = np.asarray(matrix, dtype=float)
+    totals = matrix.sum(axis=-1, keepdims=True)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(totals > 0, matrix / totals * 100, 0.0)
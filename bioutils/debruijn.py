@@ -0,0 +1,124 @@
+"""
+De Bruijn graph assembly of sequencing fragments.
+
+Every k-mer of the fragments is encoded as an integer (bioutils.kmers); the
+distinct k-mers, sorted, are the nodes of the graph and are identified by
+their index in that array. The up to four successors of a node x are the
+k-mers ((x mod 4^(k-1)) * 4 + b) and its predecessors (x // 4 + b * 4^(k-1)),
+so edges are found with np.searchsorted instead of being stored: the graph is
+a handful of flat arrays (codes, counts, degrees, unique successor and
+predecessor), never a dict of strings.
+
+Contigs are the unitigs of the graph (maximal non-branching paths), so
+assembly extends in both directions and stops at repeats instead of guessing
+through them. Only the forward strand is used, as the fragments of the L5
+labs are all sampled from it.
+"""
+import numpy as np
+
+from bioutils.kmers import DNA, decode_kmers, kmer_codes
+
+DEFAULT_K = 21
+_LETTERS = np.frombuffer(DNA.encode("ascii"), dtype=np.uint8)
+
+
+def _lookup(nodes, values):
+    """Index of every value in the sorted nodes array, -1 when absent."""
+    pos = np.searchsorted(nodes, values)
+    pos[pos == len(nodes)] = 0
+    found = nodes[pos] == values if len(nodes) else np.zeros(len(values), dtype=bool)
+    return np.where(found, pos, -1)
+
+
+class DeBruijnGraph:
+    """Node-centric de Bruijn graph of the k-mers seen at least min_count times."""
+
+    def __init__(self, fragments, k=DEFAULT_K, min_count=1):
+        # One pass over all fragments: the separator makes junction k-mers invalid
+        values = kmer_codes("N".join(str(f) for f in fragments), k)
+        nodes, counts = np.unique(values, return_counts=True)
+        keep = counts >= min_count
+        self.k = k
+        self.nodes = nodes[keep]
+        self.counts = counts[keep]
+
+        n = len(self.nodes)
+        suffix_mask = np.int64(4 ** (k - 1) - 1)
+        high = np.int64(4 ** (k - 1))
+        self.out_degree = np.zeros(n, dtype=np.uint8)
+        self.in_degree = np.zeros(n, dtype=np.uint8)
+        self.successor = np.full(n, -1, dtype=np.int64)
+        self.predecessor = np.full(n, -1, dtype=np.int64)
+        for b in range(4):
+            succ = _lookup(self.nodes, (self.nodes & suffix_mask) * 4 + b)
+            pred = _lookup(self.nodes, self.nodes // 4 + b * high)
+            self.out_degree += succ >= 0
+            self.in_degree += pred >= 0
+            self.successor = np.where(succ >= 0, succ, self.successor)
+            self.predecessor = np.where(pred >= 0, pred, self.predecessor)
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def unitigs(self):
+        """Returns the node indices of every maximal non-branching path (cycles included).
+
+        Paths are found by list ranking with pointer doubling: every node
+        learns the first node of its path and its rank in it in log2(n)
+        vectorized steps, and one sort by (first node, rank) lays all paths
+        out contiguously.
+        """
+        n = len(self.nodes)
+        pred = self.predecessor
+        # joined[i]: node i is the only successor of its only predecessor
+        joined = (self.in_degree == 1) & (pred >= 0)
+        joined[joined] = self.out_degree[pred[joined]] == 1
+
+        head = np.where(joined, pred, np.arange(n))
+        rank = joined.astype(np.int64)
+        for _ in range(max(n, 1).bit_length()):
+            rank += rank[head]
+            head = head[head]
+
+        # Nodes whose head is still joined lie on an isolated cycle
+        linear = np.flatnonzero(~joined[head])
+        order = linear[np.lexsort((rank[linear], head[linear]))]
+        breaks = np.flatnonzero(np.diff(head[order])) + 1
+        paths = np.split(order, breaks) if len(order) else []
+
+        on_cycle = np.zeros(n, dtype=bool)
+        on_cycle[joined[head]] = True
+        succ = self.successor.tolist()
+        for i in np.flatnonzero(on_cycle).tolist():
+            if not on_cycle[i]:
+                continue
+            path = [i]
+            on_cycle[i] = False
+            while on_cycle[succ[path[-1]]]:
+                path.append(succ[path[-1]])
+                on_cycle[path[-1]] = False
+            paths.append(np.array(path))
+        return paths
+
+    def contigs(self, min_length=0):
+        """Unitig sequences of at least min_length bases, longest first.
+
+        A path spells its first k-mer followed by the last base of every next node.
+        """
+        paths = [p for p in self.unitigs() if len(p) + self.k - 1 >= min_length]
+        if not paths:
+            return []
+        firsts = decode_kmers(self.nodes[[p[0] for p in paths]], self.k)
+        tails = _LETTERS[self.nodes[np.concatenate(paths)] % 4].tobytes().decode("ascii")
+        result = []
+        offset = 0
+        for first, path in zip(firsts, paths):
+            result.append(first + tails[offset + 1:offset + len(path)])
+            offset += len(path)
+        result.sort(key=len, reverse=True)
+        return result
+
+
+def debruijn_assemble(fragments, k=DEFAULT_K, min_count=1, min_length=0):
+    """Assembles fragments into contigs (longest first) through a compacted de Bruijn graph."""
+    return DeBruijnGraph(fragments, k, min_count).contigs(min_length)
@@ -0,0 +1,141 @@
+"""
+Min/max decimation of long signals for plotting.
+
+A genome-wide window profile has one point per window, hundreds of thousands
+for a pox genome, while a chart is a few hundred pixels wide. Drawing the
+minimum and the maximum of every group of consecutive points (in their
+original order) keeps every peak and dip that a full-resolution line would
+show, with about two points per pixel.
+
+SignalPyramid precomputes that envelope at several resolutions: level 0
+groups FACTOR points, and every next level groups FACTOR groups of the
+previous one (the min of the mins and the max of the maxes), which costs
+about a third of the signal in extra memory. A view of any x range then
+picks the finest level with at most max_points points inside that range,
+so re-rendering after a zoom touches only the visible part, at full detail
+once few enough points are visible. (Largest-Triangle-Three-Buckets is not
+used because its buckets cannot be merged into coarser levels.)
+
+DecimatedLine draws such a view on a matplotlib Axes and re-renders it when
+the x limits change (zoom, pan, shared axes). This module does not import
+matplotlib itself.
+"""
+import numpy as np
+
+FACTOR = 4
+PIXEL_POINTS = 2  # points drawn per horizontal pixel
+DEFAULT_MAX_POINTS = 4000  # when the axes size is unknown
+
+
+def _group_extremes(values, min_idx, max_idx, factor):
+    """Indices of the min and max of every group of `factor` consecutive groups."""
+    groups = -(-len(min_idx) // factor)
+    pad = groups * factor - len(min_idx)
+    lo = np.concatenate((min_idx, np.repeat(min_idx[-1:], pad))).reshape(groups, factor)
+    hi = np.concatenate((max_idx, np.repeat(max_idx[-1:], pad))).reshape(groups, factor)
+    rows = np.arange(groups)
+    return (lo[rows, np.argmin(values[lo], axis=1)],
+            hi[rows, np.argmax(values[hi], axis=1)])
+
+
+def minmax_indices(values, bins):
+    """Sorted indices of the min and max of each of `bins` groups of consecutive values."""
+    values = np.asarray(values)
+    n = len(values)
+    if n <= 2 * bins:
+        return np.arange(n)
+    every = np.arange(n)
+    mins, maxes = _group_extremes(values, every, every, -(-n // bins))
+    return np.unique(np.concatenate((mins, maxes, [0, n - 1])))
+
+
+class SignalPyramid:
+    """Min/max envelopes of a signal at resolutions 1, FACTOR, FACTOR**2, ... points per group."""
+
+    def __init__(self, x, y, factor=FACTOR):
+        self.x = np.asarray(x)
+        self.y = np.asarray(y)
+        if len(self.x) != len(self.y):
+            raise ValueError("x and y must have the same length")
+        if len(self.x) > 1 and np.any(np.diff(self.x) < 0):
+            raise ValueError("x must be sorted")
+        self.factor = factor
+        # levels[k] = (min indices, max indices) of groups of factor ** k points
+        every = np.arange(len(self.y))
+        self.levels = [(every, every)]
+        while len(self.levels[-1][0]) > 1:
+            self.levels.append(_group_extremes(self.y, *self.levels[-1], factor))
+
+    def __len__(self):
+        return len(self.y)
+
+    def view_indices(self, xmin=None, xmax=None, max_points=DEFAULT_MAX_POINTS):
+        """Sorted indices of the points to draw for the x range [xmin, xmax]."""
+        n = len(self.y)
+        if n == 0:
+            return np.zeros(0, dtype=np.int64)
+        lo = 0 if xmin is None else int(np.searchsorted(self.x, xmin, "left"))
+        hi = n if xmax is None else int(np.searchsorted(self.x, xmax, "right"))
+        # Plus one point beyond each side, so that the line reaches the edges of the axes
+        picked = [[i for i in (lo - 1, hi) if 0 <= i < n]]
+        if hi <= lo:
+            return np.array(picked[0], dtype=np.int64)
+        for level, (mins, maxes) in enumerate(self.levels):
+            size = self.factor ** level
+            if 2 * (hi - lo) <= max_points * size or level == len(self.levels) - 1:
+                break
+        # Groups entirely inside [lo, hi) come from the level; the partial ones at
+        # both ends (less than one group each) are reduced from the signal itself
+        first, last = -(-lo // size), hi // size
+        picked += [mins[first:last], maxes[first:last], [lo, hi - 1]]
+        edges = [(lo, hi)] if first >= last else [(lo, first * size), (last * size, hi)]
+        for start, stop in edges:
+            if start < stop:
+                part = self.y[start:stop]
+                picked.append([start + int(np.argmin(part)), start + int(np.argmax(part))])
+        return np.unique(np.concatenate(picked)).astype(np.int64)
+
+    def view(self, xmin=None, xmax=None, max_points=DEFAULT_MAX_POINTS):
+        """(x, y) of the decimated signal for the x range [xmin, xmax]."""
+        idx = self.view_indices(xmin, xmax, max_points)
+        return self.x[idx], self.y[idx]
+
+
+class DecimatedLine:
+    """A matplotlib line showing a SignalPyramid view, re-rendered when the x limits change."""
+
+    def __init__(self, ax, x, y, max_points=None, **plot_kwargs):
+        self.ax = ax
+        self.pyramid = y if isinstance(y, SignalPyramid) else SignalPyramid(x, y)
+        self.max_points = max_points
+        (self.line,) = ax.plot(*self.pyramid.view(max_points=self._max_points()), **plot_kwargs)
+        # Axes sharing x with this one get their limits without an xlim_changed
+        # event of their own, so listen on all of them. matplotlib only keeps
+        # weak references to bound methods, which would let this object (and
+        # the re-rendering) go away with the caller's reference; a plain
+        # function is kept alive by the axes.
+        def on_xlim(changed):
+            self._on_xlim(changed)
+
+        self._cids = [(other, other.callbacks.connect("xlim_changed", on_xlim))
+                      for other in ax.get_shared_x_axes().get_siblings(ax)]
+
+    def _max_points(self):
+        if self.max_points:
+            return self.max_points
+        width = self.ax.bbox.width
+        return int(width * PIXEL_POINTS) if width > 1 else DEFAULT_MAX_POINTS
+
+    def _on_xlim(self, ax):
+        xmin, xmax = sorted(ax.get_xlim())
+        self.line.set_data(*self.pyramid.view(xmin, xmax, self._max_points()))
+
+    def remove(self):
+        for other, cid in self._cids:
+            other.callbacks.disconnect(cid)
+        self.line.remove()
+
+
+def plot_signal(ax, x, y, max_points=None, **plot_kwargs):
+    """Like ax.plot(x, y, ...) for long signals: draws a decimated, zoom-aware line."""
+    return DecimatedLine(ax, x, y, max_points, **plot_kwargs)
@@ -0,0 +1,192 @@
+"""
+Reference-based evaluation of assembled contigs (identity, genome fraction,
+NGA50, misassemblies), in the spirit of QUAST.
+
+Contigs are aligned back to the reference with seeds: every k-mer that
+occurs exactly once in the reference is an anchor (found for all contig
+positions at once with np.searchsorted), and anchors are chained into
+blocks along a diagonal, allowing a drift of max_indel bases for indels.
+Only the stretches between consecutive anchors that are not trivially equal
+are aligned, with the bit-vector edit distance of bioutils.align, so the
+alignment work is limited to the bases around differences. Block ends are
+then extended over exact matches, which covers repeats next to a block;
+contigs lying entirely inside repeats stay unaligned.
+
+A contig whose blocks are not collinear (a jump of more than max_indel along
+the reference, or a strand switch) counts one misassembly per breakpoint.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+from bioutils.align import edit_distance
+from bioutils.kmers import kmer_codes
+
+SEED_K = 21
+MAX_INDEL = 50
+MIN_ANCHORS = 3
+
+Alignment = namedtuple("Alignment", "contig contig_start contig_end ref_start ref_end strand edits")
+
+_REVCOMP = str.maketrans("ACGTacgt", "TGCAtgca")
+
+
+def _reverse_complement(seq):
+    return seq.translate(_REVCOMP)[::-1]
+
+
+class ReferenceIndex:
+    """Sorted codes and positions of the k-mers that occur once in the reference."""
+
+    def __init__(self, reference, k=SEED_K):
+        self.reference = str(reference).upper()
+        self.k = k
+        codes, positions = kmer_codes(self.reference, k, return_positions=True)
+        order = np.argsort(codes, kind="stable")
+        codes, positions = codes[order], positions[order]
+        unique, first, counts = np.unique(codes, return_index=True, return_counts=True)
+        once = counts == 1
+        self.codes = unique[once]
+        self.positions = positions[first[once]]
+
+    def __len__(self):
+        return len(self.reference)
+
+    def anchors(self, seq):
+        """(contig positions, reference positions) of the k-mers of seq that are unique in the reference."""
+        codes, positions = kmer_codes(seq, self.k, return_positions=True)
+        if not len(self.codes) or not len(codes):
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        idx = np.minimum(np.searchsorted(self.codes, codes), len(self.codes) - 1)
+        hit = self.codes[idx] == codes
+        return positions[hit], self.positions[idx[hit]]
+
+
+def _runs(c, r, max_indel, min_anchors):
+    """Splits anchors into collinear runs, dropping the ones that are spurious.
+
+    A run is dropped when it has fewer than min_anchors anchors, or when it
+    is a short excursion (e.g. into a near-identical repeat copy) between two
+    larger runs that are collinear with each other. Dropping runs can
+    reconnect their neighbours, so this repeats until nothing changes.
+    """
+    while True:
+        breaks = np.flatnonzero((np.abs(np.diff(r - c)) > max_indel) | (np.diff(r) <= 0)) + 1
+        bounds = np.concatenate(([0], breaks, [len(c)])).tolist()
+        sizes = [bounds[i + 1] - bounds[i] for i in range(len(bounds) - 1)]
+        keep = [size >= min_anchors for size in sizes]
+        for i in range(1, len(sizes) - 1):
+            last, first = bounds[i] - 1, bounds[i + 1]  # ends of the neighbouring runs
+            collinear = (abs(int(r[first] - c[first]) - int(r[last] - c[last])) <= max_indel
+                         and r[first] > r[last])
+            if collinear and sizes[i] < min(sizes[i - 1], sizes[i + 1]):
+                keep[i] = False
+        if all(keep):
+            return np.split(c, breaks), np.split(r, breaks)
+        mask = np.repeat(keep, sizes)
+        c, r = c[mask], r[mask]
+
+
+def _block_edits(seq, reference, c, r, k):
+    """Edit distance of the block spanned by the anchors (c, r), aligning only the gaps."""
+    dc, dr = np.diff(c), np.diff(r)
+    # Anchors on the same diagonal that touch or overlap cover everything between them
+    gaps = np.flatnonzero(~((dc == dr) & (dc <= k)))
+    edits = 0
+    for i in gaps.tolist():
+        a = seq[c[i]:c[i + 1]]
+        b = reference[r[i]:r[i + 1]]
+        if a != b:
+            edits += edit_distance(a, b)
+    return edits
+
+
+def _common_prefix(a, b):
+    """Length of the common prefix of two strings."""
+    n = min(len(a), len(b))
+    if n == 0:
+        return 0
+    x = np.frombuffer(a[:n].encode("ascii"), dtype=np.uint8)
+    y = np.frombuffer(b[:n].encode("ascii"), dtype=np.uint8)
+    diff = np.flatnonzero(x != y)
+    return int(diff[0]) if len(diff) else n
+
+
+def align_contig(contig, index, max_indel=MAX_INDEL, min_anchors=MIN_ANCHORS, contig_id=0):
+    """Alignment blocks of one contig on the reference, in contig order."""
+    contig = str(contig).upper()
+    n, k = len(contig), index.k
+    blocks = []
+    for strand, seq in ((1, contig), (-1, _reverse_complement(contig))):
+        c, r = index.anchors(seq)
+        if len(c) < min_anchors:
+            continue
+        for bc, br in zip(*_runs(c, r, max_indel, min_anchors)):
+            if not len(bc):
+                continue
+            start, end = int(bc[0]), int(bc[-1]) + k
+            ref_start, ref_end = int(br[0]), int(br[-1]) + k
+            edits = _block_edits(seq, index.reference, bc, br, k)
+            # Extend exact matches past the outer anchors (e.g. into repeats, which have none)
+            left = min(start, ref_start)
+            left = _common_prefix(seq[start - left:start][::-1],
+                                  index.reference[ref_start - left:ref_start][::-1])
+            right = _common_prefix(seq[end:], index.reference[ref_end:ref_end + n - end])
+            start, ref_start, end, ref_end = start - left, ref_start - left, end + right, ref_end + right
+            if strand == -1:
+                start, end = n - end, n - start
+            blocks.append(Alignment(contig_id, start, end, ref_start, ref_end, strand, edits))
+
+    # A region aligned on both strands (inverted repeat): keep the longer block
+    blocks.sort(key=lambda b: b.contig_end - b.contig_start, reverse=True)
+    kept = []
+    for block in blocks:
+        span = block.contig_end - block.contig_start
+        if all(min(block.contig_end, other.contig_end) - max(block.contig_start, other.contig_start)
+               < span / 2 for other in kept):
+            kept.append(block)
+    kept.sort(key=lambda b: b.contig_start)
+    return kept
+
+
+def _n_a50(lengths, reference_length):
+    half = reference_length / 2
+    total = 0
+    for length in sorted(lengths, reverse=True):
+        total += length
+        if total >= half:
+            return length
+    return 0
+
+
+def evaluate_assembly(reference, contigs, k=SEED_K, max_indel=MAX_INDEL, min_anchors=MIN_ANCHORS):
+    """Aligns contigs to the reference and returns a dict of quality metrics.
+
+    identity: % of aligned columns that are matches; genome_fraction: % of
+    reference bases covered by an alignment; nga50: aligned block length
+    reaching half the reference (0 if the blocks cover less); misassemblies:
+    breakpoints between non-collinear blocks of the same contig.
+    """
+    index = reference if isinstance(reference, ReferenceIndex) else ReferenceIndex(reference, k)
+    alignments = [align_contig(contig, index, max_indel, min_anchors, i)
+                  for i, contig in enumerate(contigs)]
+    blocks = [b for per_contig in alignments for b in per_contig]
+
+    columns = sum(max(b.contig_end - b.contig_start, b.ref_end - b.ref_start) for b in blocks)
+    edits = sum(b.edits for b in blocks)
+    covered = np.zeros(len(index) + 1, dtype=np.int64)
+    np.add.at(covered, [b.ref_start for b in blocks], 1)
+    np.add.at(covered, [b.ref_end for b in blocks], -1)
+    block_lengths = [b.ref_end - b.ref_start for b in blocks]
+    return {
+        "contigs": len(alignments),
+        "unaligned_contigs": sum(1 for per_contig in alignments if not per_contig),
+        "aligned_bases": sum(b.contig_end - b.contig_start for b in blocks),
+        "identity": (columns - edits) / columns * 100 if columns else 0.0,
+        "genome_fraction": (float(np.count_nonzero(np.cumsum(covered)[:-1])) / len(index) * 100
+                            if len(index) else 0.0),
+        "nga50": _n_a50(block_lengths, len(index)),
+        "largest_alignment": max(block_lengths, default=0),
+        "misassemblies": sum(max(len(per_contig) - 1, 0) for per_contig in alignments),
+        "alignments": blocks,
+    }
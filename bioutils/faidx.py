@@ -0,0 +1,223 @@
+"""
+faidx-compatible index (.fai) and memory-mapped random access to FASTA files.
+
+The .fai file has the same five tab-separated columns as ``samtools faidx``:
+NAME, LENGTH, OFFSET (byte of the first base), LINEBASES, LINEWIDTH.
+With those numbers the byte position of any base is computed directly, so
+fetching a region only touches the pages of the file that hold it.
+
+Records without a header (the genomes in Project_L5/L5/viruses) are indexed
+under the file name without its extension.
+"""
+import mmap
+import os
+
+_NEWLINES = b"\r\n"
+
+
+class FaidxEntry:
+    """One line of a .fai index."""
+
+    __slots__ = ("name", "length", "offset", "linebases", "linewidth")
+
+    def __init__(self, name, length, offset, linebases, linewidth):
+        self.name = name
+        self.length = length
+        self.offset = offset
+        self.linebases = linebases
+        self.linewidth = linewidth
+
+    def byte_offset(self, pos):
+        """Byte position in the file of the base at 0-based position pos."""
+        if self.linebases == 0:
+            return self.offset
+        return self.offset + (pos // self.linebases) * self.linewidth + pos % self.linebases
+
+    def to_line(self):
+        return f"{self.name}\t{self.length}\t{self.offset}\t{self.linebases}\t{self.linewidth}\n"
+
+
+def _default_name(filepath):
+    return os.path.splitext(os.path.basename(filepath))[0]
+
+
+def build_index(filepath):
+    """Scans a FASTA file once and returns its list of FaidxEntry.
+
+    Raises ValueError if a record has lines of different lengths (other than
+    its last line), exactly like samtools does.
+    """
+    entries = []
+    name = None
+    length = offset = linebases = linewidth = 0
+    short_line_seen = False
+    pos = 0
+
+    def finish():
+        if name is not None:
+            entries.append(FaidxEntry(name, length, offset, linebases, linewidth))
+
+    with open(filepath, "rb") as f:
+        for line in f:
+            line_start = pos
+            pos += len(line)
+            if line.startswith(b">"):
+                finish()
+                header = line[1:].strip().split(None, 1)
+                name = header[0].decode("utf-8") if header else ""
+                length = linebases = linewidth = 0
+                offset = pos
+                short_line_seen = False
+                continue
+
+            bases = len(line.rstrip(_NEWLINES))
+            if name is None:
+                # Headerless file, the record starts at the very first line
+                name = _default_name(filepath)
+                offset = line_start
+            if bases == 0:
+                if length:
+                    short_line_seen = True
+                elif linebases == 0:
+                    offset = pos
+                continue
+            if short_line_seen:
+                raise ValueError(f"{filepath}: record '{name}' has lines of different length")
+            if linebases == 0:
+                linebases, linewidth = bases, len(line)
+            elif bases != linebases or len(line) != linewidth:
+                if bases > linebases:
+                    raise ValueError(f"{filepath}: record '{name}' has lines of different length")
+                short_line_seen = True
+            length += bases
+    finish()
+    return entries
+
+
+def write_index(entries, fai_path):
+    with open(fai_path, "w") as f:
+        for entry in entries:
+            f.write(entry.to_line())
+
+
+def read_index(fai_path):
+    entries = []
+    with open(fai_path, "r") as f:
+        for line in f:
+            fields = line.rstrip("\n").split("\t")
+            if len(fields) < 5:
+                continue
+            entries.append(FaidxEntry(fields[0], *(int(x) for x in fields[1:5])))
+    return entries
+
+
+def ensure_index(filepath):
+    """Returns the index of filepath, building <file>.fai if missing or older than the FASTA file."""
+    fai_path = filepath + ".fai"
+    if os.path.exists(fai_path) and os.path.getmtime(fai_path) >= os.path.getmtime(filepath):
+        return read_index(fai_path)
+    entries = build_index(filepath)
+    try:
+        write_index(entries, fai_path)
+    except OSError:
+        pass  # read-only location, the index is still usable in memory
+    return entries
+
+
+class IndexedFasta:
+    """Random access to the records of a FASTA file through mmap and a .fai index.
+
+    >>> with IndexedFasta("viruses/camelpox.fasta") as fa:
+    ...     fa.fetch("camelpox", 1000, 1100)
+    """
+
+    def __init__(self, filepath):
+        self.filepath = filepath
+        self.entries = {e.name: e for e in ensure_index(filepath)}
+        self._file = open(filepath, "rb")
+        if os.path.getsize(filepath) == 0:
+            self._mm = b""
+        else:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    @property
+    def names(self):
+        return list(self.entries)
+
+    def length(self, name):
+        return self.entries[name].length
+
+    def fetch(self, name, start=0, end=None, as_bytes=False):
+        """Returns bases [start, end) (0-based, end exclusive) of record `name`."""
+        entry = self.entries[name]
+        if end is None or end > entry.length:
+            end = entry.length
+        start = max(start, 0)
+        if start >= end:
+            return b"" if as_bytes else ""
+        raw = self._mm[entry.byte_offset(start):entry.byte_offset(end - 1) + 1]
+        seq = raw.translate(None, _NEWLINES)
+        return seq if as_bytes else seq.decode("ascii")
+
+    def __getitem__(self, name):
+        return RecordView(self, name)
+
+    def __iter__(self):
+        return iter(self.entries)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def close(self):
+        if isinstance(self._mm, mmap.mmap):
+            self._mm.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class RecordView:
+    """Lazy, string-like view of one record; slicing reads only the requested bases."""
+
+    BLOCK_SIZE = 1 << 20
+
+    def __init__(self, fasta, name):
+        self.fasta = fasta
+        self.name = name
+
+    def __len__(self):
+        return self.fasta.length(self.name)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            positions = range(*key.indices(len(self)))
+            if not positions:
+                return ""
+            # Fetch the bases covered by the slice once, then apply the step (which may be negative)
+            low, high = min(positions[0], positions[-1]), max(positions[0], positions[-1]) + 1
+            seq = self.fasta.fetch(self.name, low, high)
+            return seq if key.step in (None, 1) else seq[positions[0] - low::key.step]
+        if key < 0:
+            key += len(self)
+        if not 0 <= key < len(self):
+            raise IndexError("sequence index out of range")
+        return self.fasta.fetch(self.name, key, key + 1)
+
+    def iter_blocks(self, block_size=BLOCK_SIZE, as_bytes=False):
+        """Yields the record as consecutive blocks of at most block_size bases."""
+        for start in range(0, len(self), block_size):
+            yield self.fasta.fetch(self.name, start, start + block_size, as_bytes=as_bytes)
+
+    def count(self, symbol):
+        """Counts a single symbol block by block, like str.count."""
+        if len(symbol) != 1:
+            raise ValueError("RecordView.count only supports single symbols")
+        target = symbol.encode("ascii")
+        return sum(block.count(target) for block in self.iter_blocks(as_bytes=True))
+
+    def __str__(self):
+        return self.fasta.fetch(self.name)
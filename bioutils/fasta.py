@@ -0,0 +1,89 @@
+"""
+Streaming FASTA reader shared by all the labs.
+
+The file is read in large binary chunks and every record is yielded as soon as
+it is complete, so only one sequence is held in memory at a time. Sequence
+lines are never turned into separate Python strings: newlines and other
+whitespace are stripped from each chunk with ``bytes.translate``.
+
+Files without a header line (like the genomes in Project_L5/L5/viruses) are
+returned as a single record with an empty header.
+"""
+
+CHUNK_SIZE = 1 << 16  # 64 KiB per read
+
+_WHITESPACE = b" \t\r\n\v\f"
+
+
+def iter_fasta(filepath, as_bytes=False, chunk_size=CHUNK_SIZE):
+    """Yields (header, sequence) tuples, one per record in the file.
+
+    With as_bytes=True the sequence is returned as a bytearray instead of a str.
+    """
+    header = None
+    seq = bytearray()
+    partial_header = None  # a header line whose newline is still to come
+    line_start = True  # whether the next byte begins a line
+
+    with open(filepath, "rb") as f:
+        while True:
+            data = f.read(chunk_size)
+            if not data:
+                break
+            # Sequence text is stripped into `seq` as soon as it arrives, so a
+            # long single-line sequence is never copied again; only a header
+            # line is kept until its newline is read
+            pos = 0
+            while pos < len(data):
+                if partial_header is not None:
+                    end = data.find(b"\n", pos)
+                    if end == -1:
+                        partial_header += data[pos:]
+                        break
+                    partial_header += data[pos:end]
+                    header = bytes(partial_header).strip()
+                    partial_header = None
+                    pos = end + 1
+                    line_start = True
+                    continue
+
+                if line_start and data[pos] == 0x3E:  # ">"
+                    if header is not None or seq:
+                        yield _make_record(header, seq, as_bytes)
+                        seq = bytearray()
+                    partial_header = bytearray()
+                    pos += 1
+                    continue
+
+                nxt = data.find(b"\n>", pos)
+                stop = len(data) if nxt == -1 else nxt + 1
+                seq += data[pos:stop].translate(None, _WHITESPACE)
+                line_start = data[stop - 1] == 0x0A  # "\n"
+                pos = stop
+
+    if partial_header is not None:  # last line of the file is a header
+        header = bytes(partial_header).strip()
+    if header is not None or seq:
+        yield _make_record(header, seq, as_bytes)
+
+
+def _make_record(header, seq, as_bytes):
+    name = header.decode("utf-8", errors="replace") if header is not None else ""
+    if as_bytes:
+        return name, seq
+    return name, seq.decode("ascii")
+
+
+def read_records(filepath, as_bytes=False):
+    """Returns all records of a FASTA file as a list of (header, sequence)."""
+    return list(iter_fasta(filepath, as_bytes=as_bytes))
+
+
+def read_sequence(filepath, as_bytes=False):
+    """Reads a FASTA file and returns all its records joined as one sequence (headers ignored)."""
+    joined = bytearray()
+    for _, seq in iter_fasta(filepath, as_bytes=True):
+        joined += seq
+    if as_bytes:
+        return joined
+    return joined.decode("ascii")
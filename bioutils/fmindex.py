@@ -0,0 +1,184 @@
+"""
+Suffix array and FM-index for exact pattern search in a genome.
+
+The suffix array is built by prefix doubling with NumPy: suffixes are
+sorted by their first 2^t symbols using the ranks of round t - 1 as integer
+keys, until all ranks are distinct (O(n log n) sorts of int64 arrays, log n
+being bounded by the longest repeat rather than the genome length).
+
+The FM-index keeps the Burrows-Wheeler transform (BWT) of the genome, the
+C table (number of symbols smaller than each symbol) and occurrence counts
+of every symbol at one BWT row out of OCC_SAMPLE; Occ(c, i) is a checkpoint
+plus a count over at most OCC_SAMPLE BWT symbols. Backward search then
+narrows the suffix array range of a pattern with two Occ lookups per
+pattern symbol, so count() takes O(m) whatever the genome length, and
+locate() reads the matching suffix array range. Batches of patterns are
+searched in lockstep, one vectorized step per pattern position.
+
+The arrays are saved as .npy files in a directory and memory-mapped on
+loading, so an index is built once per genome and only the pages touched by
+the queries are read. ensure_fm_index() keeps <file>.fmi next to a FASTA
+file, rebuilt when older than the file, like faidx.ensure_index().
+
+Symbols are A, C, G, T and N (any other letter, case-insensitive); patterns
+containing anything but A, C, G, T never match. All records of a FASTA file
+are indexed as one sequence, as read_sequence() joins them.
+"""
+import os
+
+import numpy as np
+
+from bioutils.fasta import read_sequence
+from bioutils.windows import as_byte_array
+
+OCC_SAMPLE = 64
+SYMBOLS = "$ACGTN"
+_SIGMA = len(SYMBOLS)
+_CODES = np.full(256, 5, dtype=np.uint8)
+for _i, _base in enumerate("ACGT", start=1):
+    _CODES[ord(_base)] = _CODES[ord(_base.lower())] = _i
+_FILES = ("sa", "bwt", "occ", "c")
+
+
+def encode_text(sequence):
+    """Symbol codes of a sequence (1-4 for ACGT, 5 for anything else) followed by the $ sentinel (0)."""
+    return np.concatenate((_CODES[as_byte_array(sequence)], [0])).astype(np.uint8)
+
+
+def suffix_array(codes):
+    """Suffix array of a code array ending with a unique smallest sentinel, by prefix doubling."""
+    n = len(codes)
+    rank = codes.astype(np.int64)
+    sa = np.argsort(rank, kind="stable")
+    k = 1
+    while True:
+        # Sort by (rank of the first k symbols, rank of the next k symbols)
+        second = np.zeros(n, dtype=np.int64)
+        second[:n - k] = rank[k:] + 1
+        key = rank * (n + 1) + second
+        sa = np.argsort(key, kind="stable")
+        key = key[sa]
+        new_rank = np.empty(n, dtype=np.int64)
+        new_rank[sa] = np.concatenate(([0], np.cumsum(key[1:] != key[:-1])))
+        rank = new_rank
+        if rank[sa[-1]] == n - 1 or k >= n:
+            return sa
+        k *= 2
+
+
+class FMIndex:
+    """Suffix array, BWT and sampled occurrence table of one sequence."""
+
+    def __init__(self, sa, bwt, occ, c):
+        self.sa = sa
+        self.bwt = bwt
+        self.occ = occ
+        self.c = c
+
+    @classmethod
+    def build(cls, sequence):
+        codes = encode_text(sequence)
+        sa = suffix_array(codes)
+        sa = sa.astype(np.int32 if len(sa) < 2 ** 31 else np.int64)
+        bwt = codes[sa - 1]  # sa == 0 wraps around to the sentinel
+        occ = np.zeros((len(bwt) // OCC_SAMPLE + 1, _SIGMA), dtype=np.int64)
+        for symbol in range(_SIGMA):
+            occ[1:, symbol] = np.cumsum(bwt == symbol)[OCC_SAMPLE - 1::OCC_SAMPLE]
+        counts = np.bincount(codes, minlength=_SIGMA)
+        c = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        return cls(sa, bwt, occ, c)
+
+    @classmethod
+    def from_fasta(cls, filepath):
+        return cls.build(read_sequence(filepath, as_bytes=True))
+
+    def __len__(self):
+        """Length of the indexed sequence (without the sentinel)."""
+        return len(self.bwt) - 1
+
+    # === Persistence ===
+
+    def save(self, directory):
+        """Writes the index as one .npy file per array in directory."""
+        os.makedirs(directory, exist_ok=True)
+        for name in _FILES:
+            np.save(os.path.join(directory, name + ".npy"), getattr(self, name))
+
+    @classmethod
+    def load(cls, directory, mmap=True):
+        """Loads an index saved by save(), memory-mapped unless mmap=False."""
+        mode = "r" if mmap else None
+        return cls(*(np.load(os.path.join(directory, name + ".npy"), mmap_mode=mode)
+                     for name in _FILES))
+
+    # === Queries ===
+
+    def _occ(self, symbols, rows):
+        """Occurrences of symbols[i] in bwt[:rows[i]], for arrays of symbols and rows."""
+        block = rows // OCC_SAMPLE
+        base = block * OCC_SAMPLE
+        offsets = np.arange(OCC_SAMPLE)
+        window = self.bwt.take(base[:, None] + offsets, mode="clip")
+        partial = ((window == symbols[:, None]) & (offsets < (rows - base)[:, None])).sum(axis=1)
+        return self.occ[block, symbols] + partial
+
+    def ranges(self, patterns):
+        """Suffix array ranges (lo, hi) of every pattern, as two int64 arrays."""
+        if isinstance(patterns, (str, bytes)):
+            raise TypeError("ranges() takes a list of patterns")
+        encoded = [_CODES[as_byte_array(p)] for p in patterns]
+        lengths = np.array([len(p) for p in encoded], dtype=np.int64)
+        if np.any(lengths == 0):
+            raise ValueError("patterns must not be empty")
+        count, width = len(encoded), int(lengths.max(initial=0))
+        # Patterns right-aligned in a matrix, searched from the last column to the first
+        matrix = np.zeros((count, width), dtype=np.uint8)
+        for row, codes in enumerate(encoded):
+            matrix[row, width - len(codes):] = codes
+        lo = np.zeros(count, dtype=np.int64)
+        hi = np.full(count, len(self.bwt), dtype=np.int64)
+        hi[[5 in codes for codes in encoded]] = 0  # symbols outside ACGT never match
+
+        for col in range(width - 1, -1, -1):
+            active = np.flatnonzero((lo < hi) & (col >= width - lengths))
+            if not len(active):
+                break
+            symbols = matrix[active, col].astype(np.int64)
+            start = self.c[symbols]
+            lo[active] = start + self._occ(symbols, lo[active])
+            hi[active] = start + self._occ(symbols, hi[active])
+        return lo, np.maximum(hi, lo)
+
+    def count_many(self, patterns):
+        """Number of (possibly overlapping) occurrences of every pattern."""
+        lo, hi = self.ranges(patterns)
+        return hi - lo
+
+    def count(self, pattern):
+        return int(self.count_many([pattern])[0])
+
+    def __contains__(self, pattern):
+        return self.count(pattern) > 0
+
+    def locate_many(self, patterns):
+        """Sorted 0-based start positions of every pattern, one array per pattern."""
+        lo, hi = self.ranges(patterns)
+        return [np.sort(np.asarray(self.sa[a:b], dtype=np.int64))
+                for a, b in zip(lo.tolist(), hi.tolist())]
+
+    def locate(self, pattern):
+        return self.locate_many([pattern])[0]
+
+
+def ensure_fm_index(filepath, mmap=True):
+    """Returns the FM-index of a FASTA file, building <file>.fmi if missing or older than the file."""
+    index_dir = filepath + ".fmi"
+    stamp = os.path.join(index_dir, _FILES[-1] + ".npy")  # written last by save()
+    if os.path.exists(stamp) and os.path.getmtime(stamp) >= os.path.getmtime(filepath):
+        return FMIndex.load(index_dir, mmap)
+    index = FMIndex.from_fasta(filepath)
+    try:
+        index.save(index_dir)
+    except OSError:
+        pass  # read-only location, the index is still usable in memory
+    return index
@@ -0,0 +1,56 @@
+"""
+Run-length interval extraction for 1-D signals (e.g. Tm profiles).
+
+A run is a maximal stretch of consecutive samples above (or below) a
+threshold. Runs are found with one np.diff over the boolean mask, so the
+cost is O(n) in NumPy whatever the number of runs. Intervals are half-open
+[start, end) indices into the signal.
+"""
+import numpy as np
+
+
+def threshold_runs(values, threshold, above=True, merge_gap=0, min_length=1):
+    """Returns (starts, ends) of the runs where values > threshold (or < if above=False).
+
+    Runs separated by at most merge_gap samples are merged, then runs shorter
+    than min_length samples are dropped.
+    """
+    values = np.asarray(values)
+    mask = values > threshold if above else values < threshold
+    edges = np.diff(np.concatenate(([False], mask, [False])).astype(np.int8))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+
+    if merge_gap > 0 and len(starts) > 1:
+        keep = (starts[1:] - ends[:-1]) > merge_gap
+        starts = starts[np.concatenate(([True], keep))]
+        ends = ends[np.concatenate((keep, [True]))]
+
+    if min_length > 1:
+        long_enough = (ends - starts) >= min_length
+        starts, ends = starts[long_enough], ends[long_enough]
+    return starts, ends
+
+
+def runs_to_regions(starts, ends, window_starts, window_size):
+    """Converts runs over window indices into 0-based, half-open sequence regions.
+
+    A run of windows [a, b) covers the bases from the start of window a to the
+    end of window b - 1.
+    """
+    window_starts = np.asarray(window_starts)
+    if len(starts) == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    return window_starts[starts], window_starts[ends - 1] + window_size
+
+
+def write_bed(path, chrom, starts, ends, name=None, scores=None):
+    """Writes regions as a BED file (chrom, start, end[, name, score]), one line per region."""
+    with open(path, "w") as f:
+        for i, (start, end) in enumerate(zip(starts, ends)):
+            fields = [chrom, str(int(start)), str(int(end))]
+            if name is not None or scores is not None:
+                fields.append(f"{name or 'region'}_{i + 1}")
+            if scores is not None:
+                fields.append(f"{float(scores[i]):g}")
+            f.write("\t".join(fields) + "\n")
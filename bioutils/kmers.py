@@ -0,0 +1,141 @@
+"""
+k-mer counting for any k with NumPy.
+
+Every symbol is mapped to its index in the alphabet and each k-mer becomes
+the integer sum(code[i + j] * sigma ** (k - 1 - j)), built for all positions
+at once with k vectorized multiply-adds (sigma = alphabet size). The integers
+are then counted with np.bincount when sigma ** k is small, or with np.unique
+otherwise. k-mers are overlapping; windows containing a symbol that is not in
+the alphabet (N, ambiguity codes, ...) are skipped.
+
+Canonical counting (a k-mer and its reverse complement counted together)
+is available for the nucleotide alphabets "ACGT" and "ACGU".
+"""
+import numpy as np
+
+from bioutils.windows import as_byte_array
+
+DNA = "ACGT"
+DENSE_LIMIT = 1 << 22  # use bincount when sigma ** k is at most this
+_COMPLEMENTABLE = ("ACGT", "ACGU")
+
+
+def encode(sequence, alphabet):
+    """Returns (codes, valid): uint8 symbol indices and a mask of symbols found in the alphabet."""
+    lut = np.full(256, 255, dtype=np.uint8)
+    for i, symbol in enumerate(alphabet):
+        lut[ord(symbol)] = i
+    codes = lut[as_byte_array(sequence)]
+    return codes, codes != 255
+
+
+def max_k(alphabet):
+    """Largest k whose k-mer integers fit in an int64."""
+    sigma = max(len(alphabet), 2)
+    k = 1
+    while sigma ** (k + 1) < 2 ** 63:
+        k += 1
+    return k
+
+
+def kmer_codes(sequence, k, alphabet=DNA, canonical=False, return_positions=False):
+    """Returns the integer code of every valid (overlapping) k-mer, in sequence order.
+
+    With return_positions=True, returns (codes, 0-based start positions).
+    """
+    if not 1 <= k <= max_k(alphabet):
+        raise ValueError(f"k must be between 1 and {max_k(alphabet)} for alphabet '{alphabet}'")
+    if canonical and alphabet not in _COMPLEMENTABLE:
+        raise ValueError("canonical counting needs the alphabet 'ACGT' or 'ACGU'")
+    codes, valid = encode(sequence, alphabet)
+    n = len(codes) - k + 1
+    if n <= 0:
+        empty = np.zeros(0, dtype=np.int64)
+        return (empty, empty.copy()) if return_positions else empty
+
+    sigma = len(alphabet)
+    values = np.zeros(n, dtype=np.int64)
+    for j in range(k):
+        values *= sigma
+        values += codes[j:j + n]
+
+    if canonical:
+        complement = 3 - codes.astype(np.int64)
+        rc_values = np.zeros(n, dtype=np.int64)
+        for j in range(k - 1, -1, -1):
+            rc_values *= 4
+            rc_values += complement[j:j + n]
+        np.minimum(values, rc_values, out=values)
+
+    invalid = np.concatenate(([0], np.cumsum(~valid, dtype=np.int64)))
+    keep = invalid[k:] == invalid[:n]
+    if return_positions:
+        return values[keep], np.flatnonzero(keep)
+    return values[keep]
+
+
+def decode_kmers(values, k, alphabet=DNA):
+    """Turns k-mer integer codes back into strings."""
+    values = np.asarray(values, dtype=np.int64)
+    letters = np.frombuffer(alphabet.encode("ascii"), dtype=np.uint8)
+    sigma = len(alphabet)
+    matrix = np.empty((len(values), k), dtype=np.uint8)
+    rest = values.copy()
+    for j in range(k - 1, -1, -1):
+        matrix[:, j] = letters[rest % sigma]
+        rest //= sigma
+    return [row.decode("ascii") for row in np.ascontiguousarray(matrix).view(f"S{k}").ravel()]
+
+
+class KmerCounts:
+    """Sparse k-mer counts: sorted integer codes and their counts (only k-mers present)."""
+
+    def __init__(self, k, alphabet, codes, counts, canonical=False):
+        self.k = k
+        self.alphabet = alphabet
+        self.codes = codes
+        self.counts = counts
+        self.canonical = canonical
+
+    @property
+    def total(self):
+        return int(self.counts.sum())
+
+    def __len__(self):
+        return len(self.codes)
+
+    def to_dict(self):
+        """Returns {k-mer: count}."""
+        return dict(zip(decode_kmers(self.codes, self.k, self.alphabet), self.counts.tolist()))
+
+    def percentages(self, decimals=2):
+        """Returns {k-mer: percentage of all k-mers}, rounded like the L2 labs."""
+        total = self.total
+        if total == 0:
+            return {}
+        perc = np.round(self.counts / total * 100.0, decimals)
+        return dict(zip(decode_kmers(self.codes, self.k, self.alphabet), perc.tolist()))
+
+    def most_common(self, n=None):
+        order = np.argsort(-self.counts, kind="stable")[:n]
+        kmers = decode_kmers(self.codes[order], self.k, self.alphabet)
+        return list(zip(kmers, self.counts[order].tolist()))
+
+
+def count_kmers(sequence, k, alphabet=DNA, canonical=False):
+    """Counts all overlapping k-mers of a sequence.
+
+    alphabet=None uses the sorted set of symbols found in the sequence, which
+    makes the counter work for RNA and protein sequences as well.
+    """
+    if alphabet is None:
+        alphabet = "".join(chr(b) for b in np.unique(as_byte_array(sequence)))
+    values = kmer_codes(sequence, k, alphabet, canonical)
+    space = len(alphabet) ** k
+    if space <= DENSE_LIMIT:
+        dense = np.bincount(values, minlength=space)
+        codes = np.flatnonzero(dense)
+        counts = dense[codes]
+    else:
+        codes, counts = np.unique(values, return_counts=True)
+    return KmerCounts(k, alphabet, codes.astype(np.int64), counts.astype(np.int64), canonical)
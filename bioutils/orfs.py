@@ -0,0 +1,95 @@
+"""
+Genome-wide ORF finder.
+
+For each strand and frame the codon indices are computed once (see
+bioutils.translate); start and stop codon positions are then found with
+np.isin / a table lookup, and every start is paired with the next in-frame
+stop through np.searchsorted. Python only loops over the ORFs that are
+reported, never over the genome.
+
+Coordinates are 0-based, half-open and always on the forward strand; `end`
+includes the stop codon. Frames are +1..+3 / -1..-3 as in
+translate_six_frames().
+"""
+from collections import namedtuple
+
+import numpy as np
+
+from bioutils.packed import encode_bases
+from bioutils.translate import codon_indices, codon_table, reverse_complement_codes
+
+ORF = namedtuple("ORF", "start end strand frame protein")
+
+DEFAULT_STARTS = ("ATG",)
+NESTED_POLICIES = ("longest", "all")
+
+
+def _codon_index(codon):
+    codes = encode_bases(codon.upper())
+    if len(codes) != 3 or (codes > 3).any():
+        raise ValueError(f"invalid codon '{codon}'")
+    return int(codes[0]) * 16 + int(codes[1]) * 4 + int(codes[2])
+
+
+def _frame_orfs(indices, lookup, start_set, min_length, nested, include_partial):
+    """Returns (start codon numbers, stop codon numbers) of the ORFs of one frame.
+
+    A partial ORF (no stop before the end of the sequence) gets stop = len(indices).
+    """
+    stops = np.flatnonzero(lookup[indices] == ord("*"))
+    starts = np.flatnonzero(np.isin(indices, start_set))
+    next_stop = np.searchsorted(stops, starts)
+    has_stop = next_stop < len(stops)
+    orf_stops = np.full(len(starts), len(indices))
+    orf_stops[has_stop] = stops[next_stop[has_stop]]
+    if not include_partial:
+        starts, orf_stops = starts[has_stop], orf_stops[has_stop]
+    if nested == "longest" and len(starts):
+        # starts are sorted, so the first start for each stop is the most upstream one
+        _, first = np.unique(orf_stops, return_index=True)
+        starts, orf_stops = starts[first], orf_stops[first]
+    keep = (orf_stops - starts) >= min_length
+    return starts[keep], orf_stops[keep]
+
+
+def find_orfs(sequence, min_length=100, table=1, starts=DEFAULT_STARTS, strands=(1, -1),
+              nested="longest", include_partial=False):
+    """Yields every ORF of a DNA/RNA sequence as an ORF(start, end, strand, frame, protein).
+
+    min_length is the protein length in amino acids (stop codon excluded).
+    nested="longest" reports only the most upstream start for each stop,
+    nested="all" reports one ORF per start codon (nested ORFs included).
+    """
+    if nested not in NESTED_POLICIES:
+        raise ValueError(f"nested must be one of {NESTED_POLICIES}")
+    lookup = codon_table(table)
+    start_set = np.array([_codon_index(c) for c in starts])
+    forward = encode_bases(sequence)
+    n = len(forward)
+
+    for strand in strands:
+        codes = forward if strand == 1 else reverse_complement_codes(forward)
+        for frame in range(3):
+            indices = codon_indices(codes, frame)
+            orf_starts, orf_stops = _frame_orfs(indices, lookup, start_set, min_length,
+                                                nested, include_partial)
+            for s, t in zip(orf_starts.tolist(), orf_stops.tolist()):
+                protein = lookup[indices[s:t]].tobytes().decode("ascii")
+                begin = frame + 3 * s
+                finish = frame + 3 * min(t + 1, len(indices))
+                if strand == -1:
+                    begin, finish = n - finish, n - begin
+                yield ORF(begin, finish, strand, strand * (frame + 1), protein)
+
+
+def write_orfs_fasta(orfs, filepath, name="seq"):
+    """Streams ORFs to a protein FASTA file; returns the number written."""
+    count = 0
+    with open(filepath, "w") as f:
+        for count, orf in enumerate(orfs, 1):
+            strand = "+" if orf.strand == 1 else "-"
+            f.write(f">{name}_orf{count} {orf.start + 1}-{orf.end} strand={strand} "
+                    f"frame={orf.frame:+d} length={len(orf.protein)}\n")
+            for i in range(0, len(orf.protein), 60):
+                f.write(orf.protein[i:i + 60] + "\n")
+    return count
@@ -0,0 +1,311 @@
+"""
+2-bit packed nucleotide sequences.
+
+A PackedSequence stores four bases per byte (A=0, C=1, G=2, T/U=3, first base
+in the high bits), so a genome takes a quarter of the memory of a Python str.
+Everything that is not A/C/G/T/U (N, IUPAC ambiguity codes, stray letters) is
+kept in a small side mask: the sorted positions plus the original characters.
+Sequences are stored upper-case.
+
+Slicing, reverse_complement() and to_rna()/to_dna() return views that share
+the packed buffer, nothing is copied. Composition is computed on the packed
+bytes directly with a 256-entry lookup table.
+
+PackedSequence also implements the parts of the str API used by the labs
+(len, slicing, count, upper, strip, replace, iteration, comparison), so the
+existing analysis functions accept it unchanged.
+"""
+import numpy as np
+
+from bioutils.fasta import read_sequence
+
+DNA_ALPHABET = "ACGT"
+RNA_ALPHABET = "ACGU"
+AMBIGUOUS = 4  # code used by codes(mark_ambiguous=True) for masked positions
+
+# ASCII byte -> 2-bit code, 255 for anything that goes to the side mask
+_ENCODE = np.full(256, 255, dtype=np.uint8)
+for _code, _letters in enumerate(("Aa", "Cc", "Gg", "TtUu")):
+    for _ch in _letters:
+        _ENCODE[ord(_ch)] = _code
+
+# Complement of the characters that can end up in the mask (IUPAC codes)
+_IUPAC_COMPLEMENT = np.arange(256, dtype=np.uint8)
+for _a, _b in ("AT", "CG", "RY", "KM", "BV", "DH", "SS", "WW", "NN"):
+    _IUPAC_COMPLEMENT[ord(_a)], _IUPAC_COMPLEMENT[ord(_b)] = ord(_b), ord(_a)
+
+# For every packed byte value, how many A, C, G, T it holds
+_BYTE_COUNTS = np.zeros((256, 4), dtype=np.int64)
+for _byte in range(256):
+    for _shift in (6, 4, 2, 0):
+        _BYTE_COUNTS[_byte, (_byte >> _shift) & 3] += 1
+
+_SHIFTS = np.array([6, 4, 2, 0], dtype=np.uint8)
+
+_WHITESPACE = b" \t\r\n\v\f"
+
+
+def encode_bases(sequence):
+    """Returns a uint8 array of codes 0..3 (A, C, G, T/U), AMBIGUOUS (4) for anything else.
+
+    Accepts str, bytes/bytearray or PackedSequence.
+    """
+    if isinstance(sequence, PackedSequence):
+        return sequence.codes(mark_ambiguous=True)
+    if isinstance(sequence, str):
+        sequence = sequence.encode("ascii")
+    codes = _ENCODE[np.frombuffer(sequence, dtype=np.uint8)]
+    codes[codes == 255] = AMBIGUOUS
+    return codes
+
+
+def pack_codes(codes):
+    """Packs an array of 2-bit codes (values 0..3) four per byte."""
+    codes = np.asarray(codes, dtype=np.uint8)
+    pad = (-len(codes)) % 4
+    if pad:
+        codes = np.concatenate([codes, np.zeros(pad, dtype=np.uint8)])
+    quads = codes.reshape(-1, 4)
+    return (quads[:, 0] << 6) | (quads[:, 1] << 4) | (quads[:, 2] << 2) | quads[:, 3]
+
+
+class PackedSequence:
+    """Compact DNA/RNA sequence backed by a 2-bit packed NumPy uint8 array."""
+
+    __slots__ = ("_packed", "_mask_pos", "_mask_chr", "_start", "_stop", "_revcomp", "_rna")
+
+    def __init__(self, sequence=""):
+        if isinstance(sequence, str):
+            sequence = sequence.encode("ascii")
+        raw = np.frombuffer(sequence, dtype=np.uint8)
+        codes = _ENCODE[raw]
+        ambiguous = codes == 255
+        self._mask_pos = np.flatnonzero(ambiguous)
+        self._mask_chr = np.frombuffer(raw[ambiguous].tobytes().upper(), dtype=np.uint8)
+        codes[ambiguous] = 0
+        self._packed = pack_codes(codes)
+        self._start = 0
+        self._stop = len(raw)
+        self._revcomp = False
+        folded = raw | 0x20  # lower-case letters
+        self._rna = bool(np.any(folded == ord("u"))) and not np.any(folded == ord("t"))
+
+    @classmethod
+    def from_fasta(cls, filepath):
+        """Packs all records of a FASTA file (headers ignored) into one sequence."""
+        return cls(read_sequence(filepath, as_bytes=True))
+
+    def _view(self, start, stop, revcomp, rna):
+        view = object.__new__(PackedSequence)
+        view._packed = self._packed
+        view._mask_pos = self._mask_pos
+        view._mask_chr = self._mask_chr
+        view._start = start
+        view._stop = stop
+        view._revcomp = revcomp
+        view._rna = rna
+        return view
+
+    # === Views ===
+
+    def reverse_complement(self):
+        return self._view(self._start, self._stop, not self._revcomp, self._rna)
+
+    def to_rna(self):
+        return self._view(self._start, self._stop, self._revcomp, True)
+
+    def to_dna(self):
+        return self._view(self._start, self._stop, self._revcomp, False)
+
+    @property
+    def is_rna(self):
+        return self._rna
+
+    @property
+    def alphabet(self):
+        return RNA_ALPHABET if self._rna else DNA_ALPHABET
+
+    @property
+    def nbytes(self):
+        """Memory used by the packed buffer and the mask (shared between views)."""
+        return self._packed.nbytes + self._mask_pos.nbytes + self._mask_chr.nbytes
+
+    def __len__(self):
+        return self._stop - self._start
+
+    def __getitem__(self, key):
+        n = len(self)
+        if isinstance(key, slice):
+            start, stop, step = key.indices(n)
+            if step != 1:
+                return str(self)[key]
+            stop = max(stop, start)
+            if self._revcomp:
+                return self._view(self._stop - stop, self._stop - start, True, self._rna)
+            return self._view(self._start + start, self._start + stop, False, self._rna)
+        if key < 0:
+            key += n
+        if not 0 <= key < n:
+            raise IndexError("sequence index out of range")
+        return str(self[key:key + 1])
+
+    # === Decoding ===
+
+    def _masked_in_range(self):
+        lo, hi = np.searchsorted(self._mask_pos, [self._start, self._stop])
+        return self._mask_pos[lo:hi] - self._start, self._mask_chr[lo:hi]
+
+    def codes(self, mark_ambiguous=False):
+        """Returns the view as a uint8 array of codes 0..3 (A, C, G, T/U).
+
+        Masked positions read as 0, or as AMBIGUOUS (4) with mark_ambiguous=True.
+        """
+        start, stop = self._start, self._stop
+        if start == stop:
+            return np.zeros(0, dtype=np.uint8)
+        block = self._packed[start // 4:(stop - 1) // 4 + 1]
+        codes = ((block[:, None] >> _SHIFTS) & 3).ravel()
+        codes = codes[start % 4:start % 4 + (stop - start)]
+        if mark_ambiguous:
+            positions, _ = self._masked_in_range()
+            codes[positions] = AMBIGUOUS
+        if self._revcomp:
+            codes = codes[::-1].copy()
+            if mark_ambiguous:
+                unmasked = codes != AMBIGUOUS
+                codes[unmasked] = 3 - codes[unmasked]
+            else:
+                codes = 3 - codes
+        return codes
+
+    def ambiguous_mask(self):
+        """Boolean array, True where the view holds a masked (non-ACGT) symbol."""
+        mask = np.zeros(len(self), dtype=bool)
+        positions, _ = self._masked_in_range()
+        mask[positions] = True
+        return mask[::-1] if self._revcomp else mask
+
+    def to_bytes(self):
+        letters = np.frombuffer(self.alphabet.encode("ascii"), dtype=np.uint8)
+        text = letters[self.codes()]
+        positions, chars = self._masked_in_range()
+        if self._revcomp:
+            positions = len(self) - 1 - positions
+            chars = _IUPAC_COMPLEMENT[chars]
+        text[positions] = chars
+        return text.tobytes()
+
+    def take(self, positions):
+        """ASCII codes (uint8 array) of the bases at any positions of the view.
+
+        Gathers straight from the packed buffer, so reading many short
+        fragments never decodes the whole genome.
+        """
+        positions = np.asarray(positions, dtype=np.int64)
+        absolute = self._stop - 1 - positions if self._revcomp else self._start + positions
+        shifts = (6 - 2 * (absolute & 3)).astype(np.uint8)
+        codes = (self._packed[absolute >> 2] >> shifts) & 3
+        if self._revcomp:
+            codes = 3 - codes
+        text = np.frombuffer(self.alphabet.encode("ascii"), dtype=np.uint8)[codes]
+        if len(self._mask_pos):
+            idx = np.minimum(np.searchsorted(self._mask_pos, absolute), len(self._mask_pos) - 1)
+            hit = self._mask_pos[idx] == absolute
+            chars = self._mask_chr[idx[hit]]
+            text[hit] = _IUPAC_COMPLEMENT[chars] if self._revcomp else chars
+        return text
+
+    def __str__(self):
+        return self.to_bytes().decode("ascii")
+
+    def __repr__(self):
+        text = str(self[:20]) + ("..." if len(self) > 20 else "")
+        return f"PackedSequence('{text}', length={len(self)})"
+
+    # === Composition ===
+
+    def composition(self):
+        """Returns a dict symbol -> count for the view (only symbols present)."""
+        start, stop = self._start, self._stop
+        counts = np.zeros(4, dtype=np.int64)
+        if start < stop:
+            first_full = -(-start // 4)
+            last_full = stop // 4
+            if first_full < last_full:
+                hist = np.bincount(self._packed[first_full:last_full], minlength=256)
+                counts += hist @ _BYTE_COUNTS
+                edges = [(start, first_full * 4), (last_full * 4, stop)]
+            else:
+                edges = [(start, stop)]
+            for lo, hi in edges:
+                if lo < hi:
+                    counts += np.bincount(self._view(lo, hi, False, False).codes(), minlength=4)
+
+        _, chars = self._masked_in_range()
+        counts[0] -= len(chars)  # masked positions are stored as A
+        if self._revcomp:
+            counts = counts[::-1]
+            chars = _IUPAC_COMPLEMENT[chars]
+
+        result = {sym: int(c) for sym, c in zip(self.alphabet, counts) if c}
+        if len(chars):
+            values, numbers = np.unique(chars, return_counts=True)
+            for value, number in zip(values, numbers):
+                result[chr(value)] = result.get(chr(value), 0) + int(number)
+        return result
+
+    def gc_content(self):
+        comp = self.composition()
+        return (comp.get("G", 0) + comp.get("C", 0)) / len(self) * 100 if len(self) else 0.0
+
+    # === str compatibility ===
+
+    def count(self, sub):
+        if len(sub) == 1:
+            return self.composition().get(sub, 0)
+        return str(self).count(sub)
+
+    def upper(self):
+        return self
+
+    def strip(self, chars=None):
+        """Like str.strip; whitespace (or chars) only occurs in the mask, so this is a view."""
+        if chars is not None and any(ch in "ACGTUacgtu" for ch in chars):
+            return str(self).strip(chars)
+        removed = np.frombuffer(_WHITESPACE if chars is None else chars.encode("ascii"), dtype=np.uint8)
+        positions, values = self._masked_in_range()
+        if self._revcomp:
+            positions, values = len(self) - 1 - positions[::-1], _IUPAC_COMPLEMENT[values[::-1]]
+        stripped = np.isin(values, removed)
+        # Leading (trailing) run: masked positions 0, 1, 2... (n-1, n-2...) that are all stripped
+        lead = 0
+        while lead < len(positions) and positions[lead] == lead and stripped[lead]:
+            lead += 1
+        trail = 0
+        while (trail < len(positions) - lead and positions[-1 - trail] == len(self) - 1 - trail
+               and stripped[-1 - trail]):
+            trail += 1
+        return self[lead:len(self) - trail]
+
+    def replace(self, old, new):
+        if (old, new) == ("T", "U"):
+            return self.to_rna()
+        if (old, new) == ("U", "T"):
+            return self.to_dna()
+        if len(old) == 1 and self.count(old) == 0:
+            return self
+        return str(self).replace(old, new)
+
+    def __iter__(self):
+        return iter(str(self))
+
+    def __contains__(self, sub):
+        return sub in str(self)
+
+    def __eq__(self, other):
+        if isinstance(other, (str, PackedSequence)):
+            return str(self) == str(other)
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(str(self))
@@ -0,0 +1,182 @@
+"""
+Vectorized simulation of sequencing fragments and read pairs.
+
+Instead of slicing one string per fragment in a Python loop, all starts and
+lengths are drawn at once with a seeded numpy.random.Generator. A
+FragmentSet is just the genome plus those two arrays (12 bytes per
+fragment): fragment i is a zero-copy view of the genome (a memoryview, or a
+PackedSequence view for a packed genome), and gather() copies every
+fragment in one vectorized fancy-indexing step into a ReadSet, a single
+uint8 buffer with offsets.
+
+add_errors() injects substitutions, insertions and deletions into a ReadSet,
+and sample_pairs() simulates paired-end reads (the second read is the
+reverse complement of the other end of the insert).
+"""
+import zlib
+
+import numpy as np
+
+from bioutils.packed import PackedSequence
+from bioutils.windows import as_byte_array
+
+_BASES = np.frombuffer(b"ACGT", dtype=np.uint8)
+_COMPLEMENT = np.arange(256, dtype=np.uint8)  # IUPAC complement, as PackedSequence.reverse_complement()
+for _a, _b in ("AT", "CG", "RY", "KM", "BV", "DH", "at", "cg", "ry", "km", "bv", "dh"):
+    _COMPLEMENT[ord(_a)], _COMPLEMENT[ord(_b)] = ord(_b), ord(_a)
+
+
+def make_rng(seed=None, name=None):
+    """numpy Generator for a seed (or an existing Generator); a name gives each genome its own stream."""
+    if isinstance(seed, np.random.Generator):
+        return seed
+    if name is not None and seed is not None:
+        return np.random.default_rng([seed, zlib.crc32(name.encode())])
+    return np.random.default_rng(seed)
+
+
+def samples_for_coverage(genome_length, coverage, min_len=100, max_len=150):
+    """Number of fragments giving the requested mean coverage."""
+    return int(np.ceil(coverage * genome_length / ((min_len + max_len) / 2)))
+
+
+def sample_positions(genome_length, num_samples, min_len=100, max_len=150, rng=None):
+    """Draws (starts, lengths) of num_samples fragments, lengths uniform in [min_len, max_len]."""
+    if not 0 < min_len <= max_len <= genome_length:
+        raise ValueError("fragment lengths must satisfy 0 < min_len <= max_len <= genome length")
+    rng = make_rng(rng)
+    lengths = rng.integers(min_len, max_len + 1, size=num_samples)
+    starts = rng.integers(0, genome_length - lengths + 1)
+    return starts.astype(np.int64), lengths.astype(np.int32)
+
+
+class ReadSet:
+    """Reads stored back to back in one uint8 buffer; read i is buffer[offsets[i]:offsets[i + 1]]."""
+
+    def __init__(self, buffer, offsets):
+        self.buffer = buffer
+        self.offsets = offsets
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    @property
+    def lengths(self):
+        return np.diff(self.offsets)
+
+    def __getitem__(self, i):
+        return memoryview(self.buffer)[self.offsets[i]:self.offsets[i + 1]]
+
+    def strings(self):
+        """The reads as a list of str (what the assemblers take)."""
+        text = self.buffer.tobytes().decode("ascii")
+        bounds = self.offsets.tolist()
+        return [text[bounds[i]:bounds[i + 1]] for i in range(len(bounds) - 1)]
+
+    def __iter__(self):
+        return iter(self.strings())
+
+
+def _flat_positions(starts, lengths, reverse=None):
+    """Genome positions of all fragments concatenated; reversed fragments read right to left."""
+    offsets = np.concatenate(([0], np.cumsum(lengths, dtype=np.int64)))
+    within = np.arange(offsets[-1], dtype=np.int64) - np.repeat(offsets[:-1], lengths)
+    if reverse is not None:
+        flip = np.repeat(reverse, lengths)
+        within[flip] = np.repeat(lengths, lengths)[flip] - 1 - within[flip]
+    return np.repeat(starts, lengths) + within, offsets
+
+
+class FragmentSet:
+    """Fragments of a genome as (start, length) arrays, optionally on the reverse strand."""
+
+    def __init__(self, genome, starts, lengths, reverse=None):
+        self.genome = genome
+        self.starts = np.asarray(starts, dtype=np.int64)
+        self.lengths = np.asarray(lengths, dtype=np.int32)
+        self.reverse = None if reverse is None else np.asarray(reverse, dtype=bool)
+        # Packed genomes are read in place; anything else is viewed as bytes once
+        self._bytes = None if isinstance(genome, PackedSequence) else as_byte_array(genome)
+
+    @classmethod
+    def sample(cls, genome, num_samples=2000, min_len=100, max_len=150, rng=None):
+        starts, lengths = sample_positions(len(genome), num_samples, min_len, max_len, rng)
+        return cls(genome, starts, lengths)
+
+    def __len__(self):
+        return len(self.starts)
+
+    def __getitem__(self, i):
+        """Zero-copy view of fragment i (a copy for reverse-strand fragments)."""
+        start, stop = int(self.starts[i]), int(self.starts[i]) + int(self.lengths[i])
+        reverse = self.reverse is not None and self.reverse[i]
+        if self._bytes is None:
+            view = self.genome[start:stop]
+            return view.reverse_complement() if reverse else view
+        if reverse:
+            return memoryview(_COMPLEMENT[self._bytes[start:stop][::-1]])
+        return memoryview(self._bytes)[start:stop]
+
+    def gather(self):
+        """Copies all fragments into one ReadSet with a single vectorized gather."""
+        positions, offsets = _flat_positions(self.starts, self.lengths, self.reverse)
+        if self._bytes is None:
+            buffer = self.genome.take(positions)
+        else:
+            buffer = self._bytes[positions]
+        if self.reverse is not None:
+            flip = np.repeat(self.reverse, self.lengths)
+            buffer[flip] = _COMPLEMENT[buffer[flip]]
+        return ReadSet(buffer, offsets)
+
+    def strings(self):
+        return self.gather().strings()
+
+
+def add_errors(reads, substitution_rate=0.0, insertion_rate=0.0, deletion_rate=0.0, rng=None):
+    """Returns a new ReadSet with random sequencing errors, each rate per base.
+
+    A substitution always changes the base; inserted bases are uniform over ACGT.
+    """
+    rng = make_rng(rng)
+    buffer = reads.buffer.copy()
+    read_id = np.repeat(np.arange(len(reads)), reads.lengths)
+
+    subs = np.flatnonzero(rng.random(len(buffer)) < substitution_rate)
+    if len(subs):
+        codes = np.searchsorted(_BASES, buffer[subs])  # non-ACGT symbols become some base
+        buffer[subs] = _BASES[(codes + rng.integers(1, 4, size=len(subs))) % 4]
+
+    keep = rng.random(len(buffer)) >= deletion_rate
+    inserts = np.flatnonzero(rng.random(len(buffer)) < insertion_rate)
+    new_bases = _BASES[rng.integers(0, 4, size=len(inserts))]
+    # Insert before the chosen bases, then delete: positions refer to the original buffer
+    buffer = np.insert(buffer, inserts, new_bases)
+    read_id = np.insert(read_id, inserts, read_id[inserts])
+    keep = np.insert(keep, inserts, True)
+    buffer, read_id = buffer[keep], read_id[keep]
+
+    counts = np.bincount(read_id, minlength=len(reads))
+    offsets = np.concatenate(([0], np.cumsum(counts, dtype=np.int64)))
+    return ReadSet(buffer, offsets)
+
+
+def sample_pairs(genome, num_pairs, read_length=100, insert_mean=300, insert_sd=30, rng=None):
+    """Simulates paired-end reads; returns (first reads, second reads) as FragmentSets.
+
+    Insert sizes are normal(insert_mean, insert_sd), clipped to
+    [read_length, genome length]. The first read is the forward start of the
+    insert, the second the reverse complement of its end.
+    """
+    rng = make_rng(rng)
+    n = len(genome)
+    if read_length > n:
+        raise ValueError("read_length is longer than the genome")
+    inserts = np.rint(rng.normal(insert_mean, insert_sd, size=num_pairs)).astype(np.int64)
+    inserts = np.clip(inserts, read_length, n)
+    starts = rng.integers(0, n - inserts + 1)
+    lengths = np.full(num_pairs, read_length, dtype=np.int32)
+    first = FragmentSet(genome, starts, lengths)
+    second = FragmentSet(genome, starts + inserts - read_length, lengths,
+                         reverse=np.ones(num_pairs, dtype=bool))
+    return first, second
@@ -0,0 +1,282 @@
+"""
+Mergeable k-mer count structures for multi-file corpora.
+
+ExactKmerCounter keeps one int64 slot per possible k-mer (small k), and
+CountMinSketch keeps a depth x width table of hashed counters (large k; it
+never under-counts and over-counts by a bounded amount). Both can be added
+together, so per-record counts sum into a corpus total without rescanning,
+and both are saved to / loaded from a compressed .npz file.
+
+update_corpus_counts() uses that to count a corpus incrementally: files are
+identified by their path, and the counts of every file are also saved on
+their own, with the SHA-256 of the content they were made from. Unchanged
+files are skipped; when a file has changed, its old counts are subtracted
+from the total before the new ones are added (counts are linear, in the
+sketch as well).
+"""
+import hashlib
+import os
+
+import numpy as np
+
+from bioutils.fasta import iter_fasta
+from bioutils.kmers import DENSE_LIMIT, DNA, decode_kmers, kmer_codes
+
+CMS_WIDTH = 1 << 20
+CMS_DEPTH = 4
+
+
+def _kmer_value(kmer, alphabet, canonical):
+    values = kmer_codes(kmer, len(kmer), alphabet, canonical)
+    if len(values) != 1:
+        raise ValueError(f"'{kmer}' is not a valid k-mer over '{alphabet}'")
+    return values
+
+
+class ExactKmerCounter:
+    """Exact k-mer counts stored as a dense array of size len(alphabet) ** k."""
+
+    kind = "exact"
+
+    def __init__(self, k, alphabet=DNA, canonical=False, counts=None, sources=()):
+        self.k = k
+        self.alphabet = alphabet
+        self.canonical = canonical
+        size = len(alphabet) ** k
+        self.counts = np.zeros(size, dtype=np.int64) if counts is None else counts
+        self.sources = list(sources)
+
+    def add(self, sequence):
+        self.add_codes(kmer_codes(sequence, self.k, self.alphabet, self.canonical))
+        return self
+
+    def add_codes(self, values):
+        self.counts += np.bincount(values, minlength=len(self.counts))
+
+    def count(self, kmer):
+        return int(self.counts[_kmer_value(kmer, self.alphabet, self.canonical)][0])
+
+    @property
+    def total(self):
+        return int(self.counts.sum())
+
+    def most_common(self, n=10):
+        order = np.argsort(-self.counts, kind="stable")[:n]
+        order = order[self.counts[order] > 0]
+        return list(zip(decode_kmers(order, self.k, self.alphabet), self.counts[order].tolist()))
+
+    def _check_compatible(self, other):
+        if (type(other) is not type(self) or other.k != self.k or other.alphabet != self.alphabet
+                or other.canonical != self.canonical):
+            raise ValueError("can only merge counters with the same type, k, alphabet and canonical flag")
+
+    def merge(self, other):
+        """Adds the counts of other into self (in place)."""
+        self._check_compatible(other)
+        self.counts += other.counts
+        self.sources.extend(s for s in other.sources if s not in self.sources)
+        return self
+
+    def subtract(self, other):
+        """Removes the counts of other from self (in place), e.g. an outdated file."""
+        self._check_compatible(other)
+        self.counts -= other.counts
+        return self
+
+    def __add__(self, other):
+        return self.copy().merge(other)
+
+    def __iadd__(self, other):
+        return self.merge(other)
+
+    def copy(self):
+        return ExactKmerCounter(self.k, self.alphabet, self.canonical, self.counts.copy(), self.sources)
+
+    def empty(self):
+        """A zeroed counter with the same parameters."""
+        return ExactKmerCounter(self.k, self.alphabet, self.canonical)
+
+    def save(self, path):
+        _save(path, kind=self.kind, k=self.k, alphabet=self.alphabet, canonical=self.canonical,
+              sources=np.array(self.sources, dtype=str), counts=self.counts)
+
+
+class CountMinSketch:
+    """Count-min sketch of k-mer counts (depth rows of width hashed counters)."""
+
+    kind = "cms"
+
+    def __init__(self, k, alphabet=DNA, canonical=False, width=CMS_WIDTH, depth=CMS_DEPTH,
+                 seed=0, table=None, sources=()):
+        if width & (width - 1):
+            raise ValueError("width must be a power of two")
+        self.k = k
+        self.alphabet = alphabet
+        self.canonical = canonical
+        self.width = width
+        self.depth = depth
+        self.seed = seed
+        rng = np.random.default_rng(seed)
+        # Multiply-shift hashing: odd 64-bit multipliers, one per row
+        self._mult = rng.integers(1, 2 ** 63, size=depth, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        self._shift = np.uint64(64 - (width.bit_length() - 1))
+        self.table = np.zeros((depth, width), dtype=np.int64) if table is None else table
+        self.sources = list(sources)
+
+    def _buckets(self, values, row):
+        with np.errstate(over="ignore"):
+            return (values.astype(np.uint64) * self._mult[row]) >> self._shift
+
+    def add(self, sequence):
+        self.add_codes(kmer_codes(sequence, self.k, self.alphabet, self.canonical))
+        return self
+
+    def add_codes(self, values):
+        for row in range(self.depth):
+            self.table[row] += np.bincount(self._buckets(values, row).astype(np.int64),
+                                           minlength=self.width)
+
+    def estimate_codes(self, values):
+        """Estimated counts (upper bounds) for an array of k-mer codes."""
+        values = np.asarray(values, dtype=np.int64)
+        rows = [self.table[row, self._buckets(values, row).astype(np.int64)] for row in range(self.depth)]
+        return np.min(rows, axis=0)
+
+    def count(self, kmer):
+        return int(self.estimate_codes(_kmer_value(kmer, self.alphabet, self.canonical))[0])
+
+    @property
+    def total(self):
+        return int(self.table[0].sum())
+
+    def _check_compatible(self, other):
+        if (type(other) is not type(self) or other.k != self.k or other.alphabet != self.alphabet
+                or other.canonical != self.canonical or other.width != self.width
+                or other.depth != self.depth or other.seed != self.seed):
+            raise ValueError("can only merge sketches with identical parameters")
+
+    def merge(self, other):
+        self._check_compatible(other)
+        self.table += other.table
+        self.sources.extend(s for s in other.sources if s not in self.sources)
+        return self
+
+    def subtract(self, other):
+        self._check_compatible(other)
+        self.table -= other.table
+        return self
+
+    def __add__(self, other):
+        return self.copy().merge(other)
+
+    def __iadd__(self, other):
+        return self.merge(other)
+
+    def copy(self):
+        return CountMinSketch(self.k, self.alphabet, self.canonical, self.width, self.depth,
+                              self.seed, self.table.copy(), self.sources)
+
+    def empty(self):
+        return CountMinSketch(self.k, self.alphabet, self.canonical, self.width, self.depth, self.seed)
+
+    def save(self, path):
+        _save(path, kind=self.kind, k=self.k, alphabet=self.alphabet, canonical=self.canonical,
+              sources=np.array(self.sources, dtype=str), width=self.width, depth=self.depth,
+              seed=self.seed, table=self.table)
+
+
+def make_counter(k, alphabet=DNA, canonical=False, **sketch_options):
+    """Exact counter when the k-mer space is small enough, count-min sketch otherwise."""
+    if len(alphabet) ** k <= DENSE_LIMIT:
+        return ExactKmerCounter(k, alphabet, canonical)
+    return CountMinSketch(k, alphabet, canonical, **sketch_options)
+
+
+def _save(path, **arrays):
+    # Through a file object so that numpy does not append ".npz" to the name
+    with open(path, "wb") as f:
+        np.savez_compressed(f, **arrays)
+
+
+def load_counter(path):
+    with np.load(path) as data:
+        common = dict(k=int(data["k"]), alphabet=str(data["alphabet"]),
+                      canonical=bool(data["canonical"]), sources=data["sources"].tolist())
+        if str(data["kind"]) == "exact":
+            return ExactKmerCounter(counts=data["counts"], **common)
+        return CountMinSketch(width=int(data["width"]), depth=int(data["depth"]),
+                              seed=int(data["seed"]), table=data["table"], **common)
+
+
+def source_id(filepath, chunk_size=1 << 20):
+    """Identifies a file by the SHA-256 of its content."""
+    digest = hashlib.sha256()
+    with open(filepath, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def count_records(filepath, template):
+    """Returns {record header: counter} for one FASTA file; template gives k, alphabet, etc."""
+    return {header: template.empty().add(seq.upper())
+            for header, seq in iter_fasta(filepath, as_bytes=True)}
+
+
+def _file_counts_path(store_path, filepath):
+    """Where the counts of one file are kept: <store>.files/<hash of its absolute path>.npz."""
+    name = hashlib.sha256(os.path.abspath(filepath).encode()).hexdigest()[:32]
+    return os.path.join(store_path + ".files", name + ".npz")
+
+
+def update_corpus_counts(store_path, filepaths, k, alphabet=DNA, canonical=False):
+    """Adds the k-mer counts of new or changed files to the counter saved at store_path.
+
+    The total's sources are the absolute paths of the counted files. The
+    counts of every file are saved next to the store, with the content
+    SHA-256 as their source, so a changed file replaces its old counts.
+    Returns (counter, list of files counted in this call).
+    """
+    if os.path.exists(store_path):
+        total = load_counter(store_path)
+        if total.k != k or total.alphabet != alphabet or total.canonical != canonical:
+            raise ValueError(f"{store_path} holds counts with different parameters")
+    else:
+        total = make_counter(k, alphabet, canonical)
+
+    added = []
+    pending = []  # (path, counts) of the files counted in this call
+    seen = set()
+    for filepath in filepaths:
+        path = os.path.abspath(filepath)
+        # The same file under another spelling (a.fa, ./a.fa, dir and glob inputs)
+        # must be counted, or have its old counts subtracted, only once
+        if path in seen:
+            continue
+        seen.add(path)
+        sid = source_id(filepath)
+        counts_path = _file_counts_path(store_path, filepath)
+        if path in total.sources and os.path.exists(counts_path):
+            previous = load_counter(counts_path)
+            if previous.sources == [sid]:
+                continue
+            total.subtract(previous)  # the file changed since it was counted
+        elif path in total.sources:
+            raise ValueError(f"{store_path} counts {filepath} but its per-file counts are missing")
+
+        counts = total.empty()
+        for _, seq in iter_fasta(filepath, as_bytes=True):
+            counts.add(seq.upper())
+        total.merge(counts)
+        if path not in total.sources:
+            total.sources.append(path)
+        counts.sources = [sid]
+        pending.append((counts_path, counts))
+        added.append(filepath)
+
+    if added:
+        total.save(store_path)
+        os.makedirs(store_path + ".files", exist_ok=True)
+        for counts_path, counts in pending:
+            counts.save(counts_path)
+    return total, added
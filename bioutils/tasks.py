@@ -0,0 +1,117 @@
+"""
+Background analyses for the Tk labs.
+
+A Tk button callback that reads and analyses a whole genome blocks the event
+loop, so the window freezes until it returns. BackgroundTask runs the
+analysis on a daemon thread instead: the function reports its progress with
+task.report(fraction, message) and calls task.check() between steps, which
+raises TaskCancelled once cancel() has been called (a running NumPy call
+cannot be interrupted, so cancellation takes effect at the next step).
+
+Tk widgets may only be used from the main thread, so the thread never
+touches them: everything it produces goes through a queue, and watch()
+drains that queue from the Tk event loop with widget.after() polling and
+calls the handlers there. This module does not import tkinter.
+
+preview() shortens a sequence for display: inserting a few hundred
+thousand characters into a Text widget takes seconds by itself.
+"""
+import queue
+import threading
+
+POLL_MS = 100
+PREVIEW_CHARS = 2000
+
+
+class TaskCancelled(Exception):
+    """Raised inside a BackgroundTask function when the task was cancelled."""
+
+
+class BackgroundTask:
+    """Runs func(task, *args) on a daemon thread; results come back through events()."""
+
+    def __init__(self, func, *args):
+        self._func = func
+        self._args = args
+        self._events = queue.Queue()
+        self._cancel = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def cancel(self):
+        self._cancel.set()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def running(self):
+        return self._thread.is_alive()
+
+    def check(self):
+        """Raises TaskCancelled if cancel() was called (call it between steps)."""
+        if self._cancel.is_set():
+            raise TaskCancelled()
+
+    def report(self, fraction, message=""):
+        """Sends a progress update (fraction in [0, 1]); also a cancellation point."""
+        self.check()
+        self._events.put(("progress", (fraction, message)))
+
+    def _run(self):
+        try:
+            result = self._func(self, *self._args)
+        except TaskCancelled:
+            self._events.put(("cancelled", None))
+        except Exception as error:
+            self._events.put(("error", error))
+        else:
+            self._events.put(("done", result))
+
+    def events(self):
+        """Returns the (kind, value) events sent since the last call, without blocking.
+
+        kind is "progress" (value (fraction, message)), or one final "done"
+        (the function's result), "error" (the exception) or "cancelled".
+        """
+        events = []
+        while True:
+            try:
+                events.append(self._events.get_nowait())
+            except queue.Empty:
+                return events
+
+
+def watch(widget, task, on_done, on_progress=None, on_error=None, on_cancel=None,
+          interval_ms=POLL_MS):
+    """Polls task from the Tk event loop of widget and calls the handlers in the main thread.
+
+    on_done(result), on_progress(fraction, message), on_error(exception) and
+    on_cancel() are optional except on_done; polling stops with the final event.
+    """
+    def poll():
+        for kind, value in task.events():
+            if kind == "progress":
+                if on_progress:
+                    on_progress(*value)
+                continue
+            if kind == "done":
+                on_done(value)
+            elif kind == "error" and on_error:
+                on_error(value)
+            elif kind == "cancelled" and on_cancel:
+                on_cancel()
+            return
+        widget.after(interval_ms, poll)
+
+    widget.after(interval_ms, poll)
+
+
+def preview(sequence, limit=PREVIEW_CHARS):
+    """The first limit characters of a sequence, with a note of how many are hidden."""
+    if len(sequence) <= limit:
+        return str(sequence)
+    return f"{sequence[:limit]}\n... ({len(sequence) - limit:,} more, {len(sequence):,} in total)"
@@ -0,0 +1,53 @@
+"""
+Melting temperature (Tm) formulas and a batched sliding-window Tm profile.
+
+    simple:       Tm = 4(G + C) + 2(A + T)
+    alternative:  Tm = 81.5 + 16.6 * log10([Na+]) + 0.41 * (%GC) - 600 / length
+
+Both formulas work on scalars or on NumPy arrays of per-window counts, so a
+whole genome is profiled with one window_counts pass and a few array ops.
+"""
+import numpy as np
+
+from bioutils.windows import window_counts
+
+DEFAULT_NA = 0.001  # [Na+] in mol/L used by the labs
+
+
+def tm_simple(G, C, A, T):
+    """Simple formula for melting temperature."""
+    return 4 * (G + C) + 2 * (A + T)
+
+
+def tm_alternative(gc_perc, length, na=DEFAULT_NA):
+    """Alternative (salt-adjusted) formula for melting temperature."""
+    if np.any(np.asarray(na) <= 0):
+        raise ValueError("Na+ concentration must be positive")
+    return 81.5 + 16.6 * np.log10(na) + 0.41 * gc_perc - 600 / length
+
+
+def tm_of_sequence(sequence, na=DEFAULT_NA):
+    """Returns (Tm simple, Tm alternative) for a whole (primer) sequence."""
+    seq = sequence.upper()
+    G, C, A, T = (seq.count(b) for b in "GCAT")
+    gc_perc = (G + C) / len(seq) * 100
+    return tm_simple(G, C, A, T), float(tm_alternative(gc_perc, len(seq), na))
+
+
+def tm_profile(sequence, window_size=9, step=1, na=DEFAULT_NA):
+    """Computes both Tm signals along a sequence in a single pass.
+
+    The sequence is expected upper-case, as returned by the labs' readers.
+    Returns (positions, tm_simple, tm_alternative) as NumPy arrays; positions
+    are the 1-based start of each window.
+    """
+    starts, counts, _ = window_counts(sequence, window_size, step, alphabet="ACGT")
+    return (starts + 1, *tm_from_counts(counts, window_size, na))
+
+
+def tm_from_counts(counts, window_size, na=DEFAULT_NA):
+    """(tm_simple, tm_alternative) of windows given their A, C, G, T counts (rows of counts)."""
+    A, C, G, T = counts
+    simple = tm_simple(G, C, A, T)
+    alternative = tm_alternative((G + C) * (100.0 / window_size), window_size, na)
+    return simple, alternative
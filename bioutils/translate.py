@@ -0,0 +1,103 @@
+"""
+Vectorized translation of nucleotide sequences with NCBI genetic code tables.
+
+Bases are encoded as 0..3 (A, C, G, T/U; 4 for anything else), every codon
+becomes an index 16*b1 + 4*b2 + b3 in 0..63 (64 when it holds an ambiguous
+base) and the protein is a single fancy-indexing lookup into a 65-entry
+array of one-letter amino acid codes ('*' for Stop, 'X' for unknown).
+"""
+import numpy as np
+
+from bioutils.packed import AMBIGUOUS, encode_bases
+
+# Amino acids per NCBI table, codons in NCBI order (bases T, C, A, G; first base slowest)
+NCBI_TABLES = {
+    1: "FFLLSSSSYY**CC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",   # Standard
+    2: "FFLLSSSSYY**CCWWLLLLPPPPHHQQRRRRIIMMTTTTNNKKSS**VVVVAAAADDEEGGGG",   # Vertebrate mitochondrial
+    3: "FFLLSSSSYY**CCWWTTTTPPPPHHQQRRRRIIMMTTTTNNKKSSRRVVVVAAAADDEEGGGG",   # Yeast mitochondrial
+    4: "FFLLSSSSYY**CCWWLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",   # Mold/protozoan mitochondrial
+    5: "FFLLSSSSYY**CCWWLLLLPPPPHHQQRRRRIIMMTTTTNNKKSSSSVVVVAAAADDEEGGGG",   # Invertebrate mitochondrial
+    6: "FFLLSSSSYYQQCC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",   # Ciliate nuclear
+    9: "FFLLSSSSYY**CCWWLLLLPPPPHHQQRRRRIIIMTTTTNNNKSSSSVVVVAAAADDEEGGGG",   # Echinoderm mitochondrial
+    10: "FFLLSSSSYY**CCCWLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",  # Euplotid nuclear
+    11: "FFLLSSSSYY**CC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",  # Bacterial and plant plastid
+    12: "FFLLSSSSYY**CC*WLLLSPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",  # Alternative yeast nuclear
+    13: "FFLLSSSSYY**CCWWLLLLPPPPHHQQRRRRIIMMTTTTNNKKSSGGVVVVAAAADDEEGGGG",  # Ascidian mitochondrial
+    14: "FFLLSSSSYYY*CCWWLLLLPPPPHHQQRRRRIIIMTTTTNNNKSSSSVVVVAAAADDEEGGGG",  # Alternative flatworm mitochondrial
+}
+
+_NCBI_BASE = {0: 2, 1: 1, 2: 3, 3: 0}  # our code (A, C, G, T) -> NCBI position (T, C, A, G)
+AMBIGUOUS_CODON = 64
+
+
+def codon_table(table=1):
+    """Returns a uint8 array of 65 one-letter codes indexed by codon index (64 -> 'X').
+
+    table is an NCBI table id or a 64-letter string in NCBI (TCAG) order.
+    """
+    letters = NCBI_TABLES[table] if isinstance(table, int) else table
+    if len(letters) != 64:
+        raise ValueError("a genetic code table needs exactly 64 amino acids")
+    lookup = np.empty(65, dtype=np.uint8)
+    for index in range(64):
+        b1, b2, b3 = index // 16, index // 4 % 4, index % 4
+        ncbi = 16 * _NCBI_BASE[b1] + 4 * _NCBI_BASE[b2] + _NCBI_BASE[b3]
+        lookup[index] = ord(letters[ncbi])
+    lookup[AMBIGUOUS_CODON] = ord("X")
+    return lookup
+
+
+def codon_name(index, rna=False):
+    """Codon string for a codon index, e.g. 14 -> 'ATG' (or 'AUG' with rna=True)."""
+    letters = "ACGU" if rna else "ACGT"
+    return letters[index // 16] + letters[index // 4 % 4] + letters[index % 4]
+
+
+def codon_indices(codes, frame=0):
+    """Codon indices (0..63, 64 if ambiguous) of base codes read from offset `frame`."""
+    codes = codes[frame:]
+    codes = codes[:len(codes) // 3 * 3].reshape(-1, 3).astype(np.int64)
+    indices = codes[:, 0] * 16 + codes[:, 1] * 4 + codes[:, 2]
+    indices[(codes == AMBIGUOUS).any(axis=1)] = AMBIGUOUS_CODON
+    return indices
+
+
+def reverse_complement_codes(codes):
+    rc = codes[::-1].copy()
+    known = rc != AMBIGUOUS
+    rc[known] = 3 - rc[known]
+    return rc
+
+
+def _protein(indices, lookup, to_stop):
+    protein = lookup[indices].tobytes().decode("ascii")
+    if to_stop:
+        stop = protein.find("*")
+        if stop != -1:
+            protein = protein[:stop]
+    return protein
+
+
+def translate(sequence, frame=0, table=1, to_stop=False):
+    """Translates one reading frame (0, 1 or 2) of a DNA/RNA sequence into one-letter protein.
+
+    With to_stop=True the protein ends before the first stop codon.
+    """
+    codes = encode_bases(sequence)
+    return _protein(codon_indices(codes, frame), codon_table(table), to_stop)
+
+
+def translate_six_frames(sequence, table=1, to_stop=False):
+    """Translates all six frames; returns {+1, +2, +3, -1, -2, -3: protein}.
+
+    Frames -1..-3 are read on the reverse complement, starting at its
+    offsets 0..2 (the same convention as EMBOSS transeq and Biopython).
+    """
+    lookup = codon_table(table)
+    forward = encode_bases(sequence)
+    reverse = reverse_complement_codes(forward)
+    frames = {}
+    for strand, codes in ((1, forward), (-1, reverse)):
+        for frame in range(3):
+            frames[strand * (frame + 1)] = _protein(codon_indices(codes, frame), lookup, to_stop)
+    return frames
@@ -0,0 +1,54 @@
+"""
+Sliding-window symbol counts in O(n) with NumPy.
+
+For every symbol a cumulative sum of its occurrences is built once; the count
+inside window [i, i + w) is then cs[i + w] - cs[i], for all windows at once.
+This replaces rebuilding a count dict (or calling str.count) per window.
+"""
+import numpy as np
+
+
+def as_byte_array(sequence):
+    """Returns the sequence as a uint8 NumPy array of ASCII codes (no copy when possible)."""
+    if isinstance(sequence, np.ndarray):
+        return sequence.astype(np.uint8, copy=False)
+    if isinstance(sequence, str):
+        sequence = sequence.encode("ascii")
+    elif hasattr(sequence, "to_bytes"):  # PackedSequence
+        sequence = sequence.to_bytes()
+    return np.frombuffer(sequence, dtype=np.uint8)
+
+
+def window_starts(length, window_size, step=1):
+    """0-based start positions of all complete windows."""
+    if window_size <= 0 or step <= 0:
+        raise ValueError("window_size and step must be positive")
+    if length < window_size:
+        return np.zeros(0, dtype=np.int64)
+    return np.arange(0, length - window_size + 1, step, dtype=np.int64)
+
+
+def window_counts(sequence, window_size, step=1, alphabet=None):
+    """Counts every symbol in every sliding window.
+
+    Returns (starts, counts, alphabet) where counts has shape
+    (len(alphabet), number of windows). If alphabet is None it is the sorted
+    set of symbols in the sequence; symbols outside a given alphabet are ignored.
+    """
+    data = as_byte_array(sequence)
+    if alphabet is None:
+        alphabet = [chr(b) for b in np.unique(data)]
+    starts = window_starts(len(data), window_size, step)
+    dtype = np.int32 if len(data) < 2 ** 31 else np.int64
+    counts = np.empty((len(alphabet), len(starts)), dtype=dtype)
+    cs = np.zeros(len(data) + 1, dtype=dtype)
+    for row, symbol in enumerate(alphabet):
+        np.cumsum(data == ord(symbol), out=cs[1:])
+        counts[row] = cs[starts + window_size] - cs[starts]
+    return starts, counts, list(alphabet)
+
+
+def window_frequencies(sequence, window_size, step=1, alphabet=None):
+    """Same as window_counts but returns relative frequencies (counts / window_size)."""
+    starts, counts, alphabet = window_counts(sequence, window_size, step, alphabet)
+    return starts, counts / window_size, alphabet
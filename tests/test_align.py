@@ -0,0 +1,70 @@
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from bioutils.align import GAP, MATCH, MISMATCH, align_score, align_scores, edit_distance, edit_distances
+
+rng = random.Random(19)
+PAIRS = [("", ""), ("", "ACGT"), ("ACGT", ""), ("A", "A"), ("ACGT", "AGT"), ("GATTACA", "GCATGCT")]
+PAIRS += [("".join(rng.choice("ACGT") for _ in range(rng.randint(1, 90))),
+           "".join(rng.choice("ACGT") for _ in range(rng.randint(1, 90)))) for _ in range(15)]
+# A pattern longer than a 64-bit word, found with a few edits inside a text
+LONG = "".join(rng.choice("ACGT") for _ in range(150))
+PAIRS.append((LONG, "TTGCA" + LONG[:40] + "G" + LONG[40:100] + LONG[101:] + "CCA"))
+
+
+def naive_edit_distance(pattern, text, mode):
+    """Full DP table: row i is the first i characters of the pattern."""
+    row = [0 if mode == "infix" else j for j in range(len(text) + 1)]
+    for i, p in enumerate(pattern, 1):
+        previous, row = row, [i]
+        for j, t in enumerate(text, 1):
+            row.append(min(previous[j] + 1, row[j - 1] + 1, previous[j - 1] + (p != t)))
+    return row[-1] if mode == "global" else min(row)
+
+
+def naive_score(query, target, mode, match=MATCH, mismatch=MISMATCH, gap=GAP):
+    """Needleman-Wunsch / Smith-Waterman / semiglobal DP over the full table."""
+    local = mode == "local"
+    row = [0 if mode != "global" else j * gap for j in range(len(target) + 1)]
+    best = max(row) if local else None
+    for i, q in enumerate(query, 1):
+        previous, row = row, [0 if local else i * gap]
+        for j, t in enumerate(target, 1):
+            cell = max(previous[j - 1] + (match if q == t else mismatch), previous[j] + gap, row[j - 1] + gap)
+            row.append(max(cell, 0) if local else cell)
+        if local:
+            best = max(best, max(row))
+    if local:
+        return best
+    return row[-1] if mode == "global" else max(row)
+
+
+@pytest.mark.parametrize("mode", ["global", "infix", "prefix"])
+def test_edit_distance_matches_dp(mode):
+    for pattern, text in PAIRS:
+        assert edit_distance(pattern, text, mode) == naive_edit_distance(pattern, text, mode), (pattern, text)
+    for pattern, _ in PAIRS[:10]:
+        expected = [naive_edit_distance(pattern, text, mode) for _, text in PAIRS]
+        assert edit_distances(pattern, [text for _, text in PAIRS], mode).tolist() == expected
+
+
+@pytest.mark.parametrize("mode", ["global", "local", "semiglobal"])
+@pytest.mark.parametrize("scoring", [(MATCH, MISMATCH, GAP), (1, -3, -5), (5, -4, -1)])
+def test_scores_match_dp(mode, scoring):
+    for query, _ in PAIRS[:8]:
+        targets = [target for _, target in PAIRS]
+        expected = [naive_score(query, target, mode, *scoring) for target in targets]
+        assert align_scores(query, targets, mode, *scoring).tolist() == expected, query
+    query, target = PAIRS[-1]
+    assert align_score(query, target, mode, *scoring) == naive_score(query, target, mode, *scoring)
+
+
+def test_unknown_mode():
+    with pytest.raises(ValueError):
+        edit_distance("A", "A", mode="local")
+    with pytest.raises(ValueError):
+        align_score("A", "A", mode="infix")
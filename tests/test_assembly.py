@@ -0,0 +1,99 @@
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from bioutils.assembly import greedy_assemble, overlap_graph, overlap_graph_assemble
+
+
+def random_genome(length, seed):
+    rng = random.Random(seed)
+    return "".join(rng.choice("ACGT") for _ in range(length))
+
+
+def random_fragments(genome, count, min_len, max_len, seed):
+    rng = random.Random(seed)
+    fragments = []
+    for _ in range(count):
+        length = rng.randint(min_len, max_len)
+        start = rng.randint(0, len(genome) - length)
+        fragments.append(genome[start:start + length])
+    return fragments
+
+
+def naive_greedy(fragments):
+    """The original L5 loop: every unused fragment is tested at every overlap from 100 down to 11."""
+    contig, used = fragments[0], {0}
+    while True:
+        best_overlap, best = 0, None
+        for i, frag in enumerate(fragments):
+            if i in used:
+                continue
+            for j in range(100, 10, -1):
+                if contig.endswith(frag[:j]) and j > best_overlap:
+                    best_overlap, best = j, i
+        if best is None:
+            return contig
+        contig += fragments[best][best_overlap:]
+        used.add(best)
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_greedy_matches_original_loop(seed):
+    # Fragments of at least max_overlap (100) bases, like the L5 samples
+    genome = random_genome(1500, seed)
+    fragments = random_fragments(genome, 60, 100, 150, seed)
+    assert greedy_assemble(fragments) == naive_greedy(fragments)
+
+
+def test_greedy_rebuilds_genome_from_tiled_reads():
+    genome = random_genome(2000, 99)
+    fragments = [genome[start:start + 120] for start in range(0, len(genome) - 119, 60)]
+    fragments[1:] = random.Random(1).sample(fragments[1:], len(fragments) - 1)
+    assert greedy_assemble(fragments) == genome[:len(fragments[0]) + 60 * (len(fragments) - 1)]
+
+
+def test_greedy_tolerates_errors():
+    genome = random_genome(600, 7)
+    first, second = genome[:150], list(genome[100:250])
+    second[30] = "A" if second[30] != "A" else "C"  # one substitution inside the overlap
+    fragments = [first, "".join(second)]
+    assert greedy_assemble(fragments) == first
+    assert greedy_assemble(fragments, max_errors=1) == first + "".join(second)[50:]
+
+
+def naive_overlap_graph(fragments, min_overlap, max_overlap):
+    """Tests every ordered pair of fragments at every overlap length."""
+    edges, contained = [], set()
+    for a, frag in enumerate(fragments):
+        for b, other in enumerate(fragments):
+            if a == b:
+                continue
+            if other in frag and (len(other) < len(frag) or b > a):
+                contained.add(b)
+            for length in range(min_overlap, min(max_overlap, len(frag), len(other) - 1) + 1):
+                if frag.endswith(other[:length]):
+                    edges.append((a, b, length))
+    return sorted(edges), contained
+
+
+@pytest.mark.parametrize("workers,chunk_size", [(1, 256), (1, 7), (2, 7)])
+@pytest.mark.parametrize("max_overlap", [None, 60])
+def test_overlap_graph_matches_all_pairs(workers, chunk_size, max_overlap):
+    genome = random_genome(700, 3) + "ACACACACACACACACACAC" + random_genome(300, 4)
+    fragments = random_fragments(genome, 40, 40, 90, 5)
+    fragments += [fragments[0], fragments[3][10:50]]  # a duplicate and a contained fragment
+    src, dst, lengths, contained = overlap_graph(fragments, 11, max_overlap, workers, chunk_size)
+    edges, expected_contained = naive_overlap_graph(fragments, 11, max_overlap or 90)
+    assert sorted(zip(src.tolist(), dst.tolist(), lengths.tolist())) == edges
+    assert set(contained.nonzero()[0].tolist()) == expected_contained
+
+
+def test_overlap_graph_rebuilds_genome_from_tiled_reads():
+    genome = random_genome(2000, 99)
+    fragments = [genome[start:start + 120] for start in range(0, len(genome) - 119, 60)]
+    fragments += [genome[130:170]]  # contained, left out
+    random.Random(2).shuffle(fragments)
+    assert overlap_graph_assemble(fragments, workers=1) == [genome[:1860 + 120]]
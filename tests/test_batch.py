@@ -0,0 +1,62 @@
+import csv
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from bioutils.batch import ResultWriter, expand_inputs, n50, run_batch
+
+ROWS = [{"name": "camelpox", "gc": 33.18, "contigs": 1}, {"name": "goatpox", "gc": 25.3, "contigs": 4}]
+
+
+def read_back(path):
+    """Rows of an output file, read with the standard library."""
+    with open(path, newline="") as f:
+        if path.endswith(".json"):
+            return json.load(f)
+        if path.endswith(".jsonl"):
+            return [json.loads(line) for line in f]
+        rows = list(csv.DictReader(f, dialect="excel-tab" if path.endswith(".tsv") else "excel"))
+        return [{key: value if key == "name" else json.loads(value) for key, value in row.items()}
+                for row in rows]
+
+
+@pytest.mark.parametrize("extension", [".json", ".jsonl", ".csv", ".tsv"])
+@pytest.mark.parametrize("count", [0, 1, 2])
+def test_writer_output_parses(tmp_path, extension, count):
+    path = str(tmp_path / ("results" + extension))
+    with ResultWriter(path) as writer:
+        for row in ROWS[:count]:
+            writer.write(row)
+    if extension in (".csv", ".tsv") and count == 0:
+        assert os.path.getsize(path) == 0
+    else:
+        assert read_back(path) == ROWS[:count]
+
+
+def test_expand_inputs(tmp_path):
+    for name in ("b.fasta", "a.fa", "notes.txt"):
+        (tmp_path / name).write_text(">x\nACGT\n")
+    directory, pattern = str(tmp_path), str(tmp_path / "*.fa*")
+    expected = [os.path.join(directory, "a.fa"), os.path.join(directory, "b.fasta")]
+    assert expand_inputs([directory, pattern, expected[0]]) == expected
+    with pytest.raises(ValueError):
+        expand_inputs(str(tmp_path / "missing*.fasta"))
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_run_batch_yields_every_result(tmp_path, workers):
+    paths = []
+    for i in range(4):
+        path = tmp_path / f"g{i}.fasta"
+        path.write_text(">x\n" + "A" * i + "\n")
+        paths.append(str(path))
+    assert sorted(run_batch(os.path.getsize, paths, workers=workers)) == sorted(map(os.path.getsize, paths))
+
+
+def test_n50():
+    assert n50([]) == 0
+    assert n50([100]) == 100
+    assert n50([2, 3, 4, 5, 6, 7, 8, 9, 10]) == 8  # 10 + 9 + 8 = 27 >= 54 / 2
@@ -0,0 +1,39 @@
+import math
+import os
+import random
+import statistics
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from bioutils.benchmark import find_regressions, median_ci, summarize
+
+
+def naive_rank(n, confidence=0.95):
+    """Largest r whose order-statistic interval [x(r), x(n+1-r)] covers the median with the confidence."""
+    best = 1
+    for r in range(1, (n + 1) // 2 + 1):
+        if 1 - 2 * sum(math.comb(n, i) for i in range(r)) / 2 ** n >= confidence:
+            best = r
+    return best
+
+
+def test_median_ci_ranks():
+    for n in range(1, 60):
+        r = naive_rank(n)
+        assert median_ci(list(range(1, n + 1))) == (r, n + 1 - r)
+
+
+def test_summary_interval_is_around_the_median():
+    rng = random.Random(0)
+    for n in (1, 3, 5, 12, 40):
+        # Skewed, timing-like samples with an outlier
+        samples = [int(rng.expovariate(1.0) * 1e6) + 1_000_000 for _ in range(n)] + [50_000_000]
+        stats = summarize(samples)
+        assert stats["median_ms"] == statistics.median(s / 1e6 for s in samples)
+        assert 0 < stats["ci_low_ms"] <= stats["median_ms"] <= stats["ci_high_ms"]
+
+
+def test_regressions_compare_medians():
+    baseline = [{"case": 1, **summarize([10_000_000] * 9)}, {"case": 2, **summarize([10_000_000] * 9)}]
+    results = [{"case": 1, **summarize([20_000_000] * 9)}, {"case": 2, **summarize([10_500_000] * 9)}]
+    assert find_regressions(baseline, results, ["case"]) == [({"case": 1}, 10.0, 20.0)]
@@ -0,0 +1,82 @@
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from bioutils.cache import ResultCache, cached, default_cache
+
+
+def make_source(tmp_path, text=">a\nACGT\n"):
+    path = tmp_path / "genome.fasta"
+    path.write_text(text)
+    return str(path)
+
+
+def test_round_trip_and_keys(tmp_path):
+    source = make_source(tmp_path)
+    cache = ResultCache(str(tmp_path / "cache"))
+    assert cache.get(source, "counts", {"k": 2}) is None
+    cache.put(source, "counts", {"k": 2}, np.arange(5))
+    cache.put(source, "profile", {"k": 2}, (np.arange(3), np.array([0.5, 1.5]), np.array(["A", "C"])))
+    assert np.array_equal(cache.get(source, "counts", {"k": 2}), np.arange(5))
+    starts, values, names = cache.get(source, "profile", {"k": 2})
+    assert starts.tolist() == [0, 1, 2] and values.tolist() == [0.5, 1.5] and names.tolist() == ["A", "C"]
+    # Another parameter, analysis or file content misses
+    assert cache.get(source, "counts", {"k": 3}) is None
+    assert cache.get(source, "kmers", {"k": 2}) is None
+    make_source(tmp_path, ">a\nACGA\n")
+    assert cache.get(source, "counts", {"k": 2}) is None
+    assert (cache.hits, cache.misses) == (2, 4)
+
+
+def test_compute_once(tmp_path):
+    source = make_source(tmp_path)
+    cache = ResultCache(str(tmp_path / "cache"))
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return np.ones(3)
+
+    for _ in range(3):
+        assert np.array_equal(cache.get_or_compute(source, "ones", None, compute), np.ones(3))
+    assert len(calls) == 1
+
+
+def test_least_recently_used_are_evicted(tmp_path):
+    source = make_source(tmp_path)
+    cache = ResultCache(str(tmp_path / "cache"), max_bytes=1 << 30)
+    for i in range(4):
+        cache.put(source, "entry", {"i": i}, np.full(1000, i))
+        path = os.path.join(cache.directory, cache.key(source, "entry", {"i": i}) + ".npz")
+        os.utime(path, ns=(i * 10 ** 9, i * 10 ** 9))
+    cache.get(source, "entry", {"i": 0})  # now the most recently used
+    entry_size = cache.size() // 4
+    cache.evict(2 * entry_size)
+    assert [cache.get(source, "entry", {"i": i}) is not None for i in range(4)] == [True, False, False, True]
+    cache.clear()
+    assert cache.size() == 0
+
+
+def test_damaged_entry_is_recomputed(tmp_path):
+    source = make_source(tmp_path)
+    cache = ResultCache(str(tmp_path / "cache"))
+    cache.put(source, "counts", None, np.arange(3))
+    with open(os.path.join(cache.directory, cache.key(source, "counts", None) + ".npz"), "wb") as f:
+        f.write(b"not a zip file")
+    assert cache.get(source, "counts", None) is None
+    assert cache.size() == 0
+
+
+def test_environment_variable(tmp_path, monkeypatch):
+    source = make_source(tmp_path)
+    monkeypatch.setenv("BIOUTILS_CACHE", "off")
+    assert default_cache() is None
+    assert cached(source, "counts", None, lambda: np.arange(2)).tolist() == [0, 1]
+
+    monkeypatch.setenv("BIOUTILS_CACHE", str(tmp_path / "cache"))
+    assert default_cache().directory == str(tmp_path / "cache")
+    cached(source, "counts", None, lambda: np.arange(2))
+    assert cached(source, "counts", None, lambda: np.arange(7)).tolist() == [0, 1]
+    assert cached(None, "counts", None, lambda: np.arange(7)).tolist() == list(range(7))
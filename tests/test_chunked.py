@@ -0,0 +1,53 @@
+import os
+import random
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from bioutils.chunked import (block_bounds, chunked_tm_profile, chunked_window_counts,
+                              chunked_window_frequencies, record_window_counts)
+from bioutils.faidx import IndexedFasta
+from bioutils.tm import tm_profile
+from bioutils.windows import window_counts, window_frequencies
+
+rng = random.Random(21)
+SEQUENCE = "".join(rng.choice("ACGTN") for _ in range(5000))
+CASES = [(9, 1, 1000), (100, 7, 64), (5000, 1, 10), (6000, 1, 10), (31, 40, 3)]
+
+
+def test_blocks_cover_every_window():
+    for window_size, step, block_windows in CASES:
+        bounds = block_bounds(len(SEQUENCE), window_size, step, block_windows)
+        starts = window_counts(SEQUENCE, window_size, step, "A")[0]
+        assert [w for first, end, _, _ in bounds for w in range(first, end)] == list(range(len(starts)))
+        for first, end, start, stop in bounds:
+            assert start == starts[first] and stop == starts[end - 1] + window_size
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+@pytest.mark.parametrize("window_size,step,block_windows", CASES)
+def test_blocks_match_serial_engine(workers, window_size, step, block_windows):
+    expected = window_counts(SEQUENCE, window_size, step, None)
+    result = chunked_window_counts(SEQUENCE, window_size, step, None, workers, block_windows)
+    assert np.array_equal(result[0], expected[0]) and np.array_equal(result[1], expected[1])
+    assert list(result[2]) == list(expected[2])
+
+    frequencies = chunked_window_frequencies(SEQUENCE, window_size, step, "GC", workers, block_windows)
+    assert np.array_equal(frequencies[1], window_frequencies(SEQUENCE, window_size, step, "GC")[1])
+
+    profile = chunked_tm_profile(SEQUENCE, window_size, step, 0.05, workers, block_windows)
+    for a, b in zip(profile, tm_profile(SEQUENCE, window_size, step, 0.05)):
+        assert np.array_equal(a, b)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_record_blocks_match_serial_engine(tmp_path, workers):
+    path = str(tmp_path / "genome.fasta")
+    with open(path, "w") as f:
+        f.write(">genome\n" + "\n".join(SEQUENCE.lower()[i:i + 70] for i in range(0, len(SEQUENCE), 70)) + "\n")
+    with IndexedFasta(path) as fasta:
+        starts, counts, alphabet = record_window_counts(fasta["genome"], 100, 7, "ACGT", workers, 64)
+    expected = window_counts(SEQUENCE, 100, 7, "ACGT")
+    assert np.array_equal(starts, expected[0]) and np.array_equal(counts, expected[1])
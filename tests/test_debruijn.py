@@ -0,0 +1,67 @@
+import os
+import random
+import sys
+from collections import Counter
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from bioutils.debruijn import DeBruijnGraph, debruijn_assemble
+
+
+def naive_unitigs(fragments, k, min_count):
+    """Unitigs of a de Bruijn graph stored as a set of k-mer strings."""
+    counts = Counter(frag[i:i + k] for frag in fragments for i in range(len(frag) - k + 1))
+    kmers = {kmer for kmer, count in counts.items() if count >= min_count and set(kmer) <= set("ACGT")}
+
+    def successors(kmer):
+        return [kmer[1:] + b for b in "ACGT" if kmer[1:] + b in kmers]
+
+    def predecessors(kmer):
+        return [b + kmer[:-1] for b in "ACGT" if b + kmer[:-1] in kmers]
+
+    def joined(kmer):  # the only successor of its only predecessor
+        pred = predecessors(kmer)
+        return len(pred) == 1 and len(successors(pred[0])) == 1
+
+    def walk(kmer, visited):
+        path = [kmer]
+        visited.add(kmer)
+        while len(successors(path[-1])) == 1:
+            nxt = successors(path[-1])[0]
+            if nxt in visited or not joined(nxt):
+                break
+            path.append(nxt)
+            visited.add(nxt)
+        return path[0] + "".join(node[-1] for node in path[1:])
+
+    visited = set()
+    contigs = [walk(kmer, visited) for kmer in sorted(kmers) if not joined(kmer)]
+    # What is left are isolated cycles, each spelled from its smallest k-mer
+    contigs += [walk(kmer, visited) for kmer in sorted(kmers) if kmer not in visited]
+    return sorted(contigs)
+
+
+def sample(genome, count, length, seed):
+    rng = random.Random(seed)
+    return [genome[s:s + length] for s in (rng.randint(0, len(genome) - length) for _ in range(count))]
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("k,min_count", [(5, 1), (9, 1), (9, 2), (21, 1)])
+def test_unitigs_match_kmer_walk(seed, k, min_count):
+    rng = random.Random(seed)
+    repeat = "".join(rng.choice("ACGT") for _ in range(30))
+    genome = "".join(rng.choice("ACGT") for _ in range(400)) + repeat + "ACGTN" * 3
+    genome += "".join(rng.choice("ACGT") for _ in range(300)) + repeat + "A" * 30
+    fragments = sample(genome, 80, 60, seed) + ["CAGCAGCAGCAGCAG"]  # plus a cycle
+    assert sorted(DeBruijnGraph(fragments, k, min_count).contigs()) == naive_unitigs(fragments, k, min_count)
+
+
+def test_genome_without_repeats_is_one_contig():
+    rng = random.Random(42)
+    genome = "".join(rng.choice("ACGT") for _ in range(3000))
+    fragments = [genome[s:s + 120] for s in range(0, len(genome) - 119, 50)] + [genome[-120:]]
+    rng.shuffle(fragments)
+    assert debruijn_assemble(fragments, k=21) == [genome]
+    assert debruijn_assemble(fragments, k=21, min_length=3001) == []
@@ -0,0 +1,70 @@
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from bioutils.evaluate import ReferenceIndex, align_contig, evaluate_assembly
+
+COMPLEMENT = str.maketrans("ACGT", "TGCA")
+
+rng = random.Random(18)
+REFERENCE = "".join(rng.choice("ACGT") for _ in range(5000))
+
+
+def naive_edit_distance(a, b):
+    """Levenshtein distance by the full dynamic-programming table."""
+    previous = list(range(len(b) + 1))
+    for i, x in enumerate(a, 1):
+        current = [i]
+        for j, y in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (x != y)))
+        previous = current
+    return previous[-1]
+
+
+def mutate(seq, edits, seed):
+    """Applies `edits` substitutions/insertions/deletions at well separated positions."""
+    rng = random.Random(seed)
+    seq = list(seq)
+    for position in sorted(rng.sample(range(50, len(seq) - 50, 60), edits), reverse=True):
+        kind = rng.choice("sid")
+        if kind == "s":
+            seq[position] = rng.choice([b for b in "ACGT" if b != seq[position]])
+        elif kind == "i":
+            seq.insert(position, rng.choice("ACGT"))
+        else:
+            del seq[position]
+    return "".join(seq)
+
+
+@pytest.mark.parametrize("start,end", [(0, 800), (1200, 2500), (4100, 5000)])
+def test_exact_contigs(start, end):
+    index = ReferenceIndex(REFERENCE)
+    for strand, contig in ((1, REFERENCE[start:end]), (-1, REFERENCE[start:end].translate(COMPLEMENT)[::-1])):
+        (block,) = align_contig(contig, index)
+        assert (block.contig_start, block.contig_end) == (0, end - start)
+        assert (block.ref_start, block.ref_end, block.strand, block.edits) == (start, end, strand, 0)
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_edits_match_dynamic_programming(seed):
+    original = REFERENCE[1000:1600]
+    contig = mutate(original, 4, seed)
+    (block,) = align_contig(contig, ReferenceIndex(REFERENCE))
+    assert (block.ref_start, block.ref_end) == (1000, 1600)
+    assert block.edits == naive_edit_distance(contig, original)
+
+
+def test_report():
+    contigs = [REFERENCE[:2000], REFERENCE[1500:3000],
+               REFERENCE[3500:4000] + REFERENCE[200:700],  # chimera: one misassembly
+               "".join(random.Random(1).choice("ACGT") for _ in range(300))]  # unaligned
+    report = evaluate_assembly(REFERENCE, contigs)
+    assert report["contigs"] == 4 and report["unaligned_contigs"] == 1
+    assert report["misassemblies"] == 1
+    assert report["identity"] == 100.0
+    assert report["genome_fraction"] == pytest.approx(3500 / 5000 * 100)
+    assert report["nga50"] == 1500  # 2000 + 1500 >= 2500
+    assert report["aligned_bases"] == 2000 + 1500 + 1000
@@ -0,0 +1,64 @@
+import os
+import random
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from bioutils.cli import _window_counts
+from bioutils.faidx import IndexedFasta
+from bioutils.fasta import read_records, read_sequence
+from bioutils.windows import window_counts
+
+random.seed(2)
+RECORDS = {"chr1": "".join(random.choice("ACGTacgtN") for _ in range(250)),
+           "chr2": "".join(random.choice("ACGT") for _ in range(61))}
+
+
+def write_fasta(path, records, width=60, newline="\n"):
+    with open(path, "w", newline="") as f:
+        for name, seq in records.items():
+            f.write(f">{name} description{newline}")
+            for i in range(0, len(seq), width):
+                f.write(seq[i:i + width] + newline)
+
+
+@pytest.mark.parametrize("newline", ["\n", "\r\n"])
+def test_fetch_matches_reader(tmp_path, newline):
+    path = str(tmp_path / "genome.fa")
+    write_fasta(path, RECORDS, newline=newline)
+    with IndexedFasta(path) as fa:
+        assert fa.names == list(RECORDS)
+        for (header, seq), name in zip(read_records(path), fa.names):
+            assert fa.fetch(name) == seq
+            for start, end in [(0, 1), (59, 61), (60, 120), (13, 200), (100, None)]:
+                assert fa.fetch(name, start, end) == seq[start:end]
+
+
+@pytest.mark.parametrize("step", [None, 1, 2, 7, -1, -3, -60])
+def test_record_slices_match_str(tmp_path, step):
+    path = str(tmp_path / "genome.fa")
+    write_fasta(path, RECORDS)
+    seq = RECORDS["chr1"]
+    with IndexedFasta(path) as fa:
+        record = fa["chr1"]
+        for start in (None, 0, 5, 59, 60, -1, -70):
+            for stop in (None, 0, 61, 200, -2):
+                assert record[start:stop:step] == seq[start:stop:step], (start, stop, step)
+        assert record[-1] == seq[-1]
+
+
+def test_cli_windows_read_through_index(tmp_path, monkeypatch):
+    monkeypatch.setenv("BIOUTILS_CACHE", "off")
+    indexed = str(tmp_path / "indexed.fa")
+    write_fasta(indexed, {"chr1": RECORDS["chr1"]})
+    irregular = str(tmp_path / "irregular.fa")
+    with open(irregular, "w") as f:
+        f.write(">chr1\nACGTACGTAC\nACG\nACGTACGTAC\n")  # cannot be indexed, read whole
+    options = {"window": 20, "step": 3, "window_workers": 1}
+    for path in (indexed, irregular):
+        starts, counts = _window_counts(path, options)
+        expected = window_counts(read_sequence(path).upper(), 20, 3, "ACGT")
+        assert np.array_equal(starts, expected[0]) and np.array_equal(counts, expected[1])
+    assert os.path.exists(indexed + ".fai")
@@ -0,0 +1,47 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from bioutils.fasta import iter_fasta, read_sequence
+
+FILES = {
+    "multi-line": ">seq1 first\nACGT\nAC\n>seq2\nGGGGCCCC\nTT\n",
+    "single-line": ">long\n" + "ACGT" * 500 + "\n>short\nA\n",
+    "crlf": ">a desc\r\nACGT\r\nTTGA\r\n>b\r\nCC\r\n",
+    "headerless": "ACGTACGT\nGGCC\nAT",
+    "blank lines": "\n>a\n\nAC GT\n\n>b\n\n",
+    "header last": ">a\nACGT\n>b",
+}
+
+
+def naive_records(text):
+    """The line-by-line parser of the original lab scripts."""
+    records, header, seq = [], None, []
+    for line in text.splitlines():
+        if line.startswith(">"):
+            if header is not None or "".join(seq):
+                records.append(("" if header is None else header, "".join(seq)))
+            header, seq = line[1:].strip(), []
+        else:
+            seq.append("".join(line.split()))
+    if header is not None or "".join(seq):
+        records.append(("" if header is None else header, "".join(seq)))
+    return records
+
+
+@pytest.mark.parametrize("name", sorted(FILES))
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64, 1 << 16])
+def test_records_match_naive_parser(tmp_path, name, chunk_size):
+    path = tmp_path / "input.fasta"
+    path.write_bytes(FILES[name].encode())
+    assert list(iter_fasta(str(path), chunk_size=chunk_size)) == naive_records(FILES[name])
+
+
+def test_bytes_and_joined_sequence(tmp_path):
+    path = tmp_path / "input.fasta"
+    path.write_bytes(FILES["multi-line"].encode())
+    records = list(iter_fasta(str(path), as_bytes=True, chunk_size=5))
+    assert [(h, bytes(s)) for h, s in records] == [("seq1 first", b"ACGTAC"), ("seq2", b"GGGGCCCCTT")]
+    assert read_sequence(str(path)) == "ACGTACGGGGCCCCTT"
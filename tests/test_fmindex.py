@@ -0,0 +1,65 @@
+import os
+import random
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from bioutils.fmindex import FMIndex, encode_text, ensure_fm_index, suffix_array
+
+rng = random.Random(20)
+GENOME = "".join(rng.choice("ACGTacgtN") for _ in range(1500)) + "ACACACACACAC" * 5
+PATTERNS = ([GENOME[s:s + length] for s, length in ((0, 1), (10, 5), (700, 12), (1490, 40), (1510, 8))]
+            + ["A", "C", "G", "T", "AC", "ACAC", "GATTACA", "TTTTTTTTTTTTTTTT", "acgt", "ANA", "NN", "X"])
+
+
+def naive_locate(genome, pattern):
+    """Every (overlapping) start of pattern by str.find, ignoring case; only A/C/G/T can match."""
+    genome, pattern = genome.upper(), pattern.upper()
+    if set(pattern) - set("ACGT"):
+        return []
+    positions, start = [], genome.find(pattern)
+    while start != -1:
+        positions.append(start)
+        start = genome.find(pattern, start + 1)
+    return positions
+
+
+def test_suffix_array_matches_sorted_suffixes():
+    codes = encode_text(GENOME[:400] + "ACACACACACAC" * 5)
+    expected = sorted(range(len(codes)), key=lambda i: codes[i:].tobytes())
+    assert suffix_array(codes).tolist() == expected
+
+
+def test_count_and_locate_match_find():
+    index = FMIndex.build(GENOME)
+    assert len(index) == len(GENOME)
+    expected = [naive_locate(GENOME, p) for p in PATTERNS]
+    assert index.count_many(PATTERNS).tolist() == [len(e) for e in expected]
+    assert [positions.tolist() for positions in index.locate_many(PATTERNS)] == expected
+    for pattern, positions in zip(PATTERNS, expected):
+        assert index.locate(pattern).tolist() == positions
+        assert (pattern in index) == bool(positions)
+    with pytest.raises(ValueError):
+        index.count("")
+
+
+@pytest.mark.parametrize("mmap", [True, False])
+def test_save_and_load(tmp_path, mmap):
+    index = FMIndex.build(GENOME)
+    index.save(str(tmp_path / "genome.fmi"))
+    loaded = FMIndex.load(str(tmp_path / "genome.fmi"), mmap=mmap)
+    assert isinstance(loaded.sa, np.memmap) == mmap
+    assert np.array_equal(loaded.count_many(PATTERNS), index.count_many(PATTERNS))
+    for a, b in zip(loaded.locate_many(PATTERNS), index.locate_many(PATTERNS)):
+        assert np.array_equal(a, b)
+
+
+def test_ensure_fm_index(tmp_path):
+    path = tmp_path / "genome.fasta"
+    path.write_text(">part1\n" + GENOME[:700] + "\n>part2\n" + GENOME[700:] + "\n")
+    first = ensure_fm_index(str(path))
+    assert os.path.exists(str(path) + ".fmi")
+    assert ensure_fm_index(str(path)).locate("ACACACAC").tolist() == naive_locate(GENOME, "ACACACAC")
+    assert first.count("GATTACA") == len(naive_locate(GENOME, "GATTACA"))
@@ -0,0 +1,48 @@
+import os
+import random
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from bioutils.intervals import runs_to_regions, threshold_runs, write_bed
+
+random.seed(6)
+SIGNAL = [random.choice([10, 20, 30, 40]) for _ in range(200)]
+
+
+def naive_runs(values, threshold, above, merge_gap, min_length):
+    """Scans the signal sample by sample, then merges and filters the runs."""
+    runs, start = [], None
+    for i, value in enumerate(list(values) + [None]):
+        inside = value is not None and (value > threshold if above else value < threshold)
+        if inside and start is None:
+            start = i
+        elif not inside and start is not None:
+            runs.append([start, i])
+            start = None
+    merged = []
+    for run in runs:
+        if merged and run[0] - merged[-1][1] <= merge_gap:
+            merged[-1][1] = run[1]
+        else:
+            merged.append(run)
+    return [(s, e) for s, e in merged if e - s >= min_length]
+
+
+@pytest.mark.parametrize("threshold,above", [(25, True), (25, False), (5, True), (50, True)])
+@pytest.mark.parametrize("merge_gap,min_length", [(0, 1), (1, 1), (3, 1), (0, 3), (2, 4)])
+def test_runs_match_scan(threshold, above, merge_gap, min_length):
+    starts, ends = threshold_runs(SIGNAL, threshold, above, merge_gap, min_length)
+    assert list(zip(starts.tolist(), ends.tolist())) == naive_runs(SIGNAL, threshold, above,
+                                                                   merge_gap, min_length)
+
+
+def test_regions_and_bed(tmp_path):
+    window_starts = np.arange(0, 50, 5)
+    starts, ends = runs_to_regions(np.array([0, 4]), np.array([2, 10]), window_starts, 9)
+    assert starts.tolist() == [0, 20] and ends.tolist() == [5 + 9, 45 + 9]
+    path = tmp_path / "regions.bed"
+    write_bed(str(path), "chr1", starts, ends, name="hot", scores=[1.5, 2])
+    assert path.read_text() == "chr1\t0\t14\thot_1\t1.5\nchr1\t20\t54\thot_2\t2\n"
@@ -0,0 +1,74 @@
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from bioutils.orfs import find_orfs, write_orfs_fasta
+
+# Standard code, codons in NCBI (TCAG) order
+STANDARD = "FFLLSSSSYY**CC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG"
+CODONS = {a + b + c: STANDARD[16 * i + 4 * j + k]
+          for i, a in enumerate("TCAG") for j, b in enumerate("TCAG") for k, c in enumerate("TCAG")}
+COMPLEMENT = str.maketrans("ACGTN", "TGCAN")
+
+random.seed(10)
+SEQUENCE = "".join(random.choice("ACGT" * 20 + "N") for _ in range(3000))
+
+
+def naive_orfs(sequence, min_length, starts, nested, include_partial):
+    """Walks every frame codon by codon, from each start to the next in-frame stop."""
+    n, orfs = len(sequence), []
+    for strand in (1, -1):
+        seq = sequence if strand == 1 else sequence.translate(COMPLEMENT)[::-1]
+        for frame in range(3):
+            codons = [seq[i:i + 3] for i in range(frame, n - 2, 3)]
+            protein = "".join(CODONS.get(codon, "X") for codon in codons)
+            used_stops = set()
+            for s, codon in enumerate(codons):
+                if codon not in starts:
+                    continue
+                t = protein.find("*", s)
+                if t == -1:
+                    if not include_partial:
+                        continue
+                    t = len(codons)
+                if nested == "longest":
+                    if t in used_stops:
+                        continue
+                    used_stops.add(t)
+                if t - s < min_length:
+                    continue
+                begin, end = frame + 3 * s, frame + 3 * min(t + 1, len(codons))
+                if strand == -1:
+                    begin, end = n - end, n - begin
+                orfs.append((begin, end, strand, strand * (frame + 1), protein[s:t]))
+    return orfs
+
+
+@pytest.mark.parametrize("min_length", [0, 10, 40])
+@pytest.mark.parametrize("starts", [("ATG",), ("ATG", "GTG", "TTG")])
+@pytest.mark.parametrize("nested", ["longest", "all"])
+@pytest.mark.parametrize("include_partial", [False, True])
+def test_orfs_match_codon_walk(min_length, starts, nested, include_partial):
+    found = [tuple(orf) for orf in find_orfs(SEQUENCE, min_length, starts=starts, nested=nested,
+                                             include_partial=include_partial)]
+    assert sorted(found) == sorted(naive_orfs(SEQUENCE, min_length, starts, nested, include_partial))
+
+
+def test_orf_coordinates_and_fasta(tmp_path):
+    # One ORF on each strand: ATG AAA TAG forward, and its reverse complement
+    sequence = "CC" + "ATGAAATAG" + "GG" + "CTATTTCAT"
+    orfs = list(find_orfs(sequence, min_length=1))
+    assert [tuple(orf) for orf in orfs] == [(2, 11, 1, 3, "MK"), (13, 22, -1, -1, "MK")]
+    path = tmp_path / "orfs.faa"
+    assert write_orfs_fasta(orfs, str(path), name="toy") == 2
+    assert path.read_text().splitlines()[:2] == [">toy_orf1 3-11 strand=+ frame=+3 length=2", "MK"]
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        list(find_orfs("ATGTAA", starts=("ATN",)))
+    with pytest.raises(ValueError):
+        list(find_orfs("ATGTAA", nested="shortest"))
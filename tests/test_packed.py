@@ -0,0 +1,51 @@
+import os
+import random
+import sys
+from collections import Counter
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from bioutils.packed import AMBIGUOUS, PackedSequence
+
+COMPLEMENT = str.maketrans("ACGTRYKMBVDHSWN", "TGCAYRMKVBHDSWN")
+
+random.seed(3)
+TEXT = " \tNN" + "".join(random.choice("ACGTACGTacgtNRY") for _ in range(97)) + "NR \n"
+
+
+def naive_reverse_complement(text):
+    return text.translate(COMPLEMENT)[::-1]
+
+
+def views():
+    """(PackedSequence view, the same text as a str) pairs."""
+    packed, text = PackedSequence(TEXT), TEXT.upper()
+    pairs = [(packed, text), (packed.reverse_complement(), naive_reverse_complement(text))]
+    for start, stop in [(0, 10), (2, 50), (5, 104), (50, 50)]:
+        pairs.append((packed[start:stop], text[start:stop]))
+        pairs.append((packed[start:stop].reverse_complement(), naive_reverse_complement(text[start:stop])))
+        pairs.append((packed.reverse_complement()[start:stop], naive_reverse_complement(text)[start:stop]))
+    return pairs
+
+
+@pytest.mark.parametrize("index", range(len(views())))
+def test_view_matches_str(index):
+    view, text = views()[index]
+    assert str(view) == text and len(view) == len(text)
+    assert view.composition() == dict(Counter(text))
+    assert np.array_equal(view.ambiguous_mask(), [ch not in "ACGT" for ch in text])
+    marked = view.codes(mark_ambiguous=True)
+    assert np.array_equal(marked, ["ACGT".index(ch) if ch in "ACGT" else AMBIGUOUS for ch in text])
+    positions = np.arange(len(text))[::-3]
+    assert view.take(positions).tobytes().decode() == "".join(text[p] for p in positions)
+    for step in (2, -1, -4):
+        assert view[::step] == text[::step]
+
+
+@pytest.mark.parametrize("chars", [None, "N", "NR", " N\t\n", "NA", ""])
+@pytest.mark.parametrize("index", range(len(views())))
+def test_strip_matches_str(index, chars):
+    view, text = views()[index]
+    assert str(view.strip(chars)) == text.strip(chars)
@@ -0,0 +1,77 @@
+import os
+import random
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from bioutils.packed import PackedSequence
+from bioutils.sampling import FragmentSet, add_errors, make_rng, sample_pairs, sample_positions
+
+COMPLEMENT = str.maketrans("ACGTN", "TGCAN")
+
+random.seed(17)
+GENOME = "".join(random.choice("ACGT" * 10 + "N") for _ in range(2000))
+
+
+def naive_fragments(genome, starts, lengths, reverse=None):
+    """One string slice per fragment, as the labs' sampling loop did."""
+    fragments = []
+    for i, (start, length) in enumerate(zip(starts.tolist(), lengths.tolist())):
+        fragment = genome[start:start + length]
+        if reverse is not None and reverse[i]:
+            fragment = fragment.translate(COMPLEMENT)[::-1]
+        fragments.append(fragment)
+    return fragments
+
+
+@pytest.mark.parametrize("packed", [False, True])
+@pytest.mark.parametrize("with_reverse", [False, True])
+def test_fragments_match_slices(packed, with_reverse):
+    starts, lengths = sample_positions(len(GENOME), 300, 100, 150, make_rng(1))
+    reverse = make_rng(2).random(300) < 0.5 if with_reverse else None
+    genome = PackedSequence(GENOME) if packed else GENOME
+    fragments = FragmentSet(genome, starts, lengths, reverse)
+    expected = naive_fragments(GENOME, starts, lengths, reverse)
+    assert fragments.strings() == expected
+    for i in (0, 7, 299):
+        view = fragments[i]
+        assert (str(view) if packed else bytes(view).decode()) == expected[i]
+
+
+def test_positions_are_reproducible_and_in_range():
+    starts, lengths = sample_positions(500, 1000, 20, 30, make_rng(5))
+    assert ((lengths >= 20) & (lengths <= 30)).all()
+    assert (starts >= 0).all() and (starts + lengths <= 500).all()
+    again = sample_positions(500, 1000, 20, 30, make_rng(5))
+    assert np.array_equal(starts, again[0]) and np.array_equal(lengths, again[1])
+    assert not np.array_equal(make_rng(5, "camelpox").integers(0, 1 << 30, 10),
+                              make_rng(5, "goatpox").integers(0, 1 << 30, 10))
+    with pytest.raises(ValueError):
+        sample_positions(100, 10, 50, 101)
+
+
+def test_errors():
+    reads = FragmentSet.sample(GENOME, 200, 50, 80, make_rng(3)).gather()
+    assert add_errors(reads, rng=make_rng(4)).strings() == reads.strings()
+
+    substituted = add_errors(reads, substitution_rate=1.0, rng=make_rng(4)).strings()
+    for read, original in zip(substituted, reads.strings()):
+        assert len(read) == len(original)
+        assert all(a != b for a, b in zip(read, original) if b != "N")
+
+    assert add_errors(reads, deletion_rate=1.0, rng=make_rng(4)).strings() == [""] * len(reads)
+    inserted = add_errors(reads, insertion_rate=1.0, rng=make_rng(4)).strings()
+    assert [read[1::2] for read in inserted] == reads.strings()
+
+
+def test_pairs_are_the_two_ends_of_an_insert():
+    first, second = sample_pairs(GENOME, 100, read_length=50, insert_mean=200, insert_sd=40,
+                                 rng=make_rng(6))
+    inserts = second.starts + 50 - first.starts
+    assert ((inserts >= 50) & (inserts <= len(GENOME))).all()
+    for start, end, read1, read2 in zip(first.starts.tolist(), (first.starts + inserts).tolist(),
+                                        first.strings(), second.strings()):
+        assert read1 == GENOME[start:start + 50]
+        assert read2 == GENOME[end - 50:end].translate(COMPLEMENT)[::-1]
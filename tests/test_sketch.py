@@ -0,0 +1,40 @@
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from bioutils.sketch import ExactKmerCounter, make_counter, update_corpus_counts
+
+
+def naive_counts(sequences, k):
+    counter = make_counter(k)
+    for sequence in sequences:
+        counter.add(sequence)
+    return counter.counts
+
+
+def test_merge_and_subtract():
+    a, b = ExactKmerCounter(2).add("ACGTAC"), ExactKmerCounter(2).add("GGTTAC")
+    assert np.array_equal((a + b).counts, naive_counts(["ACGTAC", "GGTTAC"], 2))
+    assert np.array_equal((a + b).subtract(b).counts, a.counts)
+
+
+def test_changed_file_listed_twice(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "a.fa").write_text(">a\nACGTACGT\n")
+    (tmp_path / "b.fa").write_text(">b\nGGGCCC\n")
+    store = str(tmp_path / "store.npz")
+    update_corpus_counts(store, ["a.fa", "b.fa"], 3)
+
+    (tmp_path / "a.fa").write_text(">a\nTTTTACG\n")
+    total, added = update_corpus_counts(store, ["a.fa", "./a.fa", str(tmp_path / "a.fa"), "b.fa"], 3)
+    expected = naive_counts(["TTTTACG", "GGGCCC"], 3)
+    assert added == ["a.fa"]
+    assert np.array_equal(total.counts, expected)
+    assert total.counts.min() >= 0
+    assert total.sources == [str(tmp_path / "a.fa"), str(tmp_path / "b.fa")]
+
+    # Unchanged files are skipped on the next update
+    total, added = update_corpus_counts(store, ["./b.fa", "a.fa"], 3)
+    assert added == [] and np.array_equal(total.counts, expected)
@@ -0,0 +1,47 @@
+import math
+import os
+import random
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from bioutils.tm import tm_alternative, tm_of_sequence, tm_profile
+
+random.seed(5)
+SEQUENCE = "".join(random.choice("ACGTN") for _ in range(300))
+
+
+def naive_profile(sequence, window_size, step, na):
+    """The per-window loop of the original Lab3 scripts."""
+    positions, simple, alternative = [], [], []
+    for i in range(0, len(sequence) - window_size + 1, step):
+        window = sequence[i:i + window_size]
+        G, C, A, T = (window.count(b) for b in "GCAT")
+        positions.append(i + 1)
+        simple.append(4 * (G + C) + 2 * (A + T))
+        alternative.append(81.5 + 16.6 * math.log10(na) + 0.41 * (G + C) / window_size * 100
+                           - 600 / window_size)
+    return positions, simple, alternative
+
+
+@pytest.mark.parametrize("window_size,step", [(9, 1), (1, 1), (20, 3), (300, 1), (301, 1)])
+@pytest.mark.parametrize("na", [0.001, 0.05])
+def test_profile_matches_window_loop(window_size, step, na):
+    positions, simple, alternative = tm_profile(SEQUENCE, window_size, step, na)
+    expected = naive_profile(SEQUENCE, window_size, step, na)
+    assert positions.tolist() == expected[0]
+    assert simple.tolist() == expected[1]
+    assert np.allclose(alternative, expected[2])
+
+
+def test_whole_sequence():
+    simple, alternative = tm_of_sequence("acgtGGCC")
+    assert simple == 4 * 6 + 2 * 2
+    assert alternative == pytest.approx(81.5 + 16.6 * math.log10(0.001) + 0.41 * 75 - 600 / 8)
+
+
+def test_salt_must_be_positive():
+    with pytest.raises(ValueError):
+        tm_alternative(50.0, 9, na=0)
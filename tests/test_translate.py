@@ -0,0 +1,44 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from bioutils.translate import NCBI_TABLES, codon_table, translate
+
+# (codon, amino acid) assignments from the NCBI genetic code tables; the
+# codons that differ from the standard code are checked for every table
+KNOWN_CODONS = {
+    1: {"ATG": "M", "TGA": "*", "TAA": "*", "TAG": "*", "ATA": "I", "AGA": "R", "CTG": "L", "TGG": "W"},
+    2: {"TGA": "W", "ATA": "M", "AGA": "*", "AGG": "*", "TAA": "*", "ATG": "M"},
+    3: {"TGA": "W", "ATA": "M", "CTT": "T", "CTG": "T", "AGA": "R"},
+    4: {"TGA": "W", "ATA": "I", "AGA": "R", "TAA": "*"},
+    5: {"TGA": "W", "ATA": "M", "AGA": "S", "AGG": "S"},
+    6: {"TAA": "Q", "TAG": "Q", "TGA": "*"},
+    9: {"TGA": "W", "AAA": "N", "AAG": "K", "AGA": "S", "AGG": "S"},
+    10: {"TGA": "C", "TAA": "*", "TAG": "*"},
+    11: {"ATG": "M", "TGA": "*", "AGA": "R"},
+    12: {"CTG": "S", "CTT": "L", "TGA": "*"},
+    13: {"TGA": "W", "ATA": "M", "AGA": "G", "AGG": "G"},
+    14: {"TAA": "Y", "TAG": "*", "TGA": "W", "AAA": "N", "AGA": "S"},
+}
+
+
+def test_every_table_is_checked():
+    assert set(KNOWN_CODONS) == set(NCBI_TABLES)
+
+
+@pytest.mark.parametrize("table", sorted(KNOWN_CODONS))
+def test_known_codons(table):
+    for codon, amino_acid in KNOWN_CODONS[table].items():
+        assert translate(codon, table=table) == amino_acid, (table, codon)
+
+
+def test_ambiguous_codon_is_x():
+    assert chr(codon_table(1)[64]) == "X"
+    assert translate("ATGNNNTAA") == "MX*"
+
+
+def test_vertebrate_mitochondrial_read_through():
+    assert translate("ATGTGAAAATAG", table=2) == "MWK*"
+    assert translate("ATGTGAAAATAG", table=1) == "M*K*"